@@ -0,0 +1,153 @@
+"""initial schema
+
+Matches what ``Base.metadata.create_all`` produced before migrations existed.
+Databases created that way should be stamped instead of upgraded:
+``alembic stamp 0001_initial && alembic upgrade head``.
+
+Revision ID: 0001_initial
+Revises:
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001_initial"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=True, unique=True),
+        sa.Column("password_hash", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+
+    op.create_table(
+        "profile",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), unique=True),
+        sa.Column("sex", sa.String(), nullable=True),
+        sa.Column("age", sa.Integer(), nullable=True),
+        sa.Column("height_cm", sa.Float(), nullable=True),
+        sa.Column("activity_level", sa.Float(), nullable=True),
+        sa.Column("current_bodyfat_pct", sa.Float(), nullable=True),
+        sa.Column("current_muscle_mass_kg", sa.Float(), nullable=True),
+        sa.Column("goal_weight_kg", sa.Float(), nullable=True),
+        sa.Column("goal_bodyfat_pct", sa.Float(), nullable=True),
+        sa.Column("goal_calories_kcal", sa.Integer(), nullable=True),
+        sa.Column("goal_rate_kg_per_week", sa.Float(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_profile_id", "profile", ["id"])
+
+    op.create_table(
+        "body_logs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("weight_kg", sa.Float(), nullable=False),
+        sa.Column("bodyfat_pct", sa.Float(), nullable=True),
+        sa.Column("muscle_mass_kg", sa.Float(), nullable=True),
+        sa.Column("sleep_hours", sa.Float(), nullable=True),
+        sa.Column("condition_note", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("user_id", "date", name="uix_user_date_body"),
+    )
+    op.create_index("ix_body_logs_id", "body_logs", ["id"])
+
+    op.create_table(
+        "meal_logs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("meal_type", sa.String(), nullable=False),
+        sa.Column("calories_kcal", sa.Integer(), nullable=False),
+        sa.Column("protein_g", sa.Float(), nullable=True),
+        sa.Column("fat_g", sa.Float(), nullable=True),
+        sa.Column("carbs_g", sa.Float(), nullable=True),
+        sa.Column("memo", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_meal_logs_id", "meal_logs", ["id"])
+    op.create_index("ix_meal_logs_date", "meal_logs", ["date"])
+
+    op.create_table(
+        "workout_templates",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_workout_templates_id", "workout_templates", ["id"])
+
+    op.create_table(
+        "workout_template_items",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("template_id", sa.Integer(), sa.ForeignKey("workout_templates.id")),
+        sa.Column("exercise_name", sa.String(), nullable=False),
+        sa.Column("target_sets", sa.Integer(), nullable=True),
+        sa.Column("target_reps", sa.String(), nullable=True),
+        sa.Column("target_weight_kg", sa.Float(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=True),
+    )
+    op.create_index("ix_workout_template_items_id", "workout_template_items", ["id"])
+
+    op.create_table(
+        "workout_sessions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("template_id", sa.Integer(), sa.ForeignKey("workout_templates.id"), nullable=True),
+        sa.Column("note", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_workout_sessions_id", "workout_sessions", ["id"])
+    op.create_index("ix_workout_sessions_date", "workout_sessions", ["date"])
+
+    op.create_table(
+        "workout_sets",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("session_id", sa.Integer(), sa.ForeignKey("workout_sessions.id")),
+        sa.Column("exercise_name", sa.String(), nullable=False),
+        sa.Column("set_no", sa.Integer(), nullable=False),
+        sa.Column("reps", sa.Integer(), nullable=True),
+        sa.Column("weight_kg", sa.Float(), nullable=True),
+        sa.Column("rir", sa.Integer(), nullable=True),
+        sa.Column("note", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_workout_sets_id", "workout_sets", ["id"])
+
+    op.create_table(
+        "daily_rollups",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("date", sa.Date(), primary_key=True),
+        sa.Column("calories_kcal", sa.Integer(), nullable=False),
+        sa.Column("protein_g", sa.Float(), nullable=True),
+        sa.Column("fat_g", sa.Float(), nullable=True),
+        sa.Column("carbs_g", sa.Float(), nullable=True),
+        sa.Column("meal_count", sa.Integer(), nullable=False),
+        sa.Column("weight_kg", sa.Float(), nullable=True),
+        sa.Column("bodyfat_pct", sa.Float(), nullable=True),
+        sa.Column("muscle_mass_kg", sa.Float(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("daily_rollups")
+    op.drop_table("workout_sets")
+    op.drop_table("workout_sessions")
+    op.drop_table("workout_template_items")
+    op.drop_table("workout_templates")
+    op.drop_table("meal_logs")
+    op.drop_table("body_logs")
+    op.drop_table("profile")
+    op.drop_table("users")
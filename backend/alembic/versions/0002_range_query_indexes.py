@@ -0,0 +1,37 @@
+"""composite (user_id, date) and foreign-key indexes
+
+Every router filters on user_id plus a date range, and the sets / items
+relationships are loaded through session_id / template_id.
+
+Revision ID: 0002_range_query_indexes
+Revises: 0001_initial
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0002_range_query_indexes"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_meal_logs_user_date", "meal_logs", ["user_id", "date"]),
+    ("ix_workout_sessions_user_date", "workout_sessions", ["user_id", "date"]),
+    ("ix_workout_sets_session_id", "workout_sets", ["session_id"]),
+    ("ix_workout_template_items_template_order", "workout_template_items", ["template_id", "order_index"]),
+    ("ix_workout_templates_user_id", "workout_templates", ["user_id"]),
+]
+
+
+def upgrade():
+    # if_not_exists: databases created by create_all after this change already have them
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
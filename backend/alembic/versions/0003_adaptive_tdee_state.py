@@ -0,0 +1,33 @@
+"""adaptive TDEE estimator state on daily_rollups
+
+The columns start out NULL / 0; the app's startup backfill (rollups.ensure_backfilled)
+replays the estimator over existing rows, or run scripts/rebuild_rollups.py.
+
+Revision ID: 0003_adaptive_tdee_state
+Revises: 0002_range_query_indexes
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003_adaptive_tdee_state"
+down_revision = "0002_range_query_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("daily_rollups") as batch_op:
+        batch_op.add_column(sa.Column("trend_weight_kg", sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column("tdee_estimate_kcal", sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column("tdee_sample_days", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade():
+    with op.batch_alter_table("daily_rollups") as batch_op:
+        batch_op.drop_column("tdee_sample_days")
+        batch_op.drop_column("tdee_estimate_kcal")
+        batch_op.drop_column("trend_weight_kg")
@@ -0,0 +1,44 @@
+"""exercise_bests table and the workout_sets exercise index
+
+exercise_bests is filled by the app's startup backfill
+(workout_analytics.ensure_backfilled) on databases that already have sets.
+
+Revision ID: 0004_exercise_bests
+Revises: 0003_adaptive_tdee_state
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_exercise_bests"
+down_revision = "0003_adaptive_tdee_state"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "exercise_bests",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("exercise_name", sa.String(), primary_key=True),
+        sa.Column("max_weight_kg", sa.Float(), nullable=True),
+        sa.Column("best_e1rm_epley_kg", sa.Float(), nullable=True),
+        sa.Column("best_e1rm_brzycki_kg", sa.Float(), nullable=True),
+        sa.Column("best_set_volume_kg", sa.Float(), nullable=True),
+        sa.Column("best_set_id", sa.Integer(), nullable=True),
+        sa.Column("best_set_date", sa.Date(), nullable=True),
+        sa.Column("best_set_weight_kg", sa.Float(), nullable=True),
+        sa.Column("best_set_reps", sa.Integer(), nullable=True),
+        sa.Column("total_sets", sa.Integer(), nullable=False),
+        sa.Column("total_tonnage_kg", sa.Float(), nullable=False),
+        sa.Column("last_date", sa.Date(), nullable=True),
+    )
+    op.create_index("ix_workout_sets_exercise_session", "workout_sets", ["exercise_name", "session_id"], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_workout_sets_exercise_session", table_name="workout_sets", if_exists=True)
+    op.drop_table("exercise_bests")
@@ -0,0 +1,141 @@
+"""exercise catalog: exercises, exercise_aliases and exercise_id foreign keys
+
+Existing workout_sets / workout_template_items are backfilled: every distinct
+name (per user, after the same NFKC + casefold normalization the app uses) gets
+an exercises row named after its most used spelling, and the rows get its id.
+exercise_bests is recreated keyed by exercise_id and rebuilt by the app's
+startup backfill.
+
+Revision ID: 0005_exercise_catalog
+Revises: 0004_exercise_bests
+Create Date: 2026-10-18
+
+"""
+import unicodedata
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_exercise_catalog"
+down_revision = "0004_exercise_bests"
+branch_labels = None
+depends_on = None
+
+
+def _normalize(name):
+    # copy of app.services.exercises.normalize_name, frozen for this migration
+    return " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+
+def _exercise_bests(key_column):
+    op.create_table(
+        "exercise_bests",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        key_column,
+        sa.Column("max_weight_kg", sa.Float(), nullable=True),
+        sa.Column("best_e1rm_epley_kg", sa.Float(), nullable=True),
+        sa.Column("best_e1rm_brzycki_kg", sa.Float(), nullable=True),
+        sa.Column("best_set_volume_kg", sa.Float(), nullable=True),
+        sa.Column("best_set_id", sa.Integer(), nullable=True),
+        sa.Column("best_set_date", sa.Date(), nullable=True),
+        sa.Column("best_set_weight_kg", sa.Float(), nullable=True),
+        sa.Column("best_set_reps", sa.Integer(), nullable=True),
+        sa.Column("total_sets", sa.Integer(), nullable=False),
+        sa.Column("total_tonnage_kg", sa.Float(), nullable=False),
+        sa.Column("last_date", sa.Date(), nullable=True),
+    )
+
+
+def _backfill():
+    bind = op.get_bind()
+    # most used spelling first, so it becomes the exercise's display name
+    used = bind.execute(sa.text(
+        "SELECT user_id, exercise_name FROM ("
+        "SELECT s.user_id, ws.exercise_name FROM workout_sets ws JOIN workout_sessions s ON s.id = ws.session_id "
+        "WHERE s.user_id IS NOT NULL "
+        "UNION ALL "
+        "SELECT t.user_id, i.exercise_name FROM workout_template_items i JOIN workout_templates t ON t.id = i.template_id "
+        "WHERE t.user_id IS NOT NULL"
+        ") GROUP BY user_id, exercise_name ORDER BY user_id, COUNT(*) DESC, exercise_name"
+    )).all()
+
+    exercise_ids = {}
+    for user_id, name in used:
+        key = (user_id, _normalize(name))
+        if key not in exercise_ids:
+            exercise_ids[key] = bind.execute(
+                sa.text("INSERT INTO exercises (user_id, name, created_at) VALUES (:u, :n, :c)"),
+                {"u": user_id, "n": name.strip(), "c": datetime.utcnow()},
+            ).lastrowid
+            bind.execute(
+                sa.text("INSERT INTO exercise_aliases (user_id, exercise_id, alias, normalized) VALUES (:u, :e, :a, :k)"),
+                {"u": user_id, "e": exercise_ids[key], "a": name.strip(), "k": key[1]},
+            )
+        params = {"e": exercise_ids[key], "n": name, "u": user_id}
+        bind.execute(sa.text(
+            "UPDATE workout_sets SET exercise_id = :e WHERE exercise_name = :n "
+            "AND session_id IN (SELECT id FROM workout_sessions WHERE user_id = :u)"
+        ), params)
+        bind.execute(sa.text(
+            "UPDATE workout_template_items SET exercise_id = :e WHERE exercise_name = :n "
+            "AND template_id IN (SELECT id FROM workout_templates WHERE user_id = :u)"
+        ), params)
+
+
+def upgrade():
+    op.create_table(
+        "exercises",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("muscle_groups", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_exercises_id", "exercises", ["id"])
+    op.create_index("ix_exercises_user_name", "exercises", ["user_id", "name"])
+    op.create_table(
+        "exercise_aliases",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("exercise_id", sa.Integer(), sa.ForeignKey("exercises.id"), nullable=False),
+        sa.Column("alias", sa.String(), nullable=False),
+        sa.Column("normalized", sa.String(), nullable=False),
+        sa.UniqueConstraint("user_id", "normalized", name="uix_user_exercise_alias"),
+    )
+    op.create_index("ix_exercise_aliases_id", "exercise_aliases", ["id"])
+    op.create_index("ix_exercise_aliases_exercise_id", "exercise_aliases", ["exercise_id"])
+
+    with op.batch_alter_table("workout_template_items") as batch_op:
+        batch_op.add_column(sa.Column("exercise_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key("fk_workout_template_items_exercise_id", "exercises", ["exercise_id"], ["id"])
+        batch_op.create_index("ix_workout_template_items_exercise_id", ["exercise_id"])
+    op.drop_index("ix_workout_sets_exercise_session", table_name="workout_sets", if_exists=True)
+    with op.batch_alter_table("workout_sets") as batch_op:
+        batch_op.add_column(sa.Column("exercise_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key("fk_workout_sets_exercise_id", "exercises", ["exercise_id"], ["id"])
+        batch_op.create_index("ix_workout_sets_exercise_session", ["exercise_id", "session_id"])
+
+    # derived data: recreated empty, keyed by exercise_id
+    op.drop_table("exercise_bests")
+    _exercise_bests(sa.Column("exercise_id", sa.Integer(), sa.ForeignKey("exercises.id"), primary_key=True))
+
+    _backfill()
+
+
+def downgrade():
+    op.drop_table("exercise_bests")
+    _exercise_bests(sa.Column("exercise_name", sa.String(), primary_key=True))
+    with op.batch_alter_table("workout_sets") as batch_op:
+        batch_op.drop_index("ix_workout_sets_exercise_session")
+        batch_op.drop_constraint("fk_workout_sets_exercise_id", type_="foreignkey")
+        batch_op.drop_column("exercise_id")
+    op.create_index("ix_workout_sets_exercise_session", "workout_sets", ["exercise_name", "session_id"])
+    with op.batch_alter_table("workout_template_items") as batch_op:
+        batch_op.drop_index("ix_workout_template_items_exercise_id")
+        batch_op.drop_constraint("fk_workout_template_items_exercise_id", type_="foreignkey")
+        batch_op.drop_column("exercise_id")
+    op.drop_table("exercise_aliases")
+    op.drop_table("exercises")
@@ -0,0 +1,52 @@
+"""change versions and tombstones for GET /sync
+
+body_logs, meal_logs and workout_sessions get a version column and a
+(user_id, version) index. Existing rows start at version 0, which only a full
+sync (since=0) returns.
+
+Revision ID: 0006_sync_versions
+Revises: 0005_exercise_catalog
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_sync_versions"
+down_revision = "0005_exercise_catalog"
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ("body_logs", "meal_logs", "workout_sessions")
+
+
+def upgrade():
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="0"))
+            batch_op.create_index(f"ix_{table}_user_version", ["user_id", "version"])
+    op.create_table(
+        "sync_versions",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column("row_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_sync_tombstones_user_version", "sync_tombstones", ["user_id", "version"])
+
+
+def downgrade():
+    op.drop_table("sync_tombstones")
+    op.drop_table("sync_versions")
+    for table in reversed(VERSIONED_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_index(f"ix_{table}_user_version")
+            batch_op.drop_column("version")
@@ -1,16 +1,71 @@
 import os
-from sqlalchemy import create_engine
+from typing import Dict, List, Optional, Sequence, Union
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./healthcare.db")
 
-connect_args = {}
-if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
+# Applied to every new SQLite connection. WAL lets readers run alongside the single
+# writer instead of serializing on the rollback journal, and synchronous=NORMAL is
+# durable in WAL mode up to the last checkpoint while skipping an fsync per commit.
+SQLITE_PRAGMAS: Dict[str, Union[str, int]] = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    # negative values are KiB: 64 MiB page cache per connection
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return url.split("://", 1)[-1] in ("", "/:memory:") or "mode=memory" in url
+
+
+def _sqlite_pragmas_for(url: str, pragmas: Optional[Dict[str, Union[str, int]]] = None) -> Dict[str, Union[str, int]]:
+    pragmas = dict(SQLITE_PRAGMAS if pragmas is None else pragmas)
+    if _is_sqlite_memory(url):
+        # journal settings do not apply to in-memory databases
+        pragmas.pop("journal_mode", None)
+        pragmas.pop("mmap_size", None)
+    return pragmas
+
+
+def create_app_engine(url: str = SQLALCHEMY_DATABASE_URL, sqlite_pragmas: Optional[Dict[str, Union[str, int]]] = None) -> Engine:
+    """Create the engine for ``url``; SQLite connections get ``sqlite_pragmas`` (default SQLITE_PRAGMAS)."""
+    if not url.startswith("sqlite"):
+        return create_engine(url)
+
+    kwargs = {}
+    if not _is_sqlite_memory(url):
+        # connections are cheap for SQLite but the per-connection page cache is not;
+        # keep enough for the request threadpool and fail fast instead of piling up
+        kwargs.update(
+            pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        )
+
+    eng = create_engine(url, connect_args={"check_same_thread": False}, **kwargs)
+    _listen_sqlite_pragmas(eng, _sqlite_pragmas_for(url, sqlite_pragmas))
+    return eng
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args=connect_args
-)
+
+def _listen_sqlite_pragmas(eng: Engine, pragmas: Dict[str, Union[str, int]]) -> None:
+    @event.listens_for(eng, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+engine = create_app_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -21,3 +76,66 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Opt-in async mode (DB_ASYNC=1): the hot endpoints in routers/async_api.py run on an
+# AsyncSession instead of the request threadpool. Needs aiosqlite / asyncpg installed.
+ASYNC_DB_ENABLED = os.getenv("DB_ASYNC", "0").lower() in ("1", "true", "yes")
+
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg"}
+
+
+def to_async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return _ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(SQLALCHEMY_DATABASE_URL)
+
+_async_sessionmaker = None
+
+
+def create_async_app_engine(url: str = ASYNC_DATABASE_URL):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    if not url.startswith("sqlite"):
+        return create_async_engine(url)
+    eng = create_async_engine(url)
+    _listen_sqlite_pragmas(eng.sync_engine, _sqlite_pragmas_for(url))
+    return eng
+
+
+def get_async_sessionmaker():
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        # objects stay loaded after commit: lazy refreshes cannot run outside a greenlet
+        _async_sessionmaker = async_sessionmaker(create_async_app_engine(), autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def dialect_insert(db, model):
+    """INSERT construct supporting ``on_conflict_do_update`` for the session's backend."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+def insert_returning_ids(db, model, rows: Sequence[dict]) -> List[int]:
+    """Executemany INSERT of ``rows`` returning the new ids in ``rows`` order.
+
+    On SQLite, ``returning(..., sort_by_parameter_order=True)`` degrades to one
+    statement per row (the dialect has no insert sentinel). SQLite hands out rowids
+    ascending in insert order, so the batched statement's ids are sorted instead.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return sorted(db.scalars(insert(model).returning(model.id), rows).all())
+    return list(db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows).all())
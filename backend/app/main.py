@@ -1,38 +1,88 @@
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse
 
-from .db import engine, Base
+from .db import engine, Base, SessionLocal, ASYNC_DB_ENABLED
 from .routers import profile, body_logs, meal_logs, dashboard
-from .routers import workouts
+from .routers import workouts, export, sync
+from .services.cache import response_cache
+from .services import metrics, rollups, workout_analytics, write_queue
+from .services.etag import ConditionalGetMiddleware
 
 app = FastAPI(title="healthcareapp backend")
 
 cors_origins = os.getenv("CORS_ORIGINS", "*")
 allow_origins = ["*"] if cors_origins.strip() == "*" else [x.strip() for x in cors_origins.split(",") if x.strip()]
 
+# read endpoints answer If-None-Match with 304 while the user's data is unchanged
+app.add_middleware(ConditionalGetMiddleware, prefixes=("/body-logs", "/meal-logs", "/dashboard", "/profile", "/workouts", "/sync"))
+# series and list responses compress well; small bodies are sent as is
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+# outside the two above, so 304s carry the CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allow_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
+# outermost: times the whole stack and sees the bytes actually sent
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.instrument_engine()
 
 
 @app.on_event("startup")
 def on_startup():
     # Create DB tables (for dev/demo). Alembic should be used for prod.
     Base.metadata.create_all(bind=engine)
+    # databases created before daily_rollups / exercise_bests existed get them built once
+    db = SessionLocal()
+    try:
+        rollups.ensure_backfilled(db)
+        workout_analytics.ensure_backfilled(db)
+    finally:
+        db.close()
 
 
+@app.on_event("shutdown")
+def on_shutdown():
+    # WRITE_QUEUE=1: commit what is still queued before the process exits
+    write_queue.close_all()
+
+
+if ASYNC_DB_ENABLED:
+    from .routers import async_api
+
+    # registered first so these paths resolve to the async handlers
+    app.include_router(async_api.dashboard_router, prefix="/dashboard", tags=["dashboard"])
+    app.include_router(async_api.body_logs_router, prefix="/body-logs", tags=["body-logs"])
+    app.include_router(async_api.meal_logs_router, prefix="/meal-logs", tags=["meal-logs"])
+
 app.include_router(profile.router, prefix="/profile", tags=["profile"])
 app.include_router(body_logs.router, prefix="/body-logs", tags=["body-logs"])
 app.include_router(meal_logs.router, prefix="/meal-logs", tags=["meal-logs"])
 app.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
 app.include_router(workouts.router, prefix="/workouts", tags=["workouts"])
+app.include_router(export.router, prefix="/export", tags=["export"])
+app.include_router(sync.router, prefix="/sync", tags=["sync"])
 
 
 @app.get("/")
 def root():
     return {"status": "ok"}
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    # hit/miss counters of the dashboard / profile-compute response cache
+    return response_cache.stats()
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    # Prometheus text format: per-route latency, SQL count/time and response size histograms
+    body = metrics.registry.render(metrics.cache_lines(response_cache))
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -52,7 +52,12 @@ class BodyLog(Base):
     sleep_hours = Column(Float, nullable=True)
     condition_note = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    __table_args__ = (UniqueConstraint("user_id", "date", name="uix_user_date_body"),)
+    # change version of the last insert/update (services/versions.py)
+    version = Column(Integer, nullable=False, default=0)
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", name="uix_user_date_body"),
+        Index("ix_body_logs_user_version", "user_id", "version"),
+    )
 
 
 class MealLog(Base):
@@ -67,16 +72,21 @@ class MealLog(Base):
     carbs_g = Column(Float, nullable=True)
     memo = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    version = Column(Integer, nullable=False, default=0)
+    __table_args__ = (
+        Index("ix_meal_logs_user_date", "user_id", "date"),
+        Index("ix_meal_logs_user_version", "user_id", "version"),
+    )
 
 
 class WorkoutTemplate(Base):
     __tablename__ = "workout_templates"
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    items = relationship("WorkoutTemplateItem", back_populates="template")
+    items = relationship("WorkoutTemplateItem", back_populates="template", order_by="WorkoutTemplateItem.order_index")
 
 
 class WorkoutTemplateItem(Base):
@@ -84,11 +94,13 @@ class WorkoutTemplateItem(Base):
     id = Column(Integer, primary_key=True, index=True)
     template_id = Column(Integer, ForeignKey("workout_templates.id"))
     exercise_name = Column(String, nullable=False)
+    exercise_id = Column(Integer, ForeignKey("exercises.id"), nullable=True, index=True)
     target_sets = Column(Integer, nullable=True)
     target_reps = Column(String, nullable=True)
     target_weight_kg = Column(Float, nullable=True)
     order_index = Column(Integer, nullable=True)
     template = relationship("WorkoutTemplate", back_populates="items")
+    __table_args__ = (Index("ix_workout_template_items_template_order", "template_id", "order_index"),)
 
 
 class WorkoutSession(Base):
@@ -99,17 +111,114 @@ class WorkoutSession(Base):
     template_id = Column(Integer, ForeignKey("workout_templates.id"), nullable=True)
     note = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    sets = relationship("WorkoutSet", back_populates="session")
+    # bumped when the session or any of its sets changes
+    version = Column(Integer, nullable=False, default=0)
+    sets = relationship("WorkoutSet", back_populates="session", order_by="WorkoutSet.id", cascade="all, delete-orphan")
+    __table_args__ = (
+        Index("ix_workout_sessions_user_date", "user_id", "date"),
+        Index("ix_workout_sessions_user_version", "user_id", "version"),
+    )
 
 
 class WorkoutSet(Base):
     __tablename__ = "workout_sets"
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("workout_sessions.id"))
+    session_id = Column(Integer, ForeignKey("workout_sessions.id"), index=True)
+    # as entered; exercise_id groups spelling variants through exercise_aliases
     exercise_name = Column(String, nullable=False)
+    exercise_id = Column(Integer, ForeignKey("exercises.id"), nullable=True)
     set_no = Column(Integer, nullable=False)
     reps = Column(Integer, nullable=True)
     weight_kg = Column(Float, nullable=True)
     rir = Column(Integer, nullable=True)
     note = Column(Text, nullable=True)
     session = relationship("WorkoutSession", back_populates="sets")
+    __table_args__ = (Index("ix_workout_sets_exercise_session", "exercise_id", "session_id"),)
+
+
+class DailyRollup(Base):
+    """Per-day totals maintained incrementally from meal_logs / body_logs."""
+    __tablename__ = "daily_rollups"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    calories_kcal = Column(Integer, nullable=False, default=0)
+    protein_g = Column(Float, nullable=True)
+    fat_g = Column(Float, nullable=True)
+    carbs_g = Column(Float, nullable=True)
+    meal_count = Column(Integer, nullable=False, default=0)
+    weight_kg = Column(Float, nullable=True)
+    bodyfat_pct = Column(Float, nullable=True)
+    muscle_mass_kg = Column(Float, nullable=True)
+    # adaptive TDEE estimator state as of this day (services/adaptive_tdee.py)
+    trend_weight_kg = Column(Float, nullable=True)
+    tdee_estimate_kcal = Column(Float, nullable=True)
+    tdee_sample_days = Column(Integer, nullable=False, default=0)
+
+
+class Exercise(Base):
+    """Per-user exercise catalog; names and aliases resolve here through exercise_aliases."""
+    __tablename__ = "exercises"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    name = Column(String, nullable=False)
+    # comma-separated tags, e.g. "chest,triceps"
+    muscle_groups = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    aliases = relationship("ExerciseAlias", back_populates="exercise", order_by="ExerciseAlias.id", cascade="all, delete-orphan")
+    __table_args__ = (Index("ix_exercises_user_name", "user_id", "name"),)
+
+
+class ExerciseAlias(Base):
+    """Every spelling of an exercise (its own name included), unique per user once normalized."""
+    __tablename__ = "exercise_aliases"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    exercise_id = Column(Integer, ForeignKey("exercises.id"), nullable=False, index=True)
+    alias = Column(String, nullable=False)
+    normalized = Column(String, nullable=False)
+    exercise = relationship("Exercise", back_populates="aliases")
+    __table_args__ = (UniqueConstraint("user_id", "normalized", name="uix_user_exercise_alias"),)
+
+
+class ExerciseBest(Base):
+    """Per-exercise personal records, refreshed from workout_sets on session writes."""
+    __tablename__ = "exercise_bests"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    exercise_id = Column(Integer, ForeignKey("exercises.id"), primary_key=True)
+    max_weight_kg = Column(Float, nullable=True)
+    best_e1rm_epley_kg = Column(Float, nullable=True)
+    best_e1rm_brzycki_kg = Column(Float, nullable=True)
+    # heaviest single-set volume (weight x reps)
+    best_set_volume_kg = Column(Float, nullable=True)
+    # the set behind best_e1rm_epley_kg
+    best_set_id = Column(Integer, nullable=True)
+    best_set_date = Column(Date, nullable=True)
+    best_set_weight_kg = Column(Float, nullable=True)
+    best_set_reps = Column(Integer, nullable=True)
+    total_sets = Column(Integer, nullable=False, default=0)
+    total_tonnage_kg = Column(Float, nullable=False, default=0)
+    last_date = Column(Date, nullable=True)
+    exercise = relationship("Exercise")
+
+    @property
+    def exercise_name(self) -> str:
+        return self.exercise.name
+
+
+class SyncVersion(Base):
+    """Per-user change counter; every write transaction claims the next value."""
+    __tablename__ = "sync_versions"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class SyncTombstone(Base):
+    """A deleted body/meal log or workout session, kept for GET /sync."""
+    __tablename__ = "sync_tombstones"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # table name of the deleted row
+    entity = Column(String, nullable=False)
+    row_id = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False)
+    __table_args__ = (Index("ix_sync_tombstones_user_version", "user_id", "version"),)
@@ -3,3 +3,4 @@ from . import body_logs
 from . import meal_logs
 from . import dashboard
 from . import workouts
+from . import export
@@ -0,0 +1,89 @@
+"""Async versions of the hot endpoints, mounted ahead of the sync routers when DB_ASYNC=1.
+
+Statements and write logic are shared with the sync routers: list endpoints await
+the same statement builders, writes and the dashboard run the shared sync code
+on the AsyncSession's connection through ``run_sync``.
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+
+from ..db import get_async_db
+from .. import models, schemas
+from ..services import pagination, rolling, serialization
+from ..services.cache import response_cache
+from . import body_logs, dashboard, meal_logs
+
+dashboard_router = APIRouter()
+body_logs_router = APIRouter()
+meal_logs_router = APIRouter()
+
+
+@dashboard_router.get("/summary", response_model=schemas.DashboardSummary)
+async def summary(
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    window_days: dashboard.WindowDays = rolling.DEFAULT_WINDOW_DAYS,
+    delta_days: dashboard.WindowDays = rolling.DEFAULT_DELTA_DAYS,
+    ema_alpha: dashboard.EmaAlpha = rolling.DEFAULT_EMA_ALPHA,
+    db: AsyncSession = Depends(get_async_db),
+):
+    result = await db.run_sync(dashboard.summary_payload, from_date, to_date, (window_days, delta_days, ema_alpha))
+    return serialization.ORJSONResponse(result)
+
+
+async def list_or_page(db: AsyncSession, stmt, model, schema, limit: Optional[int], cursor: Optional[str]):
+    if limit is not None or cursor is not None:
+        stmt, limit = pagination.keyset_stmt(stmt, model, limit, cursor)
+    rows = (await db.execute(serialization.row_stmt(stmt, model, schema))).all()
+    return serialization.ORJSONResponse(serialization.page_content(rows, limit))
+
+
+@body_logs_router.get("/", response_model=Union[List[schemas.BodyLogResponse], schemas.BodyLogPage])
+async def get_body_logs(
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    limit: Optional[int] = Query(None, ge=1, le=pagination.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await list_or_page(db, body_logs.body_logs_stmt(from_date, to_date), models.BodyLog, schemas.BodyLogResponse, limit, cursor)
+
+
+@body_logs_router.post("/", response_model=schemas.BodyLogResponse)
+async def upsert_body_log(payload: schemas.BodyLogCreate, db: AsyncSession = Depends(get_async_db)):
+    obj = await db.run_sync(body_logs.apply_body_log, payload)
+    await db.commit()
+    response_cache.bump(1)
+    await db.refresh(obj)
+    return obj
+
+
+@meal_logs_router.get("/", response_model=Union[List[schemas.MealLogResponse], schemas.MealLogPage])
+async def get_meal_logs(
+    date: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=pagination.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await list_or_page(db, meal_logs.meal_logs_stmt(date), models.MealLog, schemas.MealLogResponse, limit, cursor)
+
+
+@meal_logs_router.get("/range", response_model=Union[List[schemas.MealLogResponse], schemas.MealLogPage])
+async def get_meal_logs_range(
+    from_date: str = Query(..., alias="from"),
+    to_date: str = Query(..., alias="to"),
+    limit: Optional[int] = Query(None, ge=1, le=pagination.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await list_or_page(db, meal_logs.meal_logs_range_stmt(from_date, to_date), models.MealLog, schemas.MealLogResponse, limit, cursor)
+
+
+@meal_logs_router.post("/", response_model=schemas.MealLogResponse)
+async def create_meal_log(payload: schemas.MealLogCreate, db: AsyncSession = Depends(get_async_db)):
+    obj = await db.run_sync(meal_logs.add_meal_log, payload)
+    await db.commit()
+    response_cache.bump(1)
+    await db.refresh(obj)
+    return obj
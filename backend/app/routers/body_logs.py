@@ -1,48 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from ..db import get_db
+from ..db import dialect_insert, get_db
 from .. import models, schemas
+from ..services.cache import response_cache
+from ..services import pagination, rollups, serialization, versions, write_queue
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[schemas.BodyLogResponse])
-def get_body_logs(from_date: Optional[str] = Query(None, alias="from"), to_date: Optional[str] = Query(None, alias="to"), db: Session = Depends(get_db)):
-    q = db.query(models.BodyLog).filter(models.BodyLog.user_id == 1)
+def body_logs_stmt(from_date: Optional[str], to_date: Optional[str]):
+    # shared with the async router
+    stmt = select(models.BodyLog).where(models.BodyLog.user_id == 1)
     if from_date:
-        q = q.filter(models.BodyLog.date >= from_date)
+        stmt = stmt.where(models.BodyLog.date >= from_date)
     if to_date:
-        q = q.filter(models.BodyLog.date <= to_date)
-    return q.order_by(models.BodyLog.date).all()
+        stmt = stmt.where(models.BodyLog.date <= to_date)
+    return stmt.order_by(models.BodyLog.date, models.BodyLog.id)
+
+
+@router.get("/", response_model=Union[List[schemas.BodyLogResponse], schemas.BodyLogPage])
+def get_body_logs(
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    limit: Optional[int] = Query(None, ge=1, le=pagination.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    # without limit/cursor the full list is returned, as before; with them a page + next_cursor
+    return serialization.list_response(db, body_logs_stmt(from_date, to_date), models.BodyLog, schemas.BodyLogResponse, limit, cursor)
+
+
+def apply_body_log(db: Session, payload: schemas.BodyLogCreate) -> models.BodyLog:
+    # upsert by (user_id, date); shared with the async router, the caller commits
+    obj = db.query(models.BodyLog).filter(models.BodyLog.user_id == 1, models.BodyLog.date == payload.date).first()
+    if obj:
+        for k, v in payload.model_dump(exclude_unset=True).items():
+            setattr(obj, k, v)
+        obj.created_at = datetime.utcnow()
+    else:
+        obj = models.BodyLog(user_id=1, **payload.model_dump())
+        db.add(obj)
+    obj.version = versions.next_version(db, 1)
+    rollups.refresh_days(db, 1, [obj.date])
+    return obj
 
 
 @router.post("/", response_model=schemas.BodyLogResponse)
 def upsert_body_log(payload: schemas.BodyLogCreate, db: Session = Depends(get_db)):
-    # upsert by (user_id, date)
-    existing = db.query(models.BodyLog).filter(models.BodyLog.user_id == 1, models.BodyLog.date == payload.date).first()
-    if existing:
-        for k, v in payload.dict(exclude_unset=True).items():
-            setattr(existing, k, v)
-        existing.created_at = datetime.utcnow()
-        db.commit()
-        db.refresh(existing)
-        return existing
-
-    new = models.BodyLog(user_id=1, **payload.dict())
-    db.add(new)
+    def write(session: Session):
+        obj = apply_body_log(session, payload)
+        session.flush()
+        return schemas.BodyLogResponse.model_validate(obj)
+
+    # committed on its own, or batched with concurrent writes (services/write_queue.py)
+    return write_queue.run(db, 1, write)
+
+
+@router.post("/bulk", response_model=schemas.BulkWriteResponse)
+def upsert_body_logs_bulk(payload: List[schemas.BodyLogCreate] = Body(..., max_length=schemas.BULK_MAX_ROWS), db: Session = Depends(get_db)):
+    # INSERT ... ON CONFLICT on uix_user_date_body instead of a SELECT per row. Like the
+    # single upsert, a conflicting row only gets the fields present in its payload.
+    # Rows of the same date are merged first, in payload order (as if upserted one by
+    # one), so the groups below never hold a date twice and their order does not matter.
+    # Rows are grouped by their set of fields and each group is one executemany.
+    if not payload:
+        return {"count": 0}
+    now, version = datetime.utcnow(), versions.next_version(db, 1)
+    by_date = {}
+    for p in payload:
+        by_date.setdefault(p.date, {}).update(p.model_dump(exclude_unset=True))
+    groups = {}
+    for fields in by_date.values():
+        groups.setdefault(tuple(sorted(fields)), []).append({"user_id": 1, "created_at": now, "version": version, **fields})
+    for keys, rows in groups.items():
+        stmt = dialect_insert(db, models.BodyLog)
+        set_ = {k: stmt.excluded[k] for k in keys + ("created_at", "version") if k != "date"}
+        db.execute(stmt.on_conflict_do_update(index_elements=["user_id", "date"], set_=set_), rows)
+    rollups.refresh_days(db, 1, {p.date for p in payload})
     db.commit()
-    db.refresh(new)
-    return new
+    response_cache.bump(1)
+    return {"count": len(payload)}
 
 
 @router.delete("/{item_id}")
 def delete_body_log(item_id: int, db: Session = Depends(get_db)):
-    obj = db.query(models.BodyLog).filter(models.BodyLog.user_id == 1, models.BodyLog.id == item_id).first()
-    if not obj:
-        raise HTTPException(status_code=404, detail="not found")
-    db.delete(obj)
-    db.commit()
-    return {"status": "deleted"}
+    def write(session: Session):
+        obj = session.query(models.BodyLog).filter(models.BodyLog.user_id == 1, models.BodyLog.id == item_id).first()
+        if not obj:
+            raise HTTPException(status_code=404, detail="not found")
+        versions.record_deletes(session, 1, models.BodyLog, [obj.id])
+        session.delete(obj)
+        rollups.refresh_days(session, 1, [obj.date])
+        return {"status": "deleted"}
+
+    return write_queue.run(db, 1, write)
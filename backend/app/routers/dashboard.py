@@ -1,13 +1,17 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import datetime, timedelta, date
-from typing import Optional, List
+from typing import Annotated, Optional, Tuple
+
+import numpy as np
 
 from ..db import get_db
 from .. import models, schemas
-from ..services.calculations import compute_bmr, compute_tdee, recommended_intake
+from ..services import rolling, serialization
+from ..services.aggregates import Series, compute_dashboard_aggregates
+from ..services.cache import response_cache
+from ..services.single_flight import flights
+from ..services.calculations import compute_bmr, compute_metabolics_array, compute_tdee, recommended_intake
 
 router = APIRouter()
 
@@ -18,32 +22,58 @@ def parse_date(s: Optional[str], default: date) -> date:
     return datetime.strptime(s, "%Y-%m-%d").date()
 
 
+def series_to_json(series: Series) -> list:
+    return [{"date": d.isoformat(), "value": v} for d, v in series]
+
+
+# (window_days, delta_days, ema_alpha) of the weight statistics
+RollingWindows = Tuple[int, int, float]
+DEFAULT_WINDOWS: RollingWindows = (rolling.DEFAULT_WINDOW_DAYS, rolling.DEFAULT_DELTA_DAYS, rolling.DEFAULT_EMA_ALPHA)
+
+
+# Annotated so the defaults stay plain values when the handlers are called directly
+WindowDays = Annotated[int, Query(ge=1, le=365)]
+EmaAlpha = Annotated[float, Query(gt=0, le=1)]
+
+
 @router.get("/summary", response_model=schemas.DashboardSummary)
-def summary(from_date: Optional[str] = Query(None, alias="from"), to_date: Optional[str] = Query(None, alias="to"), db: Session = Depends(get_db)):
+def summary(
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    window_days: WindowDays = rolling.DEFAULT_WINDOW_DAYS,
+    delta_days: WindowDays = rolling.DEFAULT_DELTA_DAYS,
+    ema_alpha: EmaAlpha = rolling.DEFAULT_EMA_ALPHA,
+    db: Session = Depends(get_db),
+):
+    windows = (window_days, delta_days, ema_alpha)
+    result = summary_payload(db, from_date, to_date, windows)
+
+    # explicit UTF-8 charset (set by ORJSONResponse) avoids client-side garbling
+    return serialization.ORJSONResponse(result)
+
+
+def summary_payload(db: Session, from_date: Optional[str], to_date: Optional[str], windows: Optional[RollingWindows] = None) -> dict:
+    # shared with the async router
     today = date.today()
     to_d = parse_date(to_date, today)
     from_d = parse_date(from_date, to_d - timedelta(days=29))
+    windows = windows or DEFAULT_WINDOWS
+    params = (from_d, to_d, windows)
+    # on a cache miss, concurrent identical requests share one build
+    return response_cache.get_or_compute(
+        1, "dashboard.summary", params, lambda: flights.do(1, "dashboard.summary", params, lambda: build_summary(db, from_d, to_d, windows))
+    )
 
-    # weight/bodyfat series
-    body_q = db.query(models.BodyLog).filter(models.BodyLog.user_id == 1, models.BodyLog.date >= from_d, models.BodyLog.date <= to_d).order_by(models.BodyLog.date)
-    weight_series = [schemas.SeriesPoint(date=r.date, value=r.weight_kg) for r in body_q.all()]
-    bodyfat_series = [schemas.SeriesPoint(date=r.date, value=r.bodyfat_pct) for r in body_q.all()]
-
-    # intake series (daily sum)
-    intake_q = db.query(models.MealLog.date, func.sum(models.MealLog.calories_kcal).label("total")).filter(models.MealLog.user_id == 1, models.MealLog.date >= from_d, models.MealLog.date <= to_d).group_by(models.MealLog.date).order_by(models.MealLog.date)
-    intake_series = [schemas.SeriesPoint(date=r.date, value=float(r.total)) for r in intake_q.all()]
-
-    # protein series (daily sum)
-    protein_q = db.query(models.MealLog.date, func.sum(models.MealLog.protein_g).label("total")).filter(models.MealLog.user_id == 1, models.MealLog.date >= from_d, models.MealLog.date <= to_d).group_by(models.MealLog.date).order_by(models.MealLog.date)
-    protein_series = [schemas.SeriesPoint(date=r.date, value=(float(r.total) if r.total is not None else 0.0)) for r in protein_q.all()]
 
-    # profile and tdee
+def build_summary(db: Session, from_d: date, to_d: date, windows: RollingWindows = DEFAULT_WINDOWS) -> dict:
     profile = db.query(models.Profile).filter(models.Profile.user_id == 1).first()
     if not profile:
         raise HTTPException(status_code=404, detail="profile not found")
 
+    agg = compute_dashboard_aggregates(db, 1, from_d, to_d, *windows)
+
     # pick current weight from latest body log if available
-    latest_body = db.query(models.BodyLog).filter(models.BodyLog.user_id == 1).order_by(models.BodyLog.date.desc()).first()
+    latest_body = agg.latest_body
     current_weight = latest_body.weight_kg if latest_body else (profile.goal_weight_kg or 70.0)
     current_bodyfat = latest_body.bodyfat_pct if latest_body else profile.current_bodyfat_pct
 
@@ -51,22 +81,27 @@ def summary(from_date: Optional[str] = Query(None, alias="from"), to_date: Optio
     tdee = compute_tdee(bmr, profile.activity_level or 1.2)
     rec = recommended_intake(tdee, profile.goal_calories_kcal, profile.goal_rate_kg_per_week)
 
-    # avg intake 7d (ending at to_d)
-    start7 = to_d - timedelta(days=6)
-    avg_q = db.query(func.sum(models.MealLog.calories_kcal).label("total"), func.count(func.distinct(models.MealLog.date)).label("days")).filter(models.MealLog.user_id == 1, models.MealLog.date >= start7, models.MealLog.date <= to_d)
-    ag = avg_q.first()
-    if ag and ag.days and ag.total is not None:
-        avg_7d = float(ag.total) / float(7)
-    else:
-        avg_7d = None
-
-    # avg protein 7d
-    pavg_q = db.query(func.sum(models.MealLog.protein_g).label("total"), func.count(func.distinct(models.MealLog.date)).label("days")).filter(models.MealLog.user_id == 1, models.MealLog.date >= start7, models.MealLog.date <= to_d)
-    pag = pavg_q.first()
-    if pag and pag.days and pag.total is not None:
-        avg_protein_7d = float(pag.total) / float(7)
-    else:
-        avg_protein_7d = None
+    # per-day targets from each day's carried-forward body log, in one batched call;
+    # days before the first log use the same fallbacks as the scalar values above
+    no_log = np.isnan(agg.daily_weight)
+    fallback_bodyfat = profile.current_bodyfat_pct if profile.current_bodyfat_pct is not None else np.nan
+    daily = compute_metabolics_array(
+        np.where(no_log, profile.goal_weight_kg or 70.0, agg.daily_weight),
+        profile.height_cm or 170,
+        profile.age or 30,
+        profile.sex or "",
+        profile.activity_level or 1.2,
+        bodyfat_pct=np.where(no_log, fallback_bodyfat, agg.daily_bodyfat),
+        goal_calories_kcal=profile.goal_calories_kcal,
+        goal_rate_kg_per_week=profile.goal_rate_kg_per_week,
+    )
+
+    adaptive_rec = None
+    if agg.adaptive_tdee is not None:
+        adaptive_rec = recommended_intake(agg.adaptive_tdee, profile.goal_calories_kcal, profile.goal_rate_kg_per_week)
+
+    avg_7d = agg.avg_intake_7d
+    avg_protein_7d = agg.avg_protein_7d
 
     recommendation_text = None
     if avg_7d is not None:
@@ -76,17 +111,24 @@ def summary(from_date: Optional[str] = Query(None, alias="from"), to_date: Optio
         recommendation_text = f"目標に近づくには、平均摂取を {sign}{int(recommend_adjust)} kcal/日 調整してください。"
 
     # convert date objects to ISO strings for JSON serialization
-    result = {
-        "weight_series": [{"date": r.date.isoformat(), "value": r.value} for r in weight_series],
-        "bodyfat_series": [{"date": r.date.isoformat(), "value": r.value} for r in bodyfat_series],
-        "intake_series": [{"date": r.date.isoformat(), "value": r.value} for r in intake_series],
-        "protein_series": [{"date": r.date.isoformat(), "value": r.value} for r in protein_series],
+    return {
+        "weight_series": series_to_json(agg.weight_series),
+        "bodyfat_series": series_to_json(agg.bodyfat_series),
+        "intake_series": series_to_json(agg.intake_series),
+        "protein_series": series_to_json(agg.protein_series),
+        "tdee_series": series_to_json(list(zip(agg.days, daily["tdee"].tolist()))),
+        "recommended_intake_series": series_to_json(list(zip(agg.days, daily["recommended_intake"].tolist()))),
+        "trend_weight_series": series_to_json(agg.trend_weight_series),
+        "weight_ema_series": series_to_json(agg.weight_stats.ema),
+        "weight_ma_series": series_to_json(agg.weight_stats.moving_average),
+        "weight_delta_series": series_to_json(agg.weight_stats.delta),
+        "weight_rate_series": series_to_json(agg.weight_stats.rate_per_week),
+        "adaptive_tdee_series": series_to_json(agg.adaptive_tdee_series),
         "tdee": tdee,
+        "adaptive_tdee": agg.adaptive_tdee,
+        "adaptive_recommended_intake": adaptive_rec,
         "recommended_intake": rec,
         "avg_intake_7d": avg_7d,
         "avg_protein_7d": avg_protein_7d,
         "recommendation_text": recommendation_text,
     }
-
-    # Return JSON with explicit UTF-8 charset to avoid client-side garbling
-    return JSONResponse(content=result, media_type="application/json; charset=utf-8")
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Literal
+
+from ..db import get_db
+from ..services import export
+
+router = APIRouter()
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson; charset=utf-8"}
+
+
+@router.get("/{dataset}.{fmt}")
+def export_dataset(dataset: Literal["body-logs", "meal-logs", "workouts"], fmt: Literal["csv", "ndjson"], db: Session = Depends(get_db)):
+    # rows are read with yield_per and serialized chunk by chunk, so memory stays
+    # flat and the first bytes go out before the whole history has been read. The
+    # generator reads from ``db`` after this returns: FastAPI >= 0.118 closes
+    # yield dependencies only once the response has been sent (requirements.txt)
+    if dataset == "body-logs":
+        columns, rows = export.BODY_LOG_COLUMNS, export.body_log_rows(db, 1)
+    elif dataset == "meal-logs":
+        columns, rows = export.MEAL_LOG_COLUMNS, export.meal_log_rows(db, 1)
+    elif fmt == "ndjson":
+        # one line per session with its sets nested
+        columns, rows = export.SESSION_COLUMNS + ["sets"], export.nest_workout_rows(export.workout_rows(db, 1))
+    else:
+        columns, rows = export.WORKOUT_COLUMNS, export.workout_rows(db, 1)
+
+    body = export.iter_csv(columns, rows) if fmt == "csv" else export.iter_ndjson(columns, rows)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{fmt}"'},
+    )
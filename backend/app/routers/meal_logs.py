@@ -1,55 +1,112 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy import insert, select
+from typing import List, Optional, Union
 
 from ..db import get_db
 from .. import models, schemas
+from ..services.cache import response_cache
+from ..services import pagination, rollups, serialization, versions, write_queue
 from datetime import date
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[schemas.MealLogResponse])
-def get_meal_logs(date: Optional[str] = None, db: Session = Depends(get_db)):
-    q = db.query(models.MealLog).filter(models.MealLog.user_id == 1)
+# statement builders shared with the async router
+def meal_logs_stmt(date: Optional[str]):
+    stmt = select(models.MealLog).where(models.MealLog.user_id == 1)
     if date:
-        q = q.filter(models.MealLog.date == date)
-    return q.order_by(models.MealLog.date).all()
+        stmt = stmt.where(models.MealLog.date == date)
+    return stmt.order_by(models.MealLog.date, models.MealLog.id)
 
 
-@router.get("/range", response_model=List[schemas.MealLogResponse])
-def get_meal_logs_range(from_date: str = Query(..., alias="from"), to_date: str = Query(..., alias="to"), db: Session = Depends(get_db)):
-    q = db.query(models.MealLog).filter(models.MealLog.user_id == 1, models.MealLog.date >= from_date, models.MealLog.date <= to_date)
-    return q.order_by(models.MealLog.date).all()
+def meal_logs_range_stmt(from_date: str, to_date: str):
+    stmt = select(models.MealLog).where(models.MealLog.user_id == 1, models.MealLog.date >= from_date, models.MealLog.date <= to_date)
+    return stmt.order_by(models.MealLog.date, models.MealLog.id)
 
 
-@router.post("/", response_model=schemas.MealLogResponse)
-def create_meal_log(payload: schemas.MealLogCreate, db: Session = Depends(get_db)):
-    obj = models.MealLog(user_id=1, **payload.dict())
+def list_or_page(db: Session, stmt, limit: Optional[int], cursor: Optional[str]):
+    # without limit/cursor the full list is returned, as before; with them a page + next_cursor
+    return serialization.list_response(db, stmt, models.MealLog, schemas.MealLogResponse, limit, cursor)
+
+
+@router.get("/", response_model=Union[List[schemas.MealLogResponse], schemas.MealLogPage])
+def get_meal_logs(
+    date: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=pagination.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    return list_or_page(db, meal_logs_stmt(date), limit, cursor)
+
+
+@router.get("/range", response_model=Union[List[schemas.MealLogResponse], schemas.MealLogPage])
+def get_meal_logs_range(
+    from_date: str = Query(..., alias="from"),
+    to_date: str = Query(..., alias="to"),
+    limit: Optional[int] = Query(None, ge=1, le=pagination.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    return list_or_page(db, meal_logs_range_stmt(from_date, to_date), limit, cursor)
+
+
+def add_meal_log(db: Session, payload: schemas.MealLogCreate) -> models.MealLog:
+    # shared with the async router; the caller commits
+    obj = models.MealLog(user_id=1, version=versions.next_version(db, 1), **payload.model_dump())
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    rollups.refresh_days(db, 1, [obj.date])
     return obj
 
 
+@router.post("/", response_model=schemas.MealLogResponse)
+def create_meal_log(payload: schemas.MealLogCreate, db: Session = Depends(get_db)):
+    def write(session: Session):
+        obj = add_meal_log(session, payload)
+        session.flush()
+        return schemas.MealLogResponse.model_validate(obj)
+
+    # committed on its own, or batched with concurrent writes (services/write_queue.py)
+    return write_queue.run(db, 1, write)
+
+
+@router.post("/bulk", response_model=schemas.BulkWriteResponse)
+def create_meal_logs_bulk(payload: List[schemas.MealLogCreate] = Body(..., max_length=schemas.BULK_MAX_ROWS), db: Session = Depends(get_db)):
+    # one executemany INSERT and one rollup refresh for the whole import, in a single transaction
+    if payload:
+        version = versions.next_version(db, 1)
+        db.execute(insert(models.MealLog), [{"user_id": 1, "version": version, **p.model_dump()} for p in payload])
+        rollups.refresh_days(db, 1, {p.date for p in payload})
+        db.commit()
+        response_cache.bump(1)
+    return {"count": len(payload)}
+
+
 @router.put("/{item_id}", response_model=schemas.MealLogResponse)
 def update_meal_log(item_id: int, payload: schemas.MealLogCreate, db: Session = Depends(get_db)):
-    obj = db.query(models.MealLog).filter(models.MealLog.user_id == 1, models.MealLog.id == item_id).first()
-    if not obj:
-        raise HTTPException(status_code=404, detail="not found")
-    for k, v in payload.dict(exclude_unset=True).items():
-        setattr(obj, k, v)
-    db.commit()
-    db.refresh(obj)
-    return obj
+    def write(session: Session):
+        obj = session.query(models.MealLog).filter(models.MealLog.user_id == 1, models.MealLog.id == item_id).first()
+        if not obj:
+            raise HTTPException(status_code=404, detail="not found")
+        old_date = obj.date
+        for k, v in payload.model_dump(exclude_unset=True).items():
+            setattr(obj, k, v)
+        obj.version = versions.next_version(session, 1)
+        rollups.refresh_days(session, 1, [old_date, obj.date])
+        return schemas.MealLogResponse.model_validate(obj)
+
+    return write_queue.run(db, 1, write)
 
 
 @router.delete("/{item_id}")
 def delete_meal_log(item_id: int, db: Session = Depends(get_db)):
-    obj = db.query(models.MealLog).filter(models.MealLog.user_id == 1, models.MealLog.id == item_id).first()
-    if not obj:
-        raise HTTPException(status_code=404, detail="not found")
-    db.delete(obj)
-    db.commit()
-    return {"status": "deleted"}
+    def write(session: Session):
+        obj = session.query(models.MealLog).filter(models.MealLog.user_id == 1, models.MealLog.id == item_id).first()
+        if not obj:
+            raise HTTPException(status_code=404, detail="not found")
+        versions.record_deletes(session, 1, models.MealLog, [obj.id])
+        session.delete(obj)
+        rollups.refresh_days(session, 1, [obj.date])
+        return {"status": "deleted"}
+
+    return write_queue.run(db, 1, write)
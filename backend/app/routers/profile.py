@@ -4,6 +4,8 @@ from datetime import datetime
 
 from ..db import get_db
 from .. import models, schemas
+from ..services import adaptive_tdee, serialization, versions
+from ..services.cache import response_cache
 from ..services.calculations import compute_bmr, compute_tdee, recommended_intake
 
 router = APIRouter()
@@ -25,16 +27,22 @@ def put_profile(payload: schemas.ProfileCreate, db: Session = Depends(get_db)):
         profile = models.Profile(user_id=1)
         db.add(profile)
 
-    for k, v in payload.dict(exclude_unset=True).items():
+    for k, v in payload.model_dump(exclude_unset=True).items():
         setattr(profile, k, v)
     profile.updated_at = datetime.utcnow()
+    versions.next_version(db, 1)
     db.commit()
+    response_cache.bump(1)
     db.refresh(profile)
     return profile
 
 
 @router.get("/compute")
 def compute_profile_metrics(db: Session = Depends(get_db)):
+    return serialization.ORJSONResponse(response_cache.get_or_compute(1, "profile.compute", (), lambda: build_profile_metrics(db)))
+
+
+def build_profile_metrics(db: Session) -> dict:
     profile = db.query(models.Profile).filter(models.Profile.user_id == 1).first()
     if not profile:
         raise HTTPException(status_code=404, detail="profile not found")
@@ -60,4 +68,17 @@ def compute_profile_metrics(db: Session = Depends(get_db)):
         weekly_change = (profile.goal_weight_kg - weight) / 12.0
         goal_rate = weekly_change
     
-    return {"bmr": bmr, "tdee": tdee, "recommended_intake": rec_intake, "recommended_rate_kg_per_week": goal_rate}
+    # expenditure estimated from the logs; None until enough days are logged
+    latest = adaptive_tdee.latest_state(db, 1)
+    adaptive = adaptive_tdee.reported_estimate(latest)
+    adaptive_rec = recommended_intake(adaptive, None, profile.goal_rate_kg_per_week) if adaptive is not None else None
+
+    return {
+        "bmr": bmr,
+        "tdee": tdee,
+        "recommended_intake": rec_intake,
+        "recommended_rate_kg_per_week": goal_rate,
+        "adaptive_tdee": adaptive,
+        "adaptive_recommended_intake": adaptive_rec,
+        "adaptive_sample_days": latest.tdee_sample_days if latest else 0,
+    }
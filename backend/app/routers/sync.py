@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Annotated
+
+from ..db import get_db
+from .. import schemas
+from ..services import serialization, versions
+
+router = APIRouter()
+
+
+@router.get("", response_model=schemas.SyncResponse)
+def sync(since: Annotated[int, Query(ge=0)] = 0, db: Session = Depends(get_db)):
+    # body/meal logs and workout sessions written after `since`, plus tombstones;
+    # since=0 (a first sync) returns everything. Rows come from the (user_id, version) indexes.
+    return serialization.ORJSONResponse(versions.changes(db, 1, since))
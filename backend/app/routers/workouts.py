@@ -1,34 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from typing import List, Literal, Optional, Union
+from datetime import date, datetime, timedelta
 
-from ..db import get_db
+from ..db import get_db, insert_returning_ids
 from .. import models, schemas
+from ..services import exercises, pagination, versions, workout_analytics, write_queue
+from ..services.cache import response_cache
+from ..services.single_flight import flights
 
 router = APIRouter()
 
 
+# nested collections are loaded with one extra SELECT ... IN query each, never one per parent row
+def templates_query(db: Session):
+    return db.query(models.WorkoutTemplate).options(selectinload(models.WorkoutTemplate.items)).filter(models.WorkoutTemplate.user_id == 1)
+
+
+def sessions_query(db: Session):
+    return db.query(models.WorkoutSession).options(selectinload(models.WorkoutSession.sets)).filter(models.WorkoutSession.user_id == 1)
+
+
 @router.get("/templates", response_model=List[schemas.WorkoutTemplateResponse])
 def get_templates(db: Session = Depends(get_db)):
-    templates = db.query(models.WorkoutTemplate).filter(models.WorkoutTemplate.user_id == 1).all()
+    templates = templates_query(db).all()
     return templates
 
 
 @router.post("/templates", response_model=schemas.WorkoutTemplateResponse)
 def create_template(payload: schemas.WorkoutTemplateCreate, db: Session = Depends(get_db)):
     tpl = models.WorkoutTemplate(user_id=1, name=payload.name, description=payload.description)
+    if payload.items:
+        ids = exercises.resolve_ids(db, 1, [it.exercise_name for it in payload.items])
+        tpl.items = [models.WorkoutTemplateItem(exercise_id=ids[it.exercise_name], **it.model_dump()) for it in payload.items]
+    else:
+        tpl.items = []
     db.add(tpl)
+    # one flush assigns every id; the response is built before the commit expires the objects
+    db.flush()
+    result = schemas.WorkoutTemplateResponse.model_validate(tpl)
+    versions.next_version(db, 1)
     db.commit()
-    db.refresh(tpl)
-    # items
-    if payload.items:
-        for it in payload.items:
-            item = models.WorkoutTemplateItem(template_id=tpl.id, **it.dict())
-            db.add(item)
-        db.commit()
-    db.refresh(tpl)
-    return tpl
+    response_cache.bump(1)
+    return result
 
 
 @router.put("/templates/{tpl_id}", response_model=schemas.WorkoutTemplateResponse)
@@ -38,7 +53,9 @@ def update_template(tpl_id: int, payload: schemas.WorkoutTemplateBase, db: Sessi
         raise HTTPException(status_code=404, detail="not found")
     tpl.name = payload.name
     tpl.description = payload.description
+    versions.next_version(db, 1)
     db.commit()
+    response_cache.bump(1)
     db.refresh(tpl)
     return tpl
 
@@ -49,7 +66,9 @@ def delete_template(tpl_id: int, db: Session = Depends(get_db)):
     if not tpl:
         raise HTTPException(status_code=404, detail="not found")
     db.delete(tpl)
+    versions.next_version(db, 1)
     db.commit()
+    response_cache.bump(1)
     return {"status": "deleted"}
 
 
@@ -59,48 +78,144 @@ def get_template_items(tpl_id: int, db: Session = Depends(get_db)):
     return items
 
 
-@router.put("/templates/{tpl_id}/items", response_model=List[schemas.WorkoutTemplateItemResponse])
-def upsert_template_items(tpl_id: int, items: List[schemas.WorkoutTemplateItemCreate], db: Session = Depends(get_db)):
-    # simple approach: delete existing and recreate
-    db.query(models.WorkoutTemplateItem).filter(models.WorkoutTemplateItem.template_id == tpl_id).delete()
-    db.commit()
-    created = []
+ITEM_FIELDS = tuple(schemas.WorkoutTemplateItemBase.model_fields) + ("exercise_id",)
+
+
+def replace_template_items(db: Session, tpl_id: int, items: List[schemas.WorkoutTemplateItemUpsert]) -> None:
+    """Make ``items`` the template's item list with set-based statements; the caller commits.
+
+    Payload items are matched to existing rows by id, then by order_index. Matched rows
+    are updated only if they changed, and keep their ids. The rest are inserted, and
+    rows nobody matched are deleted. Each kind of change is one executemany.
+    """
+    t = models.WorkoutTemplateItem
+    ids = exercises.resolve_ids(db, 1, [it.exercise_name for it in items])
+    existing = {r.id: r for r in db.execute(select(t.id, *(getattr(t, c) for c in ITEM_FIELDS)).where(t.template_id == tpl_id))}
+
+    claimed = {it.id for it in items if it.id in existing}
+    by_order = {}
+    for r in existing.values():
+        if r.id not in claimed and r.order_index is not None:
+            by_order.setdefault(r.order_index, r.id)
+
+    matched, updates, inserts = set(), [], []
     for it in items:
-        obj = models.WorkoutTemplateItem(template_id=tpl_id, **it.dict())
-        db.add(obj)
-        created.append(obj)
+        values = {**it.model_dump(exclude={"id"}), "exercise_id": ids[it.exercise_name]}
+        row_id = it.id if it.id in claimed and it.id not in matched else by_order.pop(it.order_index, None)
+        if row_id is None:
+            inserts.append({"template_id": tpl_id, **values})
+            continue
+        matched.add(row_id)
+        if any(getattr(existing[row_id], c) != v for c, v in values.items()):
+            updates.append({"id": row_id, **values})
+
+    removed = existing.keys() - matched
+    if removed:
+        db.execute(delete(t).where(t.template_id == tpl_id, t.id.in_(removed)))
+    if updates:
+        # ORM bulk UPDATE by primary key
+        db.execute(update(t), updates)
+    if inserts:
+        db.execute(insert(t), inserts)
+
+
+@router.put("/templates/{tpl_id}/items", response_model=List[schemas.WorkoutTemplateItemResponse])
+def upsert_template_items(tpl_id: int, items: List[schemas.WorkoutTemplateItemUpsert], db: Session = Depends(get_db)):
+    # readers never see a half-replaced list: the diff and its result share one transaction
+    if db.scalar(select(models.WorkoutTemplate.id).where(models.WorkoutTemplate.user_id == 1, models.WorkoutTemplate.id == tpl_id)) is None:
+        raise HTTPException(status_code=404, detail="not found")
+    replace_template_items(db, tpl_id, items)
+    result = get_template_items(tpl_id, db)
+    versions.next_version(db, 1)
     db.commit()
-    return created
+    response_cache.bump(1)
+    return result
+
+
+@router.get("/bootstrap", response_model=schemas.WorkoutBootstrapResponse)
+def get_bootstrap(session_limit: int = Query(100, ge=1, le=1000), db: Session = Depends(get_db)):
+    # everything the workouts page needs in four queries: templates, their items, recent sessions, their sets
+    templates = templates_query(db).all()
+    sessions = (
+        sessions_query(db)
+        .order_by(models.WorkoutSession.date.desc(), models.WorkoutSession.id.desc())
+        .limit(session_limit)
+        .all()
+    )
+    return {"templates": templates, "sessions": sessions}
 
 
-@router.get("/sessions", response_model=List[schemas.WorkoutSessionResponse])
-def get_sessions(from_date: Optional[str] = Query(None, alias="from"), to_date: Optional[str] = Query(None, alias="to"), db: Session = Depends(get_db)):
-    q = db.query(models.WorkoutSession).filter(models.WorkoutSession.user_id == 1)
+def sessions_stmt(from_date: Optional[str] = None, to_date: Optional[str] = None):
+    stmt = select(models.WorkoutSession).options(selectinload(models.WorkoutSession.sets)).where(models.WorkoutSession.user_id == 1)
     if from_date:
-        q = q.filter(models.WorkoutSession.date >= from_date)
+        stmt = stmt.where(models.WorkoutSession.date >= from_date)
     if to_date:
-        q = q.filter(models.WorkoutSession.date <= to_date)
-    return q.order_by(models.WorkoutSession.date.desc()).all()
+        stmt = stmt.where(models.WorkoutSession.date <= to_date)
+    return stmt.order_by(models.WorkoutSession.date.desc(), models.WorkoutSession.id.desc())
+
+
+@router.get("/sessions", response_model=Union[List[schemas.WorkoutSessionResponse], schemas.WorkoutSessionPage])
+def get_sessions(
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    limit: Optional[int] = Query(None, ge=1, le=pagination.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    # newest first; without limit/cursor the full list is returned, as before.
+    # Concurrent identical requests share one query; the results are schemas,
+    # not objects of the session that loaded them.
+    def compute():
+        stmt = sessions_stmt(from_date, to_date)
+        if limit is None and cursor is None:
+            return [schemas.WorkoutSessionResponse.model_validate(s) for s in db.scalars(stmt)]
+        stmt, page_size = pagination.keyset_stmt(stmt, models.WorkoutSession, limit, cursor, descending=True)
+        return schemas.WorkoutSessionPage.model_validate(pagination.keyset_page(db.scalars(stmt).all(), page_size))
+
+    return flights.do(1, "workouts.sessions", (from_date, to_date, limit, cursor), compute)
 
 
 @router.post("/sessions", response_model=schemas.WorkoutSessionResponse)
 def create_session(payload: schemas.WorkoutSessionCreate, db: Session = Depends(get_db)):
-    sess = models.WorkoutSession(user_id=1, date=payload.date, template_id=payload.template_id, note=payload.note)
-    db.add(sess)
+    def write(session: Session):
+        sess = models.WorkoutSession(user_id=1, date=payload.date, template_id=payload.template_id, note=payload.note)
+        sess.version = versions.next_version(session, 1)
+        ids = exercises.resolve_ids(session, 1, [s.exercise_name for s in payload.sets or []])
+        sess.sets = [models.WorkoutSet(exercise_id=ids[s.exercise_name], **s.model_dump()) for s in payload.sets or []]
+        session.add(sess)
+        # flushes the session and its sets before recomputing the records they touch
+        workout_analytics.refresh_exercises(session, 1, set(ids.values()))
+        session.flush()
+        return schemas.WorkoutSessionResponse.model_validate(sess)
+
+    # committed on its own, or batched with concurrent writes (services/write_queue.py)
+    return write_queue.run(db, 1, write)
+
+
+@router.post("/sessions/bulk", response_model=schemas.BulkWriteResponse)
+def create_sessions_bulk(payload: List[schemas.WorkoutSessionCreate] = Body(..., max_length=schemas.BULK_MAX_ROWS), db: Session = Depends(get_db)):
+    # sessions in one executemany INSERT ... RETURNING id, then every set in a second one
+    if not payload:
+        return {"count": 0}
+    version = versions.next_version(db, 1)
+    session_ids = insert_returning_ids(db, models.WorkoutSession, [
+        {"user_id": 1, "date": p.date, "template_id": p.template_id, "note": p.note, "version": version} for p in payload
+    ])
+    sets = [{"session_id": sid, **s.model_dump()} for sid, p in zip(session_ids, payload) for s in (p.sets or [])]
+    if sets:
+        ids = exercises.resolve_ids(db, 1, [s["exercise_name"] for s in sets])
+        for s in sets:
+            s["exercise_id"] = ids[s["exercise_name"]]
+        db.execute(insert(models.WorkoutSet), sets)
+        workout_analytics.refresh_exercises(db, 1, set(ids.values()))
     db.commit()
-    db.refresh(sess)
-    if payload.sets:
-        for s in payload.sets:
-            obj = models.WorkoutSet(session_id=sess.id, **s.dict())
-            db.add(obj)
-        db.commit()
-    db.refresh(sess)
-    return sess
+    response_cache.bump(1)
+    return {"count": len(payload)}
 
 
 @router.get("/sessions/{id}", response_model=schemas.WorkoutSessionResponse)
 def get_session(id: int, db: Session = Depends(get_db)):
-    sess = db.query(models.WorkoutSession).filter(models.WorkoutSession.user_id == 1, models.WorkoutSession.id == id).first()
+    sess = sessions_query(db).filter(models.WorkoutSession.id == id).first()
     if not sess:
         raise HTTPException(status_code=404, detail="not found")
     return sess
@@ -108,9 +223,108 @@ def get_session(id: int, db: Session = Depends(get_db)):
 
 @router.delete("/sessions/{id}")
 def delete_session(id: int, db: Session = Depends(get_db)):
-    sess = db.query(models.WorkoutSession).filter(models.WorkoutSession.user_id == 1, models.WorkoutSession.id == id).first()
-    if not sess:
+    def write(session: Session):
+        sess = session.query(models.WorkoutSession).filter(models.WorkoutSession.user_id == 1, models.WorkoutSession.id == id).first()
+        if not sess:
+            raise HTTPException(status_code=404, detail="not found")
+        exercise_ids = {s.exercise_id for s in sess.sets}
+        versions.record_deletes(session, 1, models.WorkoutSession, [sess.id])
+        session.delete(sess)
+        workout_analytics.refresh_exercises(session, 1, exercise_ids)
+        return {"status": "deleted"}
+
+    return write_queue.run(db, 1, write)
+
+
+@router.get("/analytics/records", response_model=List[schemas.ExerciseBestResponse])
+def get_records(db: Session = Depends(get_db)):
+    # personal records per exercise, maintained on session writes
+    stmt = (
+        select(models.ExerciseBest)
+        .join(models.ExerciseBest.exercise)
+        .options(contains_eager(models.ExerciseBest.exercise))
+        .where(models.ExerciseBest.user_id == 1)
+        .order_by(models.Exercise.name)
+    )
+    return db.scalars(stmt).all()
+
+
+@router.get("/analytics/weekly", response_model=List[schemas.ExerciseProgression])
+def get_weekly_progression(
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    exercise: Optional[str] = None,
+    exercise_id: Optional[int] = None,
+    formula: Literal["epley", "brzycki"] = "epley",
+    db: Session = Depends(get_db),
+):
+    # weekly tonnage, set count and best estimated 1RM per exercise (default: last 12 weeks)
+    to_d = to_date or date.today()
+    from_d = from_date or workout_analytics.week_start(to_d) - timedelta(weeks=11)
+    if exercise is not None and exercise_id is None:
+        # any alias or spelling variant of the name
+        exercise_id = exercises.lookup_id(db, 1, exercise)
+        if exercise_id is None:
+            return []
+    return workout_analytics.weekly_progression(db, 1, from_d, to_d, exercise_id, formula)
+
+
+def exercise_to_dict(ex: models.Exercise) -> dict:
+    return {"id": ex.id, "name": ex.name, "muscle_groups": exercises.split_tags(ex.muscle_groups), "aliases": [a.alias for a in ex.aliases if a.alias != ex.name]}
+
+
+def get_exercise_or_404(db: Session, ex_id: int) -> models.Exercise:
+    ex = db.query(models.Exercise).filter(models.Exercise.user_id == 1, models.Exercise.id == ex_id).first()
+    if not ex:
         raise HTTPException(status_code=404, detail="not found")
-    db.delete(sess)
+    return ex
+
+
+@router.get("/exercises", response_model=List[schemas.ExerciseResponse])
+def get_exercises(db: Session = Depends(get_db)):
+    rows = db.query(models.Exercise).options(selectinload(models.Exercise.aliases)).filter(models.Exercise.user_id == 1).order_by(models.Exercise.name).all()
+    return [exercise_to_dict(ex) for ex in rows]
+
+
+@router.post("/exercises", response_model=schemas.ExerciseResponse)
+def create_exercise(payload: schemas.ExerciseCreate, db: Session = Depends(get_db)):
+    ex = models.Exercise(user_id=1, name=payload.name.strip(), muscle_groups=exercises.join_tags(payload.muscle_groups))
+    db.add(ex)
+    db.flush()
+    exercises.set_aliases(db, 1, ex, payload.aliases)
+    versions.next_version(db, 1)
     db.commit()
-    return {"status": "deleted"}
+    response_cache.bump(1)
+    db.refresh(ex)
+    return exercise_to_dict(ex)
+
+
+@router.put("/exercises/{ex_id}", response_model=schemas.ExerciseResponse)
+def update_exercise(ex_id: int, payload: schemas.ExerciseCreate, db: Session = Depends(get_db)):
+    # renames, retags and replaces the alias list; the old name stays an alias so
+    # sets logged under it keep resolving here
+    ex = get_exercise_or_404(db, ex_id)
+    old_name = ex.name
+    ex.name = payload.name.strip()
+    ex.muscle_groups = exercises.join_tags(payload.muscle_groups)
+    exercises.set_aliases(db, 1, ex, [*payload.aliases, old_name])
+    versions.next_version(db, 1)
+    db.commit()
+    response_cache.bump(1)
+    db.refresh(ex)
+    return exercise_to_dict(ex)
+
+
+@router.post("/exercises/{ex_id}/merge/{source_id}", response_model=schemas.ExerciseResponse)
+def merge_exercise(ex_id: int, source_id: int, db: Session = Depends(get_db)):
+    # fold a spelling variant into ex_id: its history, template items and aliases move over
+    if ex_id == source_id:
+        raise HTTPException(status_code=400, detail="cannot merge an exercise into itself")
+    target = get_exercise_or_404(db, ex_id)
+    source = get_exercise_or_404(db, source_id)
+    exercises.merge(db, 1, target, source)
+    workout_analytics.refresh_exercises(db, 1, [target.id])
+    db.commit()
+    response_cache.bump(1)
+    db.refresh(target)
+    return exercise_to_dict(target)
@@ -1,5 +1,5 @@
 from typing import Optional, List
-from pydantic import BaseModel, Field, conint, confloat
+from pydantic import BaseModel, ConfigDict, Field, conint, confloat
 from datetime import date
 
 
@@ -24,8 +24,7 @@ class ProfileResponse(ProfileBase):
     id: int
     user_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class BodyLogBase(BaseModel):
@@ -45,8 +44,12 @@ class BodyLogResponse(BodyLogBase):
     id: int
     user_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BodyLogPage(BaseModel):
+    items: List[BodyLogResponse] = []
+    next_cursor: Optional[str] = None
 
 
 class MealLogBase(BaseModel):
@@ -67,8 +70,20 @@ class MealLogResponse(MealLogBase):
     id: int
     user_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MealLogPage(BaseModel):
+    items: List[MealLogResponse] = []
+    next_cursor: Optional[str] = None
+
+
+# upper bound for one bulk import request (a year of meals is ~1.5k rows)
+BULK_MAX_ROWS = 10000
+
+
+class BulkWriteResponse(BaseModel):
+    count: int
 
 
 class SeriesPoint(BaseModel):
@@ -81,14 +96,25 @@ class DashboardSummary(BaseModel):
     bodyfat_series: List[SeriesPoint] = []
     intake_series: List[SeriesPoint] = []
     protein_series: List[SeriesPoint] = []
+    tdee_series: List[SeriesPoint] = []
+    recommended_intake_series: List[SeriesPoint] = []
+    trend_weight_series: List[SeriesPoint] = []
+    # rolling statistics of weight_series (window_days / delta_days / ema_alpha params)
+    weight_ema_series: List[SeriesPoint] = []
+    weight_ma_series: List[SeriesPoint] = []
+    weight_delta_series: List[SeriesPoint] = []
+    weight_rate_series: List[SeriesPoint] = []
+    adaptive_tdee_series: List[SeriesPoint] = []
     tdee: Optional[float] = None
     recommended_intake: Optional[float] = None
+    # expenditure estimated from logged intake and the weight trend
+    adaptive_tdee: Optional[float] = None
+    adaptive_recommended_intake: Optional[float] = None
     avg_intake_7d: Optional[float] = None
     avg_protein_7d: Optional[float] = None
     recommendation_text: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class WorkoutTemplateItemBase(BaseModel):
@@ -103,12 +129,17 @@ class WorkoutTemplateItemCreate(WorkoutTemplateItemBase):
     pass
 
 
+class WorkoutTemplateItemUpsert(WorkoutTemplateItemCreate):
+    # id of the existing item this one replaces; items without one match by order_index
+    id: Optional[int] = None
+
+
 class WorkoutTemplateItemResponse(WorkoutTemplateItemBase):
     id: int
     template_id: int
+    exercise_id: Optional[int] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class WorkoutTemplateBase(BaseModel):
@@ -125,8 +156,7 @@ class WorkoutTemplateResponse(WorkoutTemplateBase):
     user_id: int
     items: List[WorkoutTemplateItemResponse] = []
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class WorkoutSetBase(BaseModel):
@@ -145,9 +175,9 @@ class WorkoutSetCreate(WorkoutSetBase):
 class WorkoutSetResponse(WorkoutSetBase):
     id: int
     session_id: int
+    exercise_id: Optional[int] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class WorkoutSessionBase(BaseModel):
@@ -165,5 +195,88 @@ class WorkoutSessionResponse(WorkoutSessionBase):
     user_id: int
     sets: List[WorkoutSetResponse] = []
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WorkoutSessionPage(BaseModel):
+    items: List[WorkoutSessionResponse] = []
+    next_cursor: Optional[str] = None
+
+
+class ExerciseBase(BaseModel):
+    name: str
+    muscle_groups: List[str] = []
+
+
+class ExerciseCreate(ExerciseBase):
+    # other spellings that should resolve to this exercise
+    aliases: List[str] = []
+
+
+class ExerciseResponse(ExerciseBase):
+    id: int
+    aliases: List[str] = []
+
+
+class ExerciseBestResponse(BaseModel):
+    exercise_id: int
+    exercise_name: str
+    max_weight_kg: Optional[float] = None
+    best_e1rm_epley_kg: Optional[float] = None
+    best_e1rm_brzycki_kg: Optional[float] = None
+    best_set_volume_kg: Optional[float] = None
+    best_set_id: Optional[int] = None
+    best_set_date: Optional[date] = None
+    best_set_weight_kg: Optional[float] = None
+    best_set_reps: Optional[int] = None
+    total_sets: int = 0
+    total_tonnage_kg: float = 0
+    last_date: Optional[date] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ExerciseWeek(BaseModel):
+    week_start: date
+    tonnage_kg: float
+    sets: int
+    best_e1rm_kg: Optional[float] = None
+
+
+class ExerciseProgression(BaseModel):
+    exercise_id: int
+    exercise_name: str
+    weeks: List[ExerciseWeek] = []
+
+
+class WorkoutBootstrapResponse(BaseModel):
+    templates: List[WorkoutTemplateResponse] = []
+    sessions: List[WorkoutSessionResponse] = []
+
+
+class BodyLogSync(BodyLogResponse):
+    version: int
+
+
+class MealLogSync(MealLogResponse):
+    version: int
+
+
+class WorkoutSessionSync(WorkoutSessionResponse):
+    version: int
+
+
+class SyncDeleted(BaseModel):
+    body_logs: List[int] = []
+    meal_logs: List[int] = []
+    workout_sessions: List[int] = []
+
+
+class SyncResponse(BaseModel):
+    # pass it back as ?since= on the next sync
+    version: int
+    body_logs: List[BodyLogSync] = []
+    meal_logs: List[MealLogSync] = []
+    workout_sessions: List[WorkoutSessionSync] = []
+    # ids deleted since then; apply after the rows
+    deleted: SyncDeleted = SyncDeleted()
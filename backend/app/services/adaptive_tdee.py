@@ -0,0 +1,139 @@
+"""Adaptive TDEE: energy expenditure estimated from logged intake and the weight trend.
+
+Each daily_rollups row carries the estimator state as of that day: an exponentially
+smoothed weight (trend_weight_kg), a smoothed expenditure estimate
+(tdee_estimate_kcal) and the number of days that fed it (tdee_sample_days). A day's
+state depends only on the previous row's state and the day's own totals, so logging
+today costs O(1); editing a past day replays the rows after it.
+
+The trend moves only on weigh-ins. Each one is smoothed in as if the days since
+the previous weigh-in had each seen it (``ema_update`` with that gap), so days
+with meals but no weigh-in in between do not change the trend.
+
+The expenditure sample of a day with logged meals is the energy balance
+
+    intake - KCAL_PER_KG * (trend change per day)
+
+i.e. whatever was eaten minus what went into (or came out of) body mass. The
+trend change of a day is only known at the next weigh-in, so meal days wait until
+then: the weigh-in spreads the trend change over the days since the previous one
+and folds every meal day of that gap into the estimate, each with that daily
+change, as one averaged sample weighted like that many daily samples.
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, aliased
+
+from .. import models
+from .calculations import KCAL_PER_KG
+from .rolling import ema_update
+
+# share of the gap between weigh-in and trend taken per day (Hacker's Diet uses 10%)
+TREND_ALPHA = 0.1
+# weight of each daily energy-balance sample in the expenditure estimate
+TDEE_ALPHA = 0.1
+# samples needed before the estimate is reported
+MIN_SAMPLE_DAYS = 14
+
+STATE_COLUMNS = ("trend_weight_kg", "tdee_estimate_kcal", "tdee_sample_days")
+
+
+@dataclass
+class AdaptiveState:
+    date: date
+    trend_weight_kg: Optional[float] = None
+    tdee_estimate_kcal: Optional[float] = None
+    tdee_sample_days: int = 0
+    # derived from the rows, not stored: the last weigh-in on or before ``date``,
+    # and the intake of the meal days after it, waiting for the next weigh-in
+    weighed_on: Optional[date] = None
+    pending_intake_kcal: float = 0.0
+    pending_days: int = 0
+
+    def as_dict(self) -> dict:
+        return {c: getattr(self, c) for c in STATE_COLUMNS}
+
+
+def step(prev: Optional[AdaptiveState], day: date, weight_kg: Optional[float], intake_kcal: Optional[float]) -> AdaptiveState:
+    """State after ``day`` given the previous rollup row's state (None for the first row).
+
+    ``intake_kcal`` is None on days without logged meals.
+    """
+    if prev is None:
+        prev = AdaptiveState(date=day)
+    prev_trend, weighed_on = prev.trend_weight_kg, prev.weighed_on
+    tdee, samples = prev.tdee_estimate_kcal, prev.tdee_sample_days
+    pending_intake, pending_days = prev.pending_intake_kcal, prev.pending_days
+    if intake_kcal is not None and prev_trend is not None:
+        pending_intake, pending_days = pending_intake + intake_kcal, pending_days + 1
+
+    trend = prev_trend
+    if weight_kg is not None:
+        # measured from the previous weigh-in, not the previous row
+        gap = max((day - (weighed_on or prev.date)).days, 1)
+        trend = ema_update(prev_trend, weight_kg, TREND_ALPHA, gap)
+        if pending_days:
+            change_per_day = (trend - prev_trend) / gap
+            sample = pending_intake / pending_days - KCAL_PER_KG * change_per_day
+            tdee = ema_update(tdee, sample, TDEE_ALPHA, pending_days)
+            samples += pending_days
+        weighed_on, pending_intake, pending_days = day, 0.0, 0
+    return AdaptiveState(day, trend, tdee, samples, weighed_on, pending_intake, pending_days)
+
+
+def step_row(prev: Optional[AdaptiveState], row) -> AdaptiveState:
+    """``step`` for a daily_rollups row (ORM object, result row or dict)."""
+    get = row.get if isinstance(row, dict) else lambda c: getattr(row, c)
+    intake = get("calories_kcal") if get("meal_count") else None
+    return step(prev, get("date"), get("weight_kg"), intake)
+
+
+def replay(db: Session, user_id: int, since: date) -> int:
+    """Recompute the state of ``user_id``'s rollup rows from ``since`` on. Returns rows updated.
+
+    Called by rollups.refresh_days after it rewrote the touched days; for a write to
+    the latest day this reads two rows and updates one.
+    """
+    t, w, m = models.DailyRollup, aliased(models.DailyRollup), aliased(models.DailyRollup)
+    cols = (t.date, t.weight_kg, t.calories_kcal, t.meal_count) + tuple(getattr(t, c) for c in STATE_COLUMNS)
+    # the row before ``since`` and, in the same statement, the last weigh-in before it
+    # and the meal days between the two
+    weighed_on = select(func.max(w.date)).where(w.user_id == user_id, w.date < since, w.weight_kg.isnot(None)).scalar_subquery()
+    pending = select(m.calories_kcal).where(m.user_id == user_id, m.date > weighed_on, m.date < since, m.meal_count > 0).subquery()
+    before = db.execute(
+        select(
+            *cols,
+            weighed_on.label("weighed_on"),
+            select(func.coalesce(func.sum(pending.c.calories_kcal), 0)).scalar_subquery().label("pending_intake_kcal"),
+            select(func.count()).select_from(pending).scalar_subquery().label("pending_days"),
+        ).where(t.user_id == user_id, t.date < since).order_by(t.date.desc()).limit(1)
+    ).first()
+    state = None
+    if before:
+        state = AdaptiveState(
+            before.date, *(getattr(before, c) for c in STATE_COLUMNS), before.weighed_on, float(before.pending_intake_kcal), before.pending_days
+        )
+
+    updates = []
+    for row in db.execute(select(*cols).where(t.user_id == user_id, t.date >= since).order_by(t.date)):
+        state = step_row(state, row)
+        if tuple(getattr(row, c) for c in STATE_COLUMNS) != tuple(getattr(state, c) for c in STATE_COLUMNS):
+            updates.append({"user_id": user_id, "date": row.date, **state.as_dict()})
+    if updates:
+        # ORM bulk UPDATE by primary key: one executemany
+        db.execute(update(t), updates)
+    return len(updates)
+
+
+def reported_estimate(row) -> Optional[float]:
+    """The row's expenditure estimate, or None until it rests on MIN_SAMPLE_DAYS days."""
+    if row is None or row.tdee_estimate_kcal is None or (row.tdee_sample_days or 0) < MIN_SAMPLE_DAYS:
+        return None
+    return row.tdee_estimate_kcal
+
+
+def latest_state(db: Session, user_id: int):
+    return db.query(models.DailyRollup).filter(models.DailyRollup.user_id == user_id).order_by(models.DailyRollup.date.desc()).first()
@@ -0,0 +1,135 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from .. import models
+from . import rolling
+from .adaptive_tdee import reported_estimate
+from .rolling import Series
+
+
+@dataclass
+class DashboardAggregates:
+    weight_series: Series = field(default_factory=list)
+    bodyfat_series: Series = field(default_factory=list)
+    intake_series: Series = field(default_factory=list)
+    protein_series: Series = field(default_factory=list)
+    trend_weight_series: Series = field(default_factory=list)
+    adaptive_tdee_series: Series = field(default_factory=list)
+    # adaptive TDEE as of to_d (None while it rests on too few days)
+    adaptive_tdee: Optional[float] = None
+    avg_intake_7d: Optional[float] = None
+    avg_protein_7d: Optional[float] = None
+    # the user's latest weighed day, possibly outside the window (weight_kg / bodyfat_pct
+    # as in that day's body log)
+    latest_body: Optional[models.DailyRollup] = None
+    # EMA / moving average / delta / rate of the weight series
+    weight_stats: rolling.RollingStats = field(default_factory=rolling.RollingStats)
+    # one entry per calendar day of the window: the latest logged weight/bodyfat on or
+    # before that day (NaN before the first log; bodyfat NaN if that log had none)
+    days: List[date] = field(default_factory=list)
+    daily_weight: np.ndarray = field(default_factory=lambda: np.empty(0))
+    daily_bodyfat: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+
+def _nan(v: Optional[float]) -> float:
+    return np.nan if v is None else v
+
+
+def compute_dashboard_aggregates(
+    db: Session,
+    user_id: int,
+    from_d: date,
+    to_d: date,
+    window_days: int = rolling.DEFAULT_WINDOW_DAYS,
+    delta_days: int = rolling.DEFAULT_DELTA_DAYS,
+    ema_alpha: float = rolling.DEFAULT_EMA_ALPHA,
+) -> DashboardAggregates:
+    """Compute every dashboard series for [from_d, to_d] from one query.
+
+    The query reads the daily_rollups rows of the window plus enough days before it
+    to warm up the rolling windows and the trailing 7 days ending at to_d (one row
+    per day, however many meals were logged). Two more rows come with it: the last
+    weighed day before that lookback, carried into the window when the lookback
+    holds no weigh-in, and the user's latest weighed day, which may lie after to_d.
+    Everything else is derived from those rows. With the profile, the dashboard
+    summary is two queries.
+    """
+    result = DashboardAggregates()
+
+    n_days = max((to_d - from_d).days + 1, 0)
+    result.days = [from_d + timedelta(days=i) for i in range(n_days)]
+    # slot 0 holds the value carried in from before the window
+    weight = np.full(n_days + 1, np.nan)
+    bodyfat = np.full(n_days + 1, np.nan)
+    logged = np.zeros(n_days + 1, dtype=bool)
+
+    start7 = to_d - timedelta(days=6)
+    # the delta on from_d compares against the moving average delta_days earlier,
+    # which itself needs window_days of history
+    start = min(from_d - timedelta(days=window_days + delta_days), start7)
+    rollup, weighed = models.DailyRollup, aliased(models.DailyRollup)
+    last_weighed = select(func.max(weighed.date)).where(weighed.user_id == user_id, weighed.weight_kg.isnot(None))
+    fetched = (
+        db.query(rollup)
+        .filter(rollup.user_id == user_id, or_(
+            rollup.date.between(start, to_d),
+            rollup.date == last_weighed.where(weighed.date < start).scalar_subquery(),
+            rollup.date == last_weighed.scalar_subquery(),
+        ))
+        .order_by(rollup.date)
+        .all()
+    )
+    # the two extra rows only feed `before` and latest_body, never the series
+    rows = [row for row in fetched if start <= row.date <= to_d]
+    weighed_rows = [row for row in fetched if row.weight_kg is not None]
+    result.latest_body = weighed_rows[-1] if weighed_rows else None
+
+    weight_history: Series = []
+    intake_history: Series = []
+    protein_history: Series = []
+    before = next((row for row in fetched if row.date < start), None)
+    for r in rows:
+        if r.weight_kg is not None:
+            weight_history.append((r.date, r.weight_kg))
+        if r.meal_count > 0:
+            intake_history.append((r.date, float(r.calories_kcal)))
+            protein_history.append((r.date, float(r.protein_g) if r.protein_g is not None else None))
+        if r.date < from_d:
+            if r.weight_kg is not None:
+                before = r
+            continue
+        if r.trend_weight_kg is not None:
+            result.trend_weight_series.append((r.date, r.trend_weight_kg))
+        if reported_estimate(r) is not None:
+            result.adaptive_tdee_series.append((r.date, r.tdee_estimate_kcal))
+        if r.weight_kg is not None:
+            result.weight_series.append((r.date, r.weight_kg))
+            result.bodyfat_series.append((r.date, r.bodyfat_pct))
+            i = (r.date - from_d).days + 1
+            weight[i], bodyfat[i], logged[i] = r.weight_kg, _nan(r.bodyfat_pct), True
+        if r.meal_count > 0:
+            result.intake_series.append((r.date, float(r.calories_kcal)))
+            result.protein_series.append((r.date, float(r.protein_g) if r.protein_g is not None else 0.0))
+
+    if rows:
+        result.adaptive_tdee = reported_estimate(rows[-1])
+
+    result.weight_stats = rolling.rolling_stats(weight_history, window_days, delta_days, ema_alpha, since=from_d)
+    # averages are per calendar day, including days without any logged meal
+    result.avg_intake_7d = rolling.calendar_mean(intake_history, to_d, 7)
+    result.avg_protein_7d = rolling.calendar_mean(protein_history, to_d, 7)
+
+    if before is not None:
+        weight[0], bodyfat[0], logged[0] = before.weight_kg, _nan(before.bodyfat_pct), True
+
+    # carry each weighed day forward: index of the latest logged slot at or before each day
+    source = np.maximum.accumulate(np.where(logged, np.arange(n_days + 1), 0))
+    result.daily_weight = weight[source][1:]
+    result.daily_bodyfat = bodyfat[source][1:]
+
+    return result
@@ -0,0 +1,110 @@
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class ResponseCache:
+    """In-process LRU/TTL cache for computed responses, invalidated by per-user data versions.
+
+    Entries are keyed by (user_id, data version, endpoint, params). Write paths call
+    ``bump(user_id)`` after committing, which makes every older entry of that user
+    unreachable; those entries then age out through LRU eviction or their TTL.
+
+    Writes made by other worker processes or by scripts only move the persisted
+    version in sync_versions. The ETag middleware reads it for every API request
+    and hands it to ``observe``. It is part of the data version too, so this
+    process stops serving entries computed before such a write.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self._stored: Dict[int, int] = {}
+        # distinguishes this process's versions from those of an earlier run (ETags)
+        self.token = secrets.token_hex(4)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def version(self, user_id: int) -> Tuple[int, int]:
+        with self._lock:
+            return self._version(user_id)
+
+    def _version(self, user_id: int) -> Tuple[int, int]:
+        return self._versions.get(user_id, 0), self._stored.get(user_id, 0)
+
+    def bump(self, user_id: int) -> int:
+        """Mark the user's data as changed. Call after the write has been committed."""
+        with self._lock:
+            v = self._versions.get(user_id, 0) + 1
+            self._versions[user_id] = v
+            return v
+
+    def observe(self, user_id: int, stored: int) -> None:
+        """Record the user's persisted data version, as read for a request."""
+        with self._lock:
+            # concurrent requests may report an older read last: never go back to it
+            if stored > self._stored.get(user_id, 0):
+                self._stored[user_id] = stored
+
+    def get_or_compute(self, user_id: int, endpoint: str, params: Tuple[Hashable, ...], compute: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return compute()
+        with self._lock:
+            # the version is read before computing, so a write that lands while we
+            # compute stores the result under an already superseded key
+            key = (user_id, self._version(user_id), endpoint, params)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._stored.clear()
+            self.token = secrets.token_hex(4)
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else None,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+            }
+
+
+response_cache = ResponseCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "60")),
+)
@@ -1,4 +1,9 @@
-from typing import Optional
+from typing import Dict, Optional
+
+import numpy as np
+
+# energy content of one kg of body weight change
+KCAL_PER_KG = 7700
 
 
 def mifflin_bmr(weight_kg: float, height_cm: float, age: int, sex: str) -> float:
@@ -28,6 +33,92 @@ def recommended_intake(tdee: float, goal_calories_kcal: Optional[int] = None, go
     if goal_calories_kcal is not None:
         return float(goal_calories_kcal)
     if goal_rate_kg_per_week is not None:
-        daily_delta = (goal_rate_kg_per_week * 7700) / 7.0
+        daily_delta = (goal_rate_kg_per_week * KCAL_PER_KG) / 7.0
         return tdee + daily_delta
     return tdee
+
+
+def epley_1rm(weight_kg: float, reps: int) -> float:
+    if reps == 1:
+        return float(weight_kg)
+    return weight_kg * (1 + reps / 30.0)
+
+
+def brzycki_1rm(weight_kg: float, reps: int) -> Optional[float]:
+    # undefined from 37 reps on
+    if reps == 1:
+        return float(weight_kg)
+    if reps >= 37:
+        return None
+    return weight_kg * 36.0 / (37 - reps)
+
+
+# Array versions of the metabolic functions above. Arguments are array-likes (or scalars, which
+# broadcast) with one element per (user, day); None/NaN plays the role of a missing
+# Optional. Results match the scalar functions element by element.
+
+def _floats(values) -> np.ndarray:
+    # None -> NaN
+    return np.asarray(values, dtype=float)
+
+
+def is_male_array(sex) -> np.ndarray:
+    labels = np.char.lower(np.asarray(sex, dtype=str))
+    return (labels == "male") | (labels == "m")
+
+
+def mifflin_bmr_array(weight_kg, height_cm, age, sex) -> np.ndarray:
+    base = 10 * _floats(weight_kg) + 6.25 * _floats(height_cm) - 5 * _floats(age)
+    return np.where(is_male_array(sex), base + 5, base - 161)
+
+
+def katch_bmr_array(lbm_kg) -> np.ndarray:
+    return 370 + 21.6 * _floats(lbm_kg)
+
+
+def compute_bmr_array(weight_kg, height_cm, age, sex, bodyfat_pct=None) -> np.ndarray:
+    weight = _floats(weight_kg)
+    mifflin = mifflin_bmr_array(weight, height_cm, age, sex)
+    if bodyfat_pct is None:
+        return mifflin
+    bodyfat = _floats(bodyfat_pct)
+    katch = katch_bmr_array(weight * (1 - bodyfat / 100.0))
+    return np.where(np.isnan(bodyfat), mifflin, katch)
+
+
+def compute_tdee_array(bmr, activity_level) -> np.ndarray:
+    activity = _floats(activity_level)
+    # same fallback as `activity_level or 1.2`
+    activity = np.where(np.isnan(activity) | (activity == 0), 1.2, activity)
+    return _floats(bmr) * activity
+
+
+def recommended_intake_array(tdee, goal_calories_kcal=None, goal_rate_kg_per_week=None) -> np.ndarray:
+    result = _floats(tdee)
+    if goal_rate_kg_per_week is not None:
+        rate = _floats(goal_rate_kg_per_week)
+        result = np.where(np.isnan(rate), result, result + (rate * KCAL_PER_KG) / 7.0)
+    if goal_calories_kcal is not None:
+        goal = _floats(goal_calories_kcal)
+        result = np.where(np.isnan(goal), result, goal)
+    return result
+
+
+def compute_metabolics_array(
+    weight_kg,
+    height_cm,
+    age,
+    sex,
+    activity_level,
+    bodyfat_pct=None,
+    goal_calories_kcal=None,
+    goal_rate_kg_per_week=None,
+) -> Dict[str, np.ndarray]:
+    """BMR, TDEE and recommended intake for whole columns in one call."""
+    bmr = compute_bmr_array(weight_kg, height_cm, age, sex, bodyfat_pct)
+    tdee = compute_tdee_array(bmr, activity_level)
+    return {
+        "bmr": bmr,
+        "tdee": tdee,
+        "recommended_intake": recommended_intake_array(tdee, goal_calories_kcal, goal_rate_kg_per_week),
+    }
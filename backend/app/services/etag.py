@@ -0,0 +1,95 @@
+"""Conditional GETs: ETags from the persisted per-user data version.
+
+Every write claims a new version of the user's data in sync_versions
+(``versions.next_version``) before it commits, and so do the scripts that rewrite
+data outside the API. That counter identifies the state of all of the user's data
+for every worker process, and a URL whose ETag still matches cannot have changed.
+The middleware reads it with one primary key lookup and answers matching requests
+with 304 before routing, so no handler runs. Other responses get the current ETag
+and ``Cache-Control: no-cache``, which makes browsers revalidate instead of
+caching heuristically.
+
+- The version is read before the handler runs. A write landing meanwhile can
+  only make the ETag older than the body, which costs one extra full response
+  later and never serves stale data.
+- Responses whose defaults depend on today's date (the dashboard range) change
+  at midnight without a write, so the date is part of the tag.
+- The tag is weak (W/) because GZipMiddleware changes the bytes but not the
+  content.
+- The version is read through the app's ``get_db`` dependency, so it comes from
+  the same database as the handlers, including under ``dependency_overrides``.
+- The version is also handed to the response cache (``ResponseCache.observe``),
+  so the handlers' cached results follow writes made by other processes too.
+- Recreating the database restarts the counter. The process token in the tag
+  changes on restart, so restart the server after a reset.
+
+Last-Modified is not used: an HTTP date has one-second resolution, so two
+writes within the same second would look like no change.
+"""
+from datetime import date
+from typing import Iterable, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..db import get_db
+from . import versions
+from .cache import ResponseCache, response_cache
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def current_etag(cache: ResponseCache, version: int) -> str:
+    return f'W/"{cache.token}-{version}-{date.today().toordinal()}"'
+
+
+def stored_version(app, user_id: int) -> int:
+    """The user's persisted data version, read with a session from the app's ``get_db``."""
+    sessions = app.dependency_overrides.get(get_db, get_db)()
+    db = next(sessions)
+    try:
+        return versions.current_version(db, user_id)
+    finally:
+        sessions.close()
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # weak comparison (RFC 9110 13.1.2): the W/ prefix is ignored
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or any(t.removeprefix("W/") == etag.removeprefix("W/") for t in tags)
+
+
+class ConditionalGetMiddleware:
+    """ETag / If-None-Match for GET and HEAD requests under ``prefixes``."""
+
+    def __init__(self, app: ASGIApp, prefixes: Iterable[str], cache: ResponseCache = response_cache, user_id: int = 1):
+        self.app = app
+        self.prefixes: Tuple[str, ...] = tuple(prefixes)
+        self.cache = cache
+        self.user_id = user_id
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") or not scope["path"].startswith(self.prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        version = await run_in_threadpool(stored_version, scope["app"], self.user_id)
+        self.cache.observe(self.user_id, version)
+        etag = current_etag(self.cache, version)
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": [
+                (b"etag", etag.encode()), (b"cache-control", CACHE_CONTROL.encode()),
+            ]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers["ETag"] = etag
+                headers.setdefault("Cache-Control", CACHE_CONTROL)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,110 @@
+"""Exercise catalog: map free-text exercise names to exercises.id.
+
+Names are compared after normalize_name (NFKC, casefold, collapsed whitespace), so
+"ベンチプレス", "ﾍﾞﾝﾁﾌﾟﾚｽ" and " ベンチプレス " are one exercise, as are "Bench Press"
+and "bench  press". Other spellings are linked by adding aliases.
+"""
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..db import dialect_insert, insert_returning_ids
+from . import versions
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+
+def split_tags(muscle_groups: Optional[str]) -> List[str]:
+    return [t for t in (muscle_groups or "").split(",") if t]
+
+
+def join_tags(tags: Optional[Iterable[str]]) -> Optional[str]:
+    cleaned = list(dict.fromkeys(normalize_name(t) for t in (tags or []) if t.strip()))
+    return ",".join(cleaned) or None
+
+
+def _alias_ids(db: Session, user_id: int, keys: Iterable[str]) -> Dict[str, int]:
+    A = models.ExerciseAlias
+    return dict(db.execute(select(A.normalized, A.exercise_id).where(A.user_id == user_id, A.normalized.in_(list(keys)))).all())
+
+
+def resolve_ids(db: Session, user_id: int, names: Iterable[str]) -> Dict[str, int]:
+    """exercise id per name, creating catalog entries for names never seen before.
+
+    One SELECT for all names. New names add one INSERT for their exercises and one
+    INSERT ... ON CONFLICT DO NOTHING for their aliases. A concurrent request may
+    have added the same name since the SELECT: its alias wins, is read back, and
+    the exercises left without an alias are deleted again.
+    """
+    by_key: Dict[str, List[str]] = {}
+    for name in names:
+        by_key.setdefault(normalize_name(name), []).append(name)
+    if not by_key:
+        return {}
+
+    ids = _alias_ids(db, user_id, by_key)
+    missing = [key for key in by_key if key not in ids]
+    if missing:
+        # first spelling seen becomes the display name
+        display = {key: by_key[key][0].strip() for key in missing}
+        created = dict(zip(missing, insert_returning_ids(db, models.Exercise, [{"user_id": user_id, "name": display[key]} for key in missing])))
+        A = models.ExerciseAlias
+        stmt = dialect_insert(db, A).on_conflict_do_nothing(index_elements=["user_id", "normalized"]).returning(A.normalized)
+        inserted = set(db.scalars(stmt, [{"user_id": user_id, "exercise_id": created[key], "alias": display[key], "normalized": key} for key in missing]))
+        ids.update({key: created[key] for key in inserted})
+        lost = [key for key in missing if key not in inserted]
+        if lost:
+            ids.update(_alias_ids(db, user_id, lost))
+            db.execute(delete(models.Exercise).where(models.Exercise.id.in_([created[key] for key in lost])))
+    return {name: ids[key] for key, spellings in by_key.items() for name in spellings}
+
+
+def lookup_id(db: Session, user_id: int, name: str) -> Optional[int]:
+    A = models.ExerciseAlias
+    return db.scalar(select(A.exercise_id).where(A.user_id == user_id, A.normalized == normalize_name(name)))
+
+
+def set_aliases(db: Session, user_id: int, exercise: models.Exercise, aliases: Iterable[str]) -> None:
+    """Make ``aliases`` (plus the exercise's own name) its full alias list.
+
+    409 if a spelling already belongs to another exercise: merge the two instead.
+    """
+    wanted: Dict[str, str] = {}
+    for alias in [exercise.name, *aliases]:
+        if alias.strip():
+            wanted.setdefault(normalize_name(alias), alias.strip())
+    A = models.ExerciseAlias
+    taken = db.execute(select(A.normalized, A.exercise_id).where(A.user_id == user_id, A.normalized.in_(wanted), A.exercise_id != exercise.id)).all()
+    if taken:
+        raise HTTPException(status_code=409, detail=f"alias already used by exercise {taken[0].exercise_id}")
+    current = {a.normalized: a for a in exercise.aliases}
+    for key, a in current.items():
+        if key not in wanted:
+            exercise.aliases.remove(a)
+    db.flush()
+    for key, alias in wanted.items():
+        if key in current:
+            current[key].alias = alias
+        else:
+            exercise.aliases.append(models.ExerciseAlias(user_id=user_id, alias=alias, normalized=key))
+
+
+def merge(db: Session, user_id: int, target: models.Exercise, source: models.Exercise) -> None:
+    """Fold ``source`` into ``target``: its sets, template items and aliases move over."""
+    # the sessions' sets change exercise_id, so GET /sync sends them again
+    versions.touch(db, user_id, models.WorkoutSession, models.WorkoutSession.id.in_(
+        select(models.WorkoutSet.session_id).where(models.WorkoutSet.exercise_id == source.id)
+    ))
+    for model in (models.WorkoutSet, models.WorkoutTemplateItem):
+        db.execute(update(model).where(model.exercise_id == source.id).values(exercise_id=target.id))
+    db.execute(update(models.ExerciseAlias).where(models.ExerciseAlias.exercise_id == source.id).values(exercise_id=target.id))
+    db.execute(models.ExerciseBest.__table__.delete().where(models.ExerciseBest.user_id == user_id, models.ExerciseBest.exercise_id == source.id))
+    db.expire(target, ["aliases"])
+    db.expunge(source)
+    db.execute(models.Exercise.__table__.delete().where(models.Exercise.id == source.id))
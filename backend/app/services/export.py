@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from itertools import groupby
+from typing import Iterable, Iterator, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .. import models
+
+# rows fetched from the cursor per round trip; also the size of each streamed chunk
+EXPORT_BATCH_SIZE = 500
+
+BODY_LOG_COLUMNS = ["id", "date", "weight_kg", "bodyfat_pct", "muscle_mass_kg", "sleep_hours", "condition_note"]
+MEAL_LOG_COLUMNS = ["id", "date", "meal_type", "calories_kcal", "protein_g", "fat_g", "carbs_g", "memo"]
+SESSION_COLUMNS = ["session_id", "date", "template_id", "session_note"]
+SET_COLUMNS = ["set_id", "exercise_name", "set_no", "reps", "weight_kg", "rir", "set_note"]
+WORKOUT_COLUMNS = SESSION_COLUMNS + SET_COLUMNS
+
+
+def _stream(db: Session, stmt):
+    # yield_per fetches EXPORT_BATCH_SIZE rows at a time instead of buffering the result
+    return db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+
+def body_log_rows(db: Session, user_id: int) -> Iterator[Sequence]:
+    t = models.BodyLog
+    stmt = select(*(getattr(t, c) for c in BODY_LOG_COLUMNS)).where(t.user_id == user_id).order_by(t.date, t.id)
+    return iter(_stream(db, stmt))
+
+
+def meal_log_rows(db: Session, user_id: int) -> Iterator[Sequence]:
+    t = models.MealLog
+    stmt = select(*(getattr(t, c) for c in MEAL_LOG_COLUMNS)).where(t.user_id == user_id).order_by(t.date, t.id)
+    return iter(_stream(db, stmt))
+
+
+def workout_rows(db: Session, user_id: int) -> Iterator[Sequence]:
+    """One row per set (sessions without sets get one row with empty set columns)."""
+    s, w = models.WorkoutSession, models.WorkoutSet
+    stmt = (
+        select(
+            s.id, s.date, s.template_id, s.note,
+            w.id, w.exercise_name, w.set_no, w.reps, w.weight_kg, w.rir, w.note,
+        )
+        .outerjoin(w, w.session_id == s.id)
+        .where(s.user_id == user_id)
+        .order_by(s.date, s.id, w.id)
+    )
+    return iter(_stream(db, stmt))
+
+
+def _jsonable(v):
+    return v.isoformat() if isinstance(v, (date, datetime)) else v
+
+
+def iter_csv(columns: List[str], rows: Iterable[Sequence]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    for n, row in enumerate(rows, 1):
+        writer.writerow([_jsonable(v) for v in row])
+        if n % EXPORT_BATCH_SIZE == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def iter_ndjson(columns: List[str], rows: Iterable[Sequence]) -> Iterator[str]:
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps({c: _jsonable(v) for c, v in zip(columns, row)}, ensure_ascii=False))
+        if len(chunk) == EXPORT_BATCH_SIZE:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def nest_workout_rows(rows: Iterable[Sequence]) -> Iterator[Sequence]:
+    """Fold consecutive per-set rows into one (session..., sets) row per session."""
+    n = len(SESSION_COLUMNS)
+    for key, group in groupby(rows, key=lambda r: tuple(r[:n])):
+        sets = [dict(zip(SET_COLUMNS, (_jsonable(v) for v in r[n:]))) for r in group if r[n] is not None]
+        yield key + (sets,)
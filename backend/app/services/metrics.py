@@ -0,0 +1,248 @@
+"""Per-request performance metrics in Prometheus text format.
+
+MetricsMiddleware times every HTTP request. SQLAlchemy cursor hooks (installed
+with ``instrument_engine``) count the statements and the time spent in them for
+the request being served. Requests are labelled by route template
+(``/workouts/sessions/{id}``), never by raw path, so label cardinality stays
+bounded.
+
+Recorded per (method, route):
+
+- latency histogram and status counts
+- SQL statements per request (histogram) and SQL time
+- response body size (histogram; after gzip when GZipMiddleware is inside)
+
+``GET /metrics`` serves ``registry.render()``. With SERVER_TIMING=1 every response
+also carries ``Server-Timing: db;dur=..;desc="N queries", app;dur=..`` for the
+browser's network panel.
+
+Statements are attributed through a context variable, so only those run in the
+request's own context count. Writes committed by the group-commit thread
+(WRITE_QUEUE=1, services/write_queue.py) are not attributed to any request.
+
+Like the response cache, the numbers live in this process.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING", "0") == "1"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# label for requests that matched no route (404s, probes)
+UNMATCHED = "<unmatched>"
+
+
+@dataclass
+class RequestStats:
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+
+
+# stats of the request being served; the threadpool running sync handlers copies
+# the context, so their statements land in the same object
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _record(conn) -> None:
+    started = conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_seconds += time.perf_counter() - started
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record(conn)
+
+
+def _handle_error(exception_context):
+    # a failed statement never reaches after_cursor_execute: drop its start time
+    # here, or it stays on the pooled connection
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        _record(conn)
+
+
+def instrument_engine(engine=Engine) -> None:
+    """Count statements and their time per request on ``engine`` (default: every engine)."""
+    engine = getattr(engine, "sync_engine", engine)
+    if engine is not Engine and event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return  # already counted by the class-level hooks
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def lines(self, name: str, labels: str) -> List[str]:
+        out, cumulative = [], 0
+        for bound, n in zip(self.buckets, self.counts):
+            cumulative += n
+            out.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        out.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        out.append(f"{name}_sum{{{labels}}} {self.total}")
+        out.append(f"{name}_count{{{labels}}} {self.count}")
+        return out
+
+
+class RouteMetrics:
+    __slots__ = ("latency", "sql_count", "sql_seconds", "size", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.sql_count = Histogram(SQL_COUNT_BUCKETS)
+        self.sql_seconds = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.statuses: Dict[int, int] = {}
+
+
+HISTOGRAMS = (
+    ("latency", "http_request_duration_seconds", "Request latency"),
+    ("sql_count", "http_request_sql_statements", "SQL statements executed per request"),
+    ("sql_seconds", "http_request_sql_duration_seconds", "Time spent in SQL per request"),
+    ("size", "http_response_size_bytes", "Response body size"),
+)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats, size: int) -> None:
+        with self._lock:
+            m = self._routes.get((method, route))
+            if m is None:
+                m = self._routes[(method, route)] = RouteMetrics()
+            m.latency.observe(seconds)
+            m.sql_count.observe(stats.sql_count)
+            m.sql_seconds.observe(stats.sql_seconds)
+            m.size.observe(size)
+            m.statuses[status] = m.statuses.get(status, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self, extra: Sequence[str] = ()) -> str:
+        with self._lock:
+            routes = sorted(self._routes.items())
+            out = ["# HELP http_requests_total Requests by route and status", "# TYPE http_requests_total counter"]
+            for (method, route), m in routes:
+                for status, n in sorted(m.statuses.items()):
+                    out.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {n}')
+            for attr, name, doc in HISTOGRAMS:
+                out += [f"# HELP {name} {doc}", f"# TYPE {name} histogram"]
+                for (method, route), m in routes:
+                    out += getattr(m, attr).lines(name, f'method="{method}",route="{_escape(route)}"')
+        return "\n".join([*out, *extra]) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+registry = MetricsRegistry()
+
+
+def cache_lines(cache) -> List[str]:
+    """The response cache counters, as extra lines for ``MetricsRegistry.render``."""
+    stats = cache.stats()
+    out = []
+    for key in ("hits", "misses", "evictions"):
+        out += [f"# TYPE response_cache_{key}_total counter", f"response_cache_{key}_total {stats[key]}"]
+    return out + ["# TYPE response_cache_entries gauge", f"response_cache_entries {stats['size']}"]
+
+
+class RouteMatcher:
+    """Maps request paths to the app's route templates (from its OpenAPI paths)."""
+
+    def __init__(self, templates: Sequence[str]):
+        # static paths before parameterized ones, so /sessions/bulk wins over /sessions/{id}
+        ordered = sorted(templates, key=lambda t: ("{" in t, t))
+        self._patterns: List[Tuple[Pattern, str]] = [(compile_path(t)[0], t) for t in ordered]
+
+    def match(self, path: str) -> str:
+        for pattern, template in self._patterns:
+            if pattern.match(path):
+                return template
+        return UNMATCHED
+
+
+def server_timing(stats: RequestStats, seconds: float) -> str:
+    return f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.sql_count} queries", app;dur={seconds * 1000:.1f}'
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = registry, server_timing: bool = SERVER_TIMING_ENABLED):
+        self.app = app
+        self.registry = registry
+        self.server_timing = server_timing
+        self._matcher: Optional[RouteMatcher] = None
+
+    def _route(self, scope: Scope) -> str:
+        if self._matcher is None:
+            self._matcher = RouteMatcher(list(scope["app"].openapi()["paths"]))
+        return self._matcher.match(scope["path"])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status, size = 500, 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", server_timing(stats, time.perf_counter() - started))
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _current.reset(token)
+            self.registry.observe(scope["method"], self._route(scope), status, time.perf_counter() - started, stats, size)
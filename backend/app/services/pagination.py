@@ -0,0 +1,49 @@
+import base64
+import binascii
+from datetime import date
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(d: date, row_id: int) -> str:
+    raw = f"{d.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        d, row_id = raw.split("|")
+        return date.fromisoformat(d), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
+def keyset_stmt(stmt, model, limit: Optional[int], cursor: Optional[str], descending: bool = False):
+    """Restrict ``stmt`` to the page after ``cursor`` in (date, id) order.
+
+    Returns the statement (fetching one extra row to detect a next page) and the
+    effective page size. The (user_id, date) indexes make the cost of a page depend
+    on its size only, not on how many rows precede it.
+    """
+    limit = limit or DEFAULT_PAGE_SIZE
+    if cursor:
+        d, row_id = decode_cursor(cursor)
+        if descending:
+            stmt = stmt.where(or_(model.date < d, and_(model.date == d, model.id < row_id)))
+        else:
+            stmt = stmt.where(or_(model.date > d, and_(model.date == d, model.id > row_id)))
+    order = (model.date.desc(), model.id.desc()) if descending else (model.date, model.id)
+    return stmt.order_by(None).order_by(*order).limit(limit + 1), limit
+
+
+def keyset_page(rows: Sequence, limit: int) -> dict:
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        return {"items": rows[:limit], "next_cursor": encode_cursor(last.date, last.id)}
+    return {"items": rows, "next_cursor": None}
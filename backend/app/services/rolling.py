@@ -0,0 +1,99 @@
+"""Rolling statistics over sparse daily series.
+
+Series are (date, value) pairs ordered by date with at most one point per day;
+days may be missing (no weigh-in, no meals). Windows are calendar windows, so a
+7-day window always spans 7 days however many points fall inside it. Every
+function is a single O(n) pass.
+"""
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Deque, List, Optional, Tuple
+
+# (date, value) pairs, ordered by date
+Series = List[Tuple[date, Optional[float]]]
+
+DEFAULT_WINDOW_DAYS = 7
+DEFAULT_DELTA_DAYS = 7
+DEFAULT_EMA_ALPHA = 0.1
+
+
+def ema_update(prev: Optional[float], value: float, alpha: float, gap_days: int = 1) -> float:
+    """One EMA step; a gap of n days decays like n daily steps toward ``value``."""
+    if prev is None:
+        return value
+    return prev + (1 - (1 - alpha) ** max(gap_days, 1)) * (value - prev)
+
+
+def calendar_mean(series: Series, end: date, days: int) -> Optional[float]:
+    """Sum of the points in the ``days`` days ending at ``end``, divided by ``days``.
+
+    Days without a point count as zero (per-calendar-day intake averages); None if
+    the window holds no point at all.
+    """
+    start = end - timedelta(days=days - 1)
+    values = [v for d, v in series if start <= d <= end and v is not None]
+    return sum(values) / days if values else None
+
+
+@dataclass
+class RollingStats:
+    # exponential moving average, gap-aware
+    ema: Series = field(default_factory=list)
+    # mean of the points in the trailing window_days calendar days
+    moving_average: Series = field(default_factory=list)
+    # moving average minus the moving average delta_days (or more) earlier
+    delta: Series = field(default_factory=list)
+    # delta scaled to a per-week rate using the actual distance between the points
+    rate_per_week: Series = field(default_factory=list)
+
+
+def rolling_stats(
+    series: Series,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    delta_days: int = DEFAULT_DELTA_DAYS,
+    ema_alpha: float = DEFAULT_EMA_ALPHA,
+    since: Optional[date] = None,
+) -> RollingStats:
+    """EMA, moving average, delta and rate of ``series`` in one pass.
+
+    Points before ``since`` only warm up the windows and the EMA; the returned series
+    start at ``since``. Pass at least window_days + delta_days days of history before
+    it for fully warmed moving averages and deltas on the first day: the delta's
+    anchor lies delta_days back and its own average spans window_days before that.
+    """
+    points = [(d, v) for d, v in series if v is not None]
+    stats = RollingStats()
+
+    window: Deque[Tuple[date, float]] = deque()
+    total = 0.0
+    ema: Optional[float] = None
+    prev_date: Optional[date] = None
+    # moving averages seen so far, and the index of the latest one at least delta_days back
+    averages: List[Tuple[date, float]] = []
+    anchor = -1
+
+    for d, v in points:
+        ema = ema_update(ema, v, ema_alpha, (d - prev_date).days if prev_date else 1)
+        prev_date = d
+
+        window.append((d, v))
+        total += v
+        while window[0][0] <= d - timedelta(days=window_days):
+            total -= window.popleft()[1]
+        ma = total / len(window)
+        averages.append((d, ma))
+
+        while anchor + 1 < len(averages) and averages[anchor + 1][0] <= d - timedelta(days=delta_days):
+            anchor += 1
+
+        if since is not None and d < since:
+            continue
+        stats.ema.append((d, ema))
+        stats.moving_average.append((d, ma))
+        if anchor >= 0:
+            anchor_date, anchor_ma = averages[anchor]
+            delta = ma - anchor_ma
+            stats.delta.append((d, delta))
+            stats.rate_per_week.append((d, delta / (d - anchor_date).days * 7))
+    return stats
@@ -0,0 +1,115 @@
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..db import dialect_insert
+from . import adaptive_tdee
+
+MEAL_TOTALS = ("calories_kcal", "protein_g", "fat_g", "carbs_g", "meal_count")
+BODY_METRICS = ("weight_kg", "bodyfat_pct", "muscle_mass_kg")
+
+
+def _meal_totals_query(db: Session):
+    return db.query(
+        models.MealLog.user_id,
+        models.MealLog.date,
+        func.sum(models.MealLog.calories_kcal).label("calories_kcal"),
+        func.sum(models.MealLog.protein_g).label("protein_g"),
+        func.sum(models.MealLog.fat_g).label("fat_g"),
+        func.sum(models.MealLog.carbs_g).label("carbs_g"),
+        func.count(models.MealLog.id).label("meal_count"),
+    ).group_by(models.MealLog.user_id, models.MealLog.date)
+
+
+def _empty_row(user_id: int, day: date) -> dict:
+    row = {"user_id": user_id, "date": day, "calories_kcal": 0, "meal_count": 0}
+    row.update({col: None for col in ("protein_g", "fat_g", "carbs_g") + BODY_METRICS})
+    return row
+
+
+class _RowsByDay(dict):
+    def __missing__(self, key):
+        row = self[key] = _empty_row(*key)
+        return row
+
+
+def _collect(meal_rows, body_rows, rows: dict) -> dict:
+    for r in meal_rows:
+        rows[(r.user_id, r.date)].update({col: getattr(r, col) for col in MEAL_TOTALS})
+    for b in body_rows:
+        rows[(b.user_id, b.date)].update({col: getattr(b, col) for col in BODY_METRICS})
+    return rows
+
+
+def refresh_days(db: Session, user_id: int, days: Iterable[date]) -> None:
+    """Recompute the rollup rows of the given days from meal_logs / body_logs.
+
+    Write handlers call this after changing logs (with the old *and* new date when
+    a log moves), inside their own transaction. The cost depends only on the
+    number of logs of the touched days, never on the length of the history; the
+    adaptive TDEE state is then replayed from the earliest touched day (one row
+    when the latest day is written).
+    """
+    days = set(days)
+    if not days:
+        return
+    db.flush()
+
+    meal_rows = _meal_totals_query(db).filter(models.MealLog.user_id == user_id, models.MealLog.date.in_(days))
+    body_rows = db.query(models.BodyLog).filter(models.BodyLog.user_id == user_id, models.BodyLog.date.in_(days))
+    rows = _collect(meal_rows, body_rows, {(user_id, d): _empty_row(user_id, d) for d in days})
+
+    live = [r for r in rows.values() if r["meal_count"] or r["weight_kg"] is not None]
+    empty = [r["date"] for r in rows.values() if not (r["meal_count"] or r["weight_kg"] is not None)]
+    if live:
+        stmt = dialect_insert(db, models.DailyRollup)
+        cols = MEAL_TOTALS + BODY_METRICS
+        db.execute(stmt.on_conflict_do_update(index_elements=["user_id", "date"], set_={c: stmt.excluded[c] for c in cols}), live)
+    if empty:
+        db.execute(delete(models.DailyRollup).where(models.DailyRollup.user_id == user_id, models.DailyRollup.date.in_(empty)))
+    adaptive_tdee.replay(db, user_id, min(days))
+
+
+def rebuild_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """Recompute daily_rollups from the raw logs (all users, or one). Returns the row count.
+
+    The caller commits.
+    """
+    db.flush()
+    meal_q = _meal_totals_query(db)
+    body_q = db.query(models.BodyLog)
+    delete_q = delete(models.DailyRollup)
+    if user_id is not None:
+        meal_q = meal_q.filter(models.MealLog.user_id == user_id)
+        body_q = body_q.filter(models.BodyLog.user_id == user_id)
+        delete_q = delete_q.where(models.DailyRollup.user_id == user_id)
+    rows = _collect(meal_q, body_q, _RowsByDay())
+    # (user_id, date) order: the adaptive TDEE state runs through each user's days
+    state, current_user = None, None
+    for key in sorted(rows):
+        if key[0] != current_user:
+            state, current_user = None, key[0]
+        state = adaptive_tdee.step_row(state, rows[key])
+        rows[key].update(state.as_dict())
+    db.execute(delete_q)
+    if rows:
+        db.execute(models.DailyRollup.__table__.insert(), list(rows.values()))
+    return len(rows)
+
+
+def ensure_backfilled(db: Session) -> None:
+    """Populate daily_rollups once for databases that predate the table (or its state columns)."""
+    rollup = models.DailyRollup
+    if db.query(rollup.user_id).first() is not None:
+        # rows written before the adaptive TDEE columns existed have no trend yet
+        if db.query(rollup.user_id).filter(rollup.weight_kg.isnot(None), rollup.trend_weight_kg.is_(None)).first() is not None:
+            rebuild_rollups(db)
+            db.commit()
+        return
+    if db.query(models.MealLog.id).first() is None and db.query(models.BodyLog.id).first() is None:
+        return
+    rebuild_rollups(db)
+    db.commit()
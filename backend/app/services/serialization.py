@@ -0,0 +1,65 @@
+"""JSON output without a per-row Pydantic round trip.
+
+Routes with a ``response_model`` validate every returned ORM object against the
+schema (``from_attributes``) before dumping it. For rows we selected ourselves
+that work only re-checks what the database already guarantees, so the list
+endpoints select exactly the schema's fields as plain columns and hand the rows
+to orjson, which also writes dates natively. ``response_model`` stays on those
+routes for the OpenAPI schema; returning a Response skips its validation.
+
+Responses built from dicts (dashboard, profile compute) use ORJSONResponse too.
+Routes that still return models keep FastAPI's default response class: with it
+FastAPI dumps straight to JSON bytes in pydantic-core, and a custom default
+class would turn that off.
+"""
+from typing import Any, Iterable, List, Optional, Type
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from . import pagination
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    # explicit charset: some clients garble Japanese text without it
+    media_type = "application/json; charset=utf-8"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> list:
+    """The model's columns for each field of ``schema``, in the schema's order."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def row_stmt(stmt, model, schema: Type[BaseModel]):
+    """``stmt`` (a select of ``model``) narrowed to plain columns for ``schema``."""
+    return stmt.with_only_columns(*schema_columns(model, schema))
+
+
+def rows_to_dicts(rows: Iterable) -> List[dict]:
+    return [r._asdict() for r in rows]
+
+
+def page_content(rows: List, limit: Optional[int]) -> Any:
+    """The legacy list (``limit`` None) or a keyset page, as JSON-ready data."""
+    if limit is None:
+        return rows_to_dicts(rows)
+    page = pagination.keyset_page(rows, limit)
+    return {"items": rows_to_dicts(page["items"]), "next_cursor": page["next_cursor"]}
+
+
+def list_response(db: Session, stmt, model, schema: Type[BaseModel], limit: Optional[int], cursor: Optional[str]) -> ORJSONResponse:
+    """Fast path of the list endpoints: a list, or a page when ``limit``/``cursor`` is given."""
+    if limit is not None or cursor is not None:
+        stmt, limit = pagination.keyset_stmt(stmt, model, limit, cursor)
+    return ORJSONResponse(page_content(db.execute(row_stmt(stmt, model, schema)).all(), limit))
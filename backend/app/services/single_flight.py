@@ -0,0 +1,81 @@
+"""Single-flight: concurrent identical reads share one computation.
+
+Several devices opening the dashboard at once, or a frontend firing the same
+request twice on remount, would each run the full query set. ``SingleFlight.do``
+keys a computation on (user_id, data version, endpoint, params): the first caller
+computes, callers arriving with the same key while it runs wait for it and get its
+result, or its exception. Once it finishes the key is released, so nothing is
+kept: the response cache stores results, this only merges concurrent work.
+
+The user id is part of the key, so a computation is never shared between users.
+So is the user's version from ``response_cache``: a request arriving after a write
+committed does not join a computation that started before it.
+
+Results are handed to several requests at once and must not be mutated, nor hold
+session-bound objects: return plain data or response schemas.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from .cache import response_cache
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT", "1").lower() in ("1", "true", "yes")
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class SingleFlight:
+    def __init__(self, version: Callable[[int], Hashable] = response_cache.version):
+        self._version = version
+        self._lock = threading.Lock()
+        self._flights: Dict[Tuple, Future] = {}
+        # computations run and callers that waited for one instead
+        self.computed = 0
+        self.shared = 0
+
+    def do(self, user_id: int, endpoint: str, params: Tuple[Hashable, ...], compute: Callable[[], Any]) -> Any:
+        # the DB_ASYNC routers run this on the event loop thread (run_sync), where
+        # waiting would block the computation being waited for: compute instead
+        if not SINGLE_FLIGHT_ENABLED or _in_event_loop():
+            return compute()
+        key = (user_id, self._version(user_id), endpoint, params)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+                self.computed += 1
+            else:
+                self.shared += 1
+        if not leader:
+            return flight.result()
+
+        try:
+            result = compute()
+        except BaseException as exc:
+            self._land(key)
+            flight.set_exception(exc)
+            raise
+        self._land(key)
+        flight.set_result(result)
+        return result
+
+    def _land(self, key: Tuple) -> None:
+        with self._lock:
+            del self._flights[key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+
+flights = SingleFlight()
@@ -0,0 +1,139 @@
+"""Synthetic data for performance testing: many users, years of history.
+
+Rows are generated deterministically from a seed and written with Core
+``insert()`` executemany batches, never per-row ORM adds. Parent rows whose ids
+are needed (exercises, templates, sessions) come back from one
+``INSERT ... RETURNING`` per batch (``db.insert_returning_ids``). Daily rollups
+and exercise bests are then rebuilt in one pass each. The caller commits.
+"""
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Sequence
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..db import insert_returning_ids
+from . import rollups, workout_analytics
+from .exercises import normalize_name
+
+# rows per executemany
+BATCH_SIZE = 10000
+
+MEAL_TYPES = ("breakfast", "lunch", "dinner", "snack", "snack", "snack")
+# name, target sets, target reps, starting weight
+TEMPLATES = {
+    "プッシュ day": [("ベンチプレス", 4, "6-8", 60.0), ("ショルダープレス", 3, "8-10", 35.0), ("ディップス", 3, "8-12", 0.0)],
+    "プル day": [("デッドリフト", 3, "4-6", 100.0), ("ラットプルダウン", 3, "8-12", 50.0), ("シーテッドロー", 3, "8-12", 45.0)],
+    "レッグ day": [("スクワット", 4, "5-8", 80.0), ("レッグプレス", 3, "10-12", 140.0), ("ルーマニアンデッドリフト", 3, "8-10", 70.0)],
+}
+
+
+@dataclass
+class SyntheticConfig:
+    users: int = 1
+    years: float = 1.0
+    meals_per_day: int = 3
+    sessions_per_week: int = 3
+    seed: int = 0
+    # last day of history
+    end: date = field(default_factory=date.today)
+
+    @property
+    def days(self) -> int:
+        return max(int(self.years * 365), 1)
+
+
+def _chunks(rows: Sequence[dict]) -> Iterator[Sequence[dict]]:
+    for i in range(0, len(rows), BATCH_SIZE):
+        yield rows[i:i + BATCH_SIZE]
+
+
+def _insert(db: Session, model, rows: Sequence[dict]) -> None:
+    for chunk in _chunks(rows):
+        db.execute(insert(model), chunk)
+
+
+def _insert_returning_ids(db: Session, model, rows: Sequence[dict]) -> List[int]:
+    ids: List[int] = []
+    for chunk in _chunks(rows):
+        ids += insert_returning_ids(db, model, chunk)
+    return ids
+
+
+def _user_rows(db: Session, rng: random.Random, user_id: int, config: SyntheticConfig) -> Dict[str, int]:
+    start = config.end - timedelta(days=config.days - 1)
+    counts = dict.fromkeys(("body_logs", "meal_logs", "sessions", "sets"), 0)
+
+    _insert(db, models.Profile, [{
+        "user_id": user_id, "sex": rng.choice(("male", "female")), "age": rng.randint(20, 60),
+        "height_cm": round(rng.gauss(168, 8), 1), "activity_level": rng.choice((1.2, 1.375, 1.55, 1.725)),
+        "current_bodyfat_pct": round(rng.uniform(12, 30), 1), "goal_weight_kg": round(rng.uniform(55, 80), 1),
+        "goal_rate_kg_per_week": rng.choice((-0.5, -0.25, 0.0, 0.25)),
+    }])
+
+    # body logs: a random walk with ~15% of days skipped; meals every day
+    weight, bodyfat = rng.uniform(55, 95), rng.uniform(12, 30)
+    body, meals = [], []
+    for i in range(config.days):
+        d = start + timedelta(days=i)
+        weight += rng.gauss(-0.01, 0.25)
+        bodyfat += rng.gauss(-0.005, 0.1)
+        if rng.random() < 0.85:
+            body.append({"user_id": user_id, "date": d, "weight_kg": round(weight, 1), "bodyfat_pct": round(bodyfat, 1), "sleep_hours": round(rng.uniform(5, 8.5), 1)})
+        for m in range(config.meals_per_day):
+            meals.append({
+                "user_id": user_id, "date": d, "meal_type": MEAL_TYPES[m % len(MEAL_TYPES)],
+                "calories_kcal": rng.randint(150, 900), "protein_g": round(rng.uniform(5, 50), 1),
+                "fat_g": round(rng.uniform(3, 35), 1), "carbs_g": round(rng.uniform(10, 120), 1),
+            })
+    _insert(db, models.BodyLog, body)
+    _insert(db, models.MealLog, meals)
+    counts["body_logs"], counts["meal_logs"] = len(body), len(meals)
+
+    names = [name for items in TEMPLATES.values() for name, *_ in items]
+    exercise_ids = dict(zip(names, _insert_returning_ids(db, models.Exercise, [{"user_id": user_id, "name": n} for n in names])))
+    _insert(db, models.ExerciseAlias, [{"user_id": user_id, "exercise_id": i, "alias": n, "normalized": normalize_name(n)} for n, i in exercise_ids.items()])
+
+    template_ids = _insert_returning_ids(db, models.WorkoutTemplate, [{"user_id": user_id, "name": n} for n in TEMPLATES])
+    _insert(db, models.WorkoutTemplateItem, [
+        {"template_id": tid, "exercise_name": n, "exercise_id": exercise_ids[n], "target_sets": sets, "target_reps": reps, "target_weight_kg": w, "order_index": k}
+        for tid, items in zip(template_ids, TEMPLATES.values()) for k, (n, sets, reps, w) in enumerate(items)
+    ])
+
+    # sessions on random weekdays, cycling through the templates with slowly rising weights
+    sessions, plans = [], []
+    for week in range(0, config.days, 7):
+        for day in sorted(rng.sample(range(7), min(config.sessions_per_week, 7))):
+            if week + day >= config.days:
+                continue
+            n = len(sessions)
+            sessions.append({"user_id": user_id, "date": start + timedelta(days=week + day), "template_id": template_ids[n % len(template_ids)]})
+            plans.append((list(TEMPLATES.values())[n % len(TEMPLATES)], 1 + n * 0.002))
+    session_ids = _insert_returning_ids(db, models.WorkoutSession, sessions)
+    sets = [
+        {"session_id": sid, "exercise_name": name, "exercise_id": exercise_ids[name], "set_no": s, "reps": rng.randint(4, 12),
+         "weight_kg": round(w * progress * rng.uniform(0.9, 1.05) / 2.5) * 2.5 if w else None, "rir": rng.randint(0, 3)}
+        for sid, (items, progress) in zip(session_ids, plans) for name, target_sets, _, w in items for s in range(1, target_sets + 1)
+    ]
+    _insert(db, models.WorkoutSet, sets)
+    counts["sessions"], counts["sets"] = len(sessions), len(sets)
+    return counts
+
+
+def generate(db: Session, config: SyntheticConfig) -> Dict[str, int]:
+    """Add ``config.users`` users with ``config.years`` of history each. Returns row counts."""
+    rng = random.Random(config.seed)
+    first_id = (db.scalar(select(func.max(models.User.id))) or 0) + 1
+    user_ids = list(range(first_id, first_id + config.users))
+    _insert(db, models.User, [{"id": u, "email": f"user{u}@example.com"} for u in user_ids])
+
+    counts = {"users": len(user_ids)}
+    for user_id in user_ids:
+        for k, v in _user_rows(db, rng, user_id, config).items():
+            counts[k] = counts.get(k, 0) + v
+    counts["daily_rollups"] = sum(rollups.rebuild_rollups(db, u) for u in user_ids)
+    counts["exercise_bests"] = sum(workout_analytics.rebuild_bests(db, u) for u in user_ids)
+    return counts
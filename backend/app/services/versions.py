@@ -0,0 +1,114 @@
+"""Per-user change versions behind GET /sync.
+
+Write handlers claim the user's next version with ``next_version`` (one upsert on
+sync_versions) and stamp it on the body/meal logs and workout sessions they insert
+or update; deletes leave a tombstone carrying it. The upsert holds the write lock
+until commit, so versions are claimed in commit order: a client that has seen
+version N gets every later change by asking for ``since=N``.
+
+Workout sets have no version of their own: a change to them stamps their session.
+
+Every other write (profile, templates, the exercise catalog) and the scripts that
+rewrite data outside the API claim a version too, without stamping any row. The
+counter is persisted, so it identifies the state of the user's data for every
+worker process: it is what the ETags are made of (``services/etag.py``).
+"""
+from collections import defaultdict
+from typing import Iterable
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+from ..db import dialect_insert
+from .serialization import row_stmt, rows_to_dicts, schema_columns
+
+# the GET /sync keys are their table names
+VERSIONED = (models.BodyLog, models.MealLog, models.WorkoutSession)
+
+
+def next_version(db: Session, user_id: int) -> int:
+    stmt = dialect_insert(db, models.SyncVersion).values(user_id=user_id, version=1)
+    stmt = stmt.on_conflict_do_update(index_elements=["user_id"], set_={"version": models.SyncVersion.version + 1})
+    return db.execute(stmt.returning(models.SyncVersion.version)).scalar_one()
+
+
+def current_version(db: Session, user_id: int) -> int:
+    """The user's latest claimed version (0 before the first write): one primary key lookup."""
+    return db.scalar(select(models.SyncVersion.version).where(models.SyncVersion.user_id == user_id)) or 0
+
+
+def touch_users(db: Session, user_ids: Iterable[int]) -> None:
+    """Claim a new version for each of ``user_ids`` whose data changed outside a write handler."""
+    for user_id in sorted(set(user_ids)):
+        next_version(db, user_id)
+
+
+def record_deletes(db: Session, user_id: int, model, ids: Iterable[int]) -> None:
+    """Tombstones for the deleted ``model`` rows ``ids``; the caller deletes them and commits."""
+    ids = list(ids)
+    if ids:
+        version = next_version(db, user_id)
+        db.execute(insert(models.SyncTombstone), [
+            {"user_id": user_id, "entity": model.__tablename__, "row_id": row_id, "version": version} for row_id in ids
+        ])
+
+
+def touch(db: Session, user_id: int, model, *where) -> None:
+    """Stamp a new version on the user's ``model`` rows matching ``where``."""
+    db.execute(update(model).where(model.user_id == user_id, *where).values(version=next_version(db, user_id)))
+
+
+def _since(stmt, model, user_id: int, since: int):
+    stmt = stmt.where(model.user_id == user_id)
+    return stmt.where(model.version > since) if since else stmt
+
+
+def _rows(db: Session, model, schema, user_id: int, since: int) -> list:
+    stmt = _since(select(model), model, user_id, since).order_by(model.id)
+    return rows_to_dicts(db.execute(row_stmt(stmt, model, schema)))
+
+
+def _sessions(db: Session, user_id: int, since: int) -> list:
+    s, w = models.WorkoutSession, models.WorkoutSet
+    fields = [getattr(s, name) for name in schemas.WorkoutSessionSync.model_fields if name != "sets"]
+    sessions = rows_to_dicts(db.execute(_since(select(*fields), s, user_id, since).order_by(s.id)))
+    # the sets of all those sessions in one query, joined on the same filter
+    sets_stmt = select(*schema_columns(w, schemas.WorkoutSetResponse)).join(s, s.id == w.session_id)
+    sets = defaultdict(list)
+    for r in db.execute(_since(sets_stmt, s, user_id, since).order_by(w.id)):
+        sets[r.session_id].append(r._asdict())
+    for sess in sessions:
+        sess["sets"] = sets[sess["id"]]
+    return sessions
+
+
+def changes(db: Session, user_id: int, since: int) -> dict:
+    """Rows written after version ``since`` and the ids deleted after it, as JSON-ready data.
+
+    ``since=0`` returns every row and no deletions. Reads are not one snapshot, so
+    the version is read first: a row committed meanwhile may come back again on
+    the next sync, but is never skipped. Clients apply the rows, then the deletions.
+    """
+    version = current_version(db, user_id)
+    result = {
+        "version": version,
+        "body_logs": _rows(db, models.BodyLog, schemas.BodyLogSync, user_id, since),
+        "meal_logs": _rows(db, models.MealLog, schemas.MealLogSync, user_id, since),
+        "workout_sessions": _sessions(db, user_id, since),
+    }
+
+    names = [model.__tablename__ for model in VERSIONED]
+    deleted = {name: {} for name in names}
+    if since:
+        t = models.SyncTombstone
+        tombstones = db.execute(
+            select(t.entity, t.row_id, t.version).where(t.user_id == user_id, t.version > since).order_by(t.version, t.id)
+        )
+        current = {name: {r["id"]: r["version"] for r in result[name]} for name in names}
+        for entity, row_id, deleted_at in tombstones:
+            # SQLite may hand a deleted row's id to a later insert; the newer row wins
+            if current[entity].get(row_id, -1) < deleted_at:
+                deleted[entity][row_id] = None
+    result["deleted"] = {name: list(ids) for name, ids in deleted.items()}
+    return result
@@ -0,0 +1,166 @@
+"""Workout analytics: personal records and weekly per-exercise progression.
+
+Exercises are identified by exercises.id (spelling variants share one id), so every
+per-exercise query is an integer index seek. exercise_bests holds one row per
+(user, exercise) with the records over all of the user's sets. Session writes
+refresh the rows of the exercises they touched (like rollups.refresh_days for
+days), so the records endpoint reads that table and never the sets. Weekly
+progression is aggregated in SQL per (exercise, date) over the requested range
+only, then folded into Monday-based weeks.
+
+Only sets with a weight and at least one rep count toward tonnage and records.
+"""
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import and_, case, delete, func, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..db import dialect_insert
+
+FORMULAS = ("epley", "brzycki")
+
+_s, _w = models.WorkoutSession, models.WorkoutSet
+# SQL twins of calculations.epley_1rm / brzycki_1rm
+EPLEY_1RM = case((_w.reps == 1, _w.weight_kg), else_=_w.weight_kg * (1 + _w.reps / 30.0))
+BRZYCKI_1RM = case((_w.reps == 1, _w.weight_kg), (_w.reps < 37, _w.weight_kg * 36.0 / (37 - _w.reps)), else_=None)
+SET_VOLUME = _w.weight_kg * _w.reps
+COUNTED = and_(_w.weight_kg.isnot(None), _w.reps >= 1)
+
+BEST_COLUMNS = (
+    "max_weight_kg", "best_e1rm_epley_kg", "best_e1rm_brzycki_kg", "best_set_volume_kg",
+    "best_set_id", "best_set_date", "best_set_weight_kg", "best_set_reps",
+    "total_sets", "total_tonnage_kg", "last_date",
+)
+
+
+def e1rm_expr(formula: str):
+    return BRZYCKI_1RM if formula == "brzycki" else EPLEY_1RM
+
+
+def _filtered(stmt, user_id: Optional[int], exercise_ids: Optional[set]):
+    stmt = stmt.join(_s, _w.session_id == _s.id).where(COUNTED, _w.exercise_id.isnot(None))
+    if user_id is not None:
+        stmt = stmt.where(_s.user_id == user_id)
+    if exercise_ids is not None:
+        stmt = stmt.where(_w.exercise_id.in_(exercise_ids))
+    return stmt
+
+
+def _compute_bests(db: Session, user_id: Optional[int], exercise_ids: Optional[set]) -> List[dict]:
+    totals = db.execute(_filtered(
+        select(
+            _s.user_id,
+            _w.exercise_id,
+            func.max(_w.weight_kg).label("max_weight_kg"),
+            func.max(EPLEY_1RM).label("best_e1rm_epley_kg"),
+            func.max(BRZYCKI_1RM).label("best_e1rm_brzycki_kg"),
+            func.max(SET_VOLUME).label("best_set_volume_kg"),
+            func.count(_w.id).label("total_sets"),
+            func.sum(SET_VOLUME).label("total_tonnage_kg"),
+            func.max(_s.date).label("last_date"),
+        ),
+        user_id, exercise_ids,
+    ).group_by(_s.user_id, _w.exercise_id))
+    rows = {(r.user_id, r.exercise_id): dict(r._mapping) for r in totals}
+
+    # the set behind the best Epley estimate (earliest one on ties)
+    ranked = _filtered(
+        select(
+            _s.user_id,
+            _w.exercise_id,
+            _w.id.label("best_set_id"),
+            _s.date.label("best_set_date"),
+            _w.weight_kg.label("best_set_weight_kg"),
+            _w.reps.label("best_set_reps"),
+            func.row_number().over(partition_by=(_s.user_id, _w.exercise_id), order_by=(EPLEY_1RM.desc(), _s.date, _w.id)).label("rank"),
+        ),
+        user_id, exercise_ids,
+    ).subquery()
+    for r in db.execute(select(ranked).where(ranked.c.rank == 1)):
+        best = dict(r._mapping)
+        del best["rank"]
+        rows[(r.user_id, r.exercise_id)].update(best)
+    return list(rows.values())
+
+
+def refresh_exercises(db: Session, user_id: int, exercise_ids: Iterable[int]) -> None:
+    """Recompute the exercise_bests rows of ``exercise_ids`` from the user's sets.
+
+    Session write handlers call this (with the exercises of the sets they added or
+    removed) inside their own transaction.
+    """
+    exercise_ids = {i for i in exercise_ids if i is not None}
+    if not exercise_ids:
+        return
+    db.flush()
+    rows = _compute_bests(db, user_id, exercise_ids)
+    if rows:
+        stmt = dialect_insert(db, models.ExerciseBest)
+        db.execute(stmt.on_conflict_do_update(index_elements=["user_id", "exercise_id"], set_={c: stmt.excluded[c] for c in BEST_COLUMNS}), rows)
+    gone = exercise_ids - {r["exercise_id"] for r in rows}
+    if gone:
+        db.execute(delete(models.ExerciseBest).where(models.ExerciseBest.user_id == user_id, models.ExerciseBest.exercise_id.in_(gone)))
+
+
+def rebuild_bests(db: Session, user_id: Optional[int] = None) -> int:
+    """Recompute exercise_bests from all sets (all users, or one). The caller commits."""
+    db.flush()
+    stmt = delete(models.ExerciseBest)
+    if user_id is not None:
+        stmt = stmt.where(models.ExerciseBest.user_id == user_id)
+    db.execute(stmt)
+    rows = _compute_bests(db, user_id, None)
+    if rows:
+        db.execute(models.ExerciseBest.__table__.insert(), rows)
+    return len(rows)
+
+
+def ensure_backfilled(db: Session) -> None:
+    """Populate exercise_bests once for databases that predate the table."""
+    if db.query(models.ExerciseBest.user_id).first() is not None or db.query(models.WorkoutSet.id).first() is None:
+        return
+    rebuild_bests(db)
+    db.commit()
+
+
+def week_start(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+
+def weekly_progression(
+    db: Session,
+    user_id: int,
+    from_d: date,
+    to_d: date,
+    exercise_id: Optional[int] = None,
+    formula: str = "epley",
+) -> List[dict]:
+    """Per exercise: tonnage, set count and best estimated 1RM of each week in [from_d, to_d]."""
+    e1rm = e1rm_expr(formula)
+    ex = models.Exercise
+    stmt = (
+        select(_w.exercise_id, ex.name, _s.date, func.sum(SET_VOLUME).label("tonnage_kg"), func.count(_w.id).label("sets"), func.max(e1rm).label("best_e1rm_kg"))
+        .join(_s, _w.session_id == _s.id)
+        .join(ex, ex.id == _w.exercise_id)
+        .where(_s.user_id == user_id, _s.date >= from_d, _s.date <= to_d, COUNTED)
+        .group_by(_w.exercise_id, ex.name, _s.date)
+        .order_by(ex.name, _w.exercise_id, _s.date)
+    )
+    if exercise_id is not None:
+        stmt = stmt.where(_w.exercise_id == exercise_id)
+
+    exercises: "OrderedDict[tuple, OrderedDict[date, dict]]" = OrderedDict()
+    for r in db.execute(stmt):
+        weeks = exercises.setdefault((r.exercise_id, r.name), OrderedDict())
+        ws = week_start(r.date)
+        week = weeks.get(ws)
+        if week is None:
+            week = weeks[ws] = {"week_start": ws, "tonnage_kg": 0.0, "sets": 0, "best_e1rm_kg": None}
+        week["tonnage_kg"] += r.tonnage_kg
+        week["sets"] += r.sets
+        if r.best_e1rm_kg is not None and (week["best_e1rm_kg"] is None or r.best_e1rm_kg > week["best_e1rm_kg"]):
+            week["best_e1rm_kg"] = r.best_e1rm_kg
+    return [{"exercise_id": ex_id, "exercise_name": name, "weeks": list(weeks.values())} for (ex_id, name), weeks in exercises.items()]
@@ -0,0 +1,153 @@
+"""Group commit: optional single-writer pipeline for the mutating handlers.
+
+SQLite has one writer at a time, so concurrent requests that each open a
+transaction and commit queue up on the database lock, paying a commit (and with
+synchronous=FULL an fsync) apiece. With WRITE_QUEUE=1, handlers pass their write
+as a function of a Session to ``run``. One background thread per engine collects
+the writes waiting at that moment (at most WRITE_QUEUE_MAX_BATCH, optionally
+waiting WRITE_QUEUE_MAX_DELAY_MS for more), runs them in order in one transaction
+and commits once. Each request is answered after that commit.
+
+A write that raises (a 404, a constraint error) is taken out of its batch: the
+batch is rolled back and the other writes are run again without it. Write
+functions must therefore only touch the session, and return data that needs
+no session afterwards: response schemas or plain values, built after a flush.
+
+Without WRITE_QUEUE the same functions run on the request's session and commit
+on their own, as before.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from .cache import response_cache
+
+WRITE_QUEUE_ENABLED = os.getenv("WRITE_QUEUE", "0").lower() in ("1", "true", "yes")
+MAX_BATCH = int(os.getenv("WRITE_QUEUE_MAX_BATCH", "64"))
+MAX_DELAY = float(os.getenv("WRITE_QUEUE_MAX_DELAY_MS", "0")) / 1000
+
+Write = Callable[[Session], Any]
+
+
+@dataclass
+class _Intent:
+    fn: Write
+    user_id: int
+    future: Future = field(default_factory=Future)
+
+
+class WriteQueue:
+    def __init__(self, engine: Engine, max_batch: int = MAX_BATCH, max_delay: float = MAX_DELAY):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+        self._queue: "queue.Queue[Optional[_Intent]]" = queue.Queue()
+        # committed batches and writes, for tests and benchmarks
+        self.batches = 0
+        self.writes = 0
+        self._thread = threading.Thread(target=self._loop, name="write-queue", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Write, user_id: int) -> Future:
+        intent = _Intent(fn, user_id)
+        self._queue.put(intent)
+        return intent.future
+
+    def run(self, fn: Write, user_id: int) -> Any:
+        """Submit ``fn`` and wait until its batch has committed; returns its result or raises its error."""
+        return self.submit(fn, user_id).result()
+
+    def close(self) -> None:
+        """Finish the queued writes and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first: _Intent) -> List[Optional[_Intent]]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                timeout = deadline - time.monotonic()
+                batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if batch[-1] is None:
+                break
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            stop = batch[-1] is None
+            self._commit([i for i in batch if i is not None])
+            if stop:
+                return
+
+    def _commit(self, batch: List[_Intent]) -> None:
+        while batch:
+            results, failed = [], None
+            with self._session() as db:
+                try:
+                    for intent in batch:
+                        failed = intent
+                        results.append(intent.fn(db))
+                        # later writes see this one, and its flush errors are its own
+                        db.flush()
+                    failed = None
+                    db.commit()
+                except Exception as exc:
+                    db.rollback()
+                    if failed is None:
+                        # the commit itself failed: every write in the batch shares the error
+                        for intent in batch:
+                            intent.future.set_exception(exc)
+                        return
+                    failed.future.set_exception(exc)
+                    batch = [i for i in batch if i is not failed]
+                    continue
+            self.batches += 1
+            self.writes += len(batch)
+            for user_id in {i.user_id for i in batch}:
+                response_cache.bump(user_id)
+            for intent, result in zip(batch, results):
+                intent.future.set_result(result)
+            return
+
+
+_queues: Dict[Engine, WriteQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def queue_for(engine: Engine) -> WriteQueue:
+    with _queues_lock:
+        if engine not in _queues:
+            _queues[engine] = WriteQueue(engine)
+        return _queues[engine]
+
+
+def close_all() -> None:
+    with _queues_lock:
+        queues = list(_queues.values())
+        _queues.clear()
+    for q in queues:
+        q.close()
+
+
+def run(db: Session, user_id: int, fn: Write) -> Any:
+    """Run the write ``fn`` and commit it: batched by the writer thread with WRITE_QUEUE=1, else on ``db``."""
+    if WRITE_QUEUE_ENABLED:
+        return queue_for(db.get_bind()).run(fn, user_id)
+    result = fn(db)
+    db.commit()
+    response_cache.bump(user_id)
+    return result
@@ -0,0 +1,143 @@
+"""Latency of every API route at the 1x / 10x / 100x data sizes of conftest.SCALES.
+
+    cd backend
+    pytest benchmarks                                   # saved under .benchmarks/
+    pytest benchmarks --benchmark-json=results.json     # also to a file of your choice
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:20%
+
+Reads run against a 30-day window ending at conftest.END, like the dashboard.
+Writes add rows on every round, so the data grows a little during a run.
+Deletes and merges get a fresh target from an untimed setup step.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import count
+from typing import Any, Callable, Optional
+
+import pytest
+
+from app.main import app
+
+# routes that never touch the database
+NO_DB_ROUTES = {("GET", "/"), ("GET", "/cache/stats"), ("GET", "/metrics")}
+
+_unique = count(1)
+
+
+@dataclass
+class Call:
+    name: str
+    method: str
+    route: str
+    # url for a dataset
+    url: Callable[[Any], str]
+    # JSON body, or a function returning a fresh one per request
+    body: Any = None
+    # untimed: creates what the call consumes and returns its url
+    setup: Optional[Callable[[Any, Any], str]] = None
+
+
+def _day(d, offset: int = 0) -> str:
+    return (d.end - timedelta(days=offset)).isoformat()
+
+
+def _new_body_log(d, client) -> str:
+    day = _day(d, 2000 + next(_unique))
+    body_id = client.post("/body-logs/", json={"date": day, "weight_kg": 70.0}).json()["id"]
+    return f"/body-logs/{body_id}"
+
+
+def _new_meal_log(d, client) -> str:
+    meal_id = client.post("/meal-logs/", json={"date": _day(d), "meal_type": "snack", "calories_kcal": 100}).json()["id"]
+    return f"/meal-logs/{meal_id}"
+
+
+def _new_session(d, client) -> str:
+    sess = client.post("/workouts/sessions", json={"date": _day(d), "sets": [{"exercise_name": "ベンチプレス", "set_no": 1, "reps": 5, "weight_kg": 60}]}).json()
+    return f"/workouts/sessions/{sess['id']}"
+
+
+def _new_template(d, client) -> str:
+    tpl = client.post("/workouts/templates", json={"name": "tmp", "items": [{"exercise_name": "スクワット", "order_index": 0}]}).json()
+    return f"/workouts/templates/{tpl['id']}"
+
+
+def _new_variant(d, client) -> str:
+    ex = client.post("/workouts/exercises", json={"name": f"bench variant {next(_unique)}"}).json()
+    client.post("/workouts/sessions", json={"date": _day(d), "sets": [{"exercise_name": ex["name"], "set_no": 1, "reps": 5, "weight_kg": 60}]})
+    return f"/workouts/exercises/{d.exercise_id}/merge/{ex['id']}"
+
+
+CALLS = [
+    Call("profile", "GET", "/profile/", lambda d: "/profile/"),
+    Call("profile put", "PUT", "/profile/", lambda d: "/profile/", {"age": 31}),
+    Call("profile compute", "GET", "/profile/compute", lambda d: "/profile/compute"),
+    Call("body-logs 30d", "GET", "/body-logs/", lambda d: f"/body-logs/?from={_day(d, 29)}&to={_day(d)}"),
+    Call("body-logs all", "GET", "/body-logs/", lambda d: "/body-logs/"),
+    Call("body-logs page", "GET", "/body-logs/", lambda d: "/body-logs/?limit=100"),
+    Call("body-logs post", "POST", "/body-logs/", lambda d: "/body-logs/", {"date": "2025-12-31", "weight_kg": 70.0}),
+    Call("body-logs bulk", "POST", "/body-logs/bulk", lambda d: "/body-logs/bulk", [{"date": f"2025-12-{i:02d}", "weight_kg": 70.0} for i in range(1, 31)]),
+    Call("body-logs delete", "DELETE", "/body-logs/{item_id}", None, setup=_new_body_log),
+    Call("meal-logs day", "GET", "/meal-logs/", lambda d: f"/meal-logs/?date={_day(d)}"),
+    Call("meal-logs range 30d", "GET", "/meal-logs/range", lambda d: f"/meal-logs/range?from={_day(d, 29)}&to={_day(d)}"),
+    Call("meal-logs page", "GET", "/meal-logs/range", lambda d: f"/meal-logs/range?from={_day(d, 364)}&to={_day(d)}&limit=100"),
+    Call("meal-logs post", "POST", "/meal-logs/", lambda d: "/meal-logs/", {"date": "2025-12-31", "meal_type": "snack", "calories_kcal": 200}),
+    Call("meal-logs bulk", "POST", "/meal-logs/bulk", lambda d: "/meal-logs/bulk", [{"date": "2025-12-30", "meal_type": "snack", "calories_kcal": 100}] * 30),
+    Call("meal-logs put", "PUT", "/meal-logs/{item_id}", None, {"date": "2025-12-29", "meal_type": "snack", "calories_kcal": 250}, setup=_new_meal_log),
+    Call("meal-logs delete", "DELETE", "/meal-logs/{item_id}", None, setup=_new_meal_log),
+    Call("dashboard 30d", "GET", "/dashboard/summary", lambda d: f"/dashboard/summary?from={_day(d, 29)}&to={_day(d)}"),
+    Call("dashboard 365d", "GET", "/dashboard/summary", lambda d: f"/dashboard/summary?from={_day(d, 364)}&to={_day(d)}"),
+    Call("templates", "GET", "/workouts/templates", lambda d: "/workouts/templates"),
+    Call("templates post", "POST", "/workouts/templates", lambda d: "/workouts/templates", {"name": "legs", "items": [{"exercise_name": "スクワット", "order_index": 0}]}),
+    Call("template put", "PUT", "/workouts/templates/{tpl_id}", lambda d: f"/workouts/templates/{d.template_id}", {"name": "プッシュ day"}),
+    Call("template items", "GET", "/workouts/templates/{tpl_id}/items", lambda d: f"/workouts/templates/{d.template_id}/items"),
+    Call("template items put", "PUT", "/workouts/templates/{tpl_id}/items", lambda d: f"/workouts/templates/{d.template_id}/items",
+         [{"exercise_name": "ベンチプレス", "target_sets": 4, "order_index": 0}, {"exercise_name": "ディップス", "target_sets": 3, "order_index": 1}]),
+    Call("template delete", "DELETE", "/workouts/templates/{tpl_id}", None, setup=_new_template),
+    Call("bootstrap", "GET", "/workouts/bootstrap", lambda d: "/workouts/bootstrap"),
+    Call("sessions 30d", "GET", "/workouts/sessions", lambda d: f"/workouts/sessions?from={_day(d, 29)}&to={_day(d)}"),
+    Call("sessions page", "GET", "/workouts/sessions", lambda d: "/workouts/sessions?limit=50"),
+    Call("sessions post", "POST", "/workouts/sessions", lambda d: "/workouts/sessions",
+         {"date": "2025-12-31", "sets": [{"exercise_name": "スクワット", "set_no": k, "reps": 5, "weight_kg": 100} for k in (1, 2, 3)]}),
+    Call("sessions bulk", "POST", "/workouts/sessions/bulk", lambda d: "/workouts/sessions/bulk",
+         [{"date": "2025-12-30", "sets": [{"exercise_name": "スクワット", "set_no": 1, "reps": 5, "weight_kg": 100}]}] * 10),
+    Call("session", "GET", "/workouts/sessions/{id}", lambda d: f"/workouts/sessions/{d.session_id}"),
+    Call("session delete", "DELETE", "/workouts/sessions/{id}", None, setup=_new_session),
+    Call("records", "GET", "/workouts/analytics/records", lambda d: "/workouts/analytics/records"),
+    Call("weekly 12w", "GET", "/workouts/analytics/weekly", lambda d: f"/workouts/analytics/weekly?from={_day(d, 83)}&to={_day(d)}"),
+    Call("weekly by name", "GET", "/workouts/analytics/weekly", lambda d: f"/workouts/analytics/weekly?from={_day(d, 364)}&to={_day(d)}&exercise=ﾍﾞﾝﾁﾌﾟﾚｽ"),
+    Call("exercises", "GET", "/workouts/exercises", lambda d: "/workouts/exercises"),
+    Call("exercises post", "POST", "/workouts/exercises", lambda d: "/workouts/exercises", lambda: {"name": f"ohp {next(_unique)}", "muscle_groups": ["shoulders"]}),
+    Call("exercise put", "PUT", "/workouts/exercises/{ex_id}", lambda d: f"/workouts/exercises/{d.exercise_id}", {"name": "ベンチプレス", "aliases": ["bench"]}),
+    Call("exercise merge", "POST", "/workouts/exercises/{ex_id}/merge/{source_id}", None, setup=_new_variant),
+    Call("export workouts", "GET", "/export/{dataset}.{fmt}", lambda d: "/export/workouts.ndjson"),
+    Call("sync full", "GET", "/sync", lambda d: "/sync"),
+    # generated rows are version 0: only what earlier benchmarks wrote
+    Call("sync delta", "GET", "/sync", lambda d: "/sync?since=1"),
+]
+
+
+def _api_routes():
+    # from the OpenAPI schema: app.routes nests included routers on newer FastAPI
+    return {(m.upper(), path) for path, ops in app.openapi()["paths"].items() for m in ops} - NO_DB_ROUTES
+
+
+def test_every_route_is_benchmarked():
+    assert _api_routes() - {(c.method, c.route) for c in CALLS} == set(), "add the new routes to CALLS"
+
+
+@pytest.mark.parametrize("call", CALLS, ids=lambda c: c.name)
+def test_route(benchmark, dataset, client, call):
+    # one table per call, its scales side by side
+    benchmark.group = call.name
+    benchmark.extra_info.update(scale=dataset.scale, method=call.method, route=call.route)
+
+    def request(url):
+        res = client.request(call.method, url, json=call.body() if callable(call.body) else call.body)
+        assert res.status_code < 400, (call.name, res.status_code, res.text)
+        return res
+
+    if call.setup is None:
+        benchmark(request, call.url(dataset))
+    else:
+        benchmark.pedantic(request, setup=lambda: ((call.setup(dataset, client),), {}), rounds=20)
@@ -0,0 +1,75 @@
+"""Write throughput under concurrency: per-request commits vs the group-commit queue.
+
+    cd backend
+    pytest benchmarks/bench_writes.py
+
+Each round is a burst of WRITERS threads creating meal logs through the handler's
+write function and ``write_queue.run``, like concurrent POST /meal-logs/ requests
+without the HTTP layer. "per-request" commits each write on its own session
+(the default); "group" sends them through the writer thread (WRITE_QUEUE=1).
+Runs against a file database with the app's pragmas, with synchronous=NORMAL
+(the default) and FULL (an fsync per commit). writes_per_sec is in extra_info.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from itertools import count
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app import schemas
+from app.db import SQLITE_PRAGMAS, Base, create_app_engine
+from app.routers.meal_logs import add_meal_log
+from app.services import write_queue
+
+WRITERS = 16
+WRITES_PER_WRITER = 25
+
+_meal = count()
+
+
+@pytest.fixture(params=["NORMAL", "FULL"])
+def synchronous(request):
+    return request.param
+
+
+@pytest.fixture
+def engine(synchronous, tmp_path):
+    eng = create_app_engine(f"sqlite:///{tmp_path / 'writes.db'}", {**SQLITE_PRAGMAS, "synchronous": synchronous})
+    Base.metadata.create_all(bind=eng)
+    yield eng
+    write_queue.close_all()
+    eng.dispose()
+
+
+def _write(session):
+    # what create_meal_log runs: insert, rollup refresh, response built after a flush.
+    # Four meals a day on the latest day, like daily logging.
+    d = date.fromordinal(date(2020, 1, 1).toordinal() + next(_meal) // 4)
+    obj = add_meal_log(session, schemas.MealLogCreate(date=d, meal_type="snack", calories_kcal=200))
+    session.flush()
+    return schemas.MealLogResponse.model_validate(obj)
+
+
+@pytest.mark.parametrize("mode", ["per-request", "group"])
+def test_write_throughput(benchmark, monkeypatch, synchronous, engine, mode):
+    monkeypatch.setattr(write_queue, "WRITE_QUEUE_ENABLED", mode == "group")
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def request():
+        with Session() as db:
+            return write_queue.run(db, 1, _write)
+
+    def burst():
+        with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+            futures = [pool.submit(request) for _ in range(WRITERS * WRITES_PER_WRITER)]
+            for f in futures:
+                f.result()
+
+    benchmark.group = f"writes synchronous={synchronous}"
+    benchmark.pedantic(burst, rounds=5, iterations=1, warmup_rounds=1)
+    writes = WRITERS * WRITES_PER_WRITER
+    benchmark.extra_info.update(mode=mode, writers=WRITERS, writes_per_round=writes)
+    # no stats under --benchmark-disable (smoke runs)
+    if benchmark.stats:
+        benchmark.extra_info["writes_per_sec"] = round(writes / benchmark.stats.stats.mean)
@@ -0,0 +1,86 @@
+import sys
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app import models  # noqa: E402
+from app.db import Base, create_app_engine  # noqa: E402
+from app.services.cache import response_cache  # noqa: E402
+from app.services.synthetic import SyntheticConfig, generate  # noqa: E402
+
+# a fixed last day, so runs on different days read the same rows
+END = date(2025, 12, 31)
+
+# user-years of history: 1, 10, 100 (the benchmarked user is user 1)
+SCALES = {
+    "1x": SyntheticConfig(users=1, years=1, meals_per_day=4, end=END),
+    "10x": SyntheticConfig(users=2, years=5, meals_per_day=4, end=END),
+    "100x": SyntheticConfig(users=10, years=10, meals_per_day=4, end=END),
+}
+
+
+@dataclass
+class Dataset:
+    scale: str
+    engine: object
+    end: date
+    template_id: int
+    session_id: int
+    exercise_id: int
+
+
+@pytest.fixture(scope="session", params=list(SCALES))
+def dataset(request, tmp_path_factory):
+    engine = create_app_engine(f"sqlite:///{tmp_path_factory.mktemp('bench') / (request.param + '.db')}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as db:
+        generate(db, SCALES[request.param])
+        db.commit()
+        first = lambda model, *where: db.scalar(select(model.id).where(model.user_id == 1, *where).order_by(model.id).limit(1))  # noqa: E731
+        data = Dataset(
+            scale=request.param,
+            engine=engine,
+            end=END,
+            template_id=first(models.WorkoutTemplate),
+            session_id=first(models.WorkoutSession),
+            exercise_id=first(models.Exercise, models.Exercise.name == "ベンチプレス"),
+        )
+    yield data
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def client(dataset):
+    from fastapi.testclient import TestClient
+
+    from app.db import get_db
+    from app.main import app
+
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=dataset.engine)
+
+    def override_get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    # not used as a context manager: startup hooks would touch the real database
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(autouse=True)
+def _no_response_cache(monkeypatch):
+    # measure the work behind each response, not cache hits
+    monkeypatch.setattr(response_cache, "maxsize", 0)
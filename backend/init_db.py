@@ -72,6 +72,9 @@ for i in range(6, -1, -1):
         )
         db.add(meal_log)
 
+from app.services.rollups import rebuild_rollups
+
+rebuild_rollups(db)
 db.commit()
 print("✅ Sample logs seeded")
 print("\n✅ Database initialization complete!")
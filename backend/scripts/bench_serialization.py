@@ -0,0 +1,126 @@
+"""Compare the CPU cost of serializing list responses through Pydantic and through the row fast path.
+
+Each mode turns the same query (1,000 meal logs by default) into JSON bytes the way
+a route does, and reports the CPU time per response:
+
+- ``validate+orjson``: ORM objects validated against the response_model, dumped
+  to Python data and rendered by orjson (what FastAPI does when an orjson
+  response class is the app default)
+- ``validate+dump_json``: ORM objects validated against the response_model
+  (from_attributes) and dumped by pydantic-core, FastAPI's default path
+- ``rows+orjson``: the schema's columns selected as plain rows and dumped by orjson
+  (app.services.serialization, used by the list endpoints)
+
+    python scripts/bench_serialization.py --rows 1000 --repeat 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import models, schemas  # noqa: E402
+from app.db import Base  # noqa: E402
+from app.routers.meal_logs import meal_logs_range_stmt  # noqa: E402
+from app.services import serialization  # noqa: E402
+
+ADAPTER = TypeAdapter(List[schemas.MealLogResponse])
+
+
+def seed(db, n: int) -> None:
+    start = date(2024, 1, 1)
+    db.execute(insert(models.MealLog), [
+        {"user_id": 1, "date": start + timedelta(days=i // 4), "meal_type": ("breakfast", "lunch", "dinner", "snack")[i % 4],
+         "calories_kcal": 400 + i % 300, "protein_g": 25.5, "fat_g": 12.0, "carbs_g": 60.0, "memo": "鶏むね肉とご飯" if i % 3 else None}
+        for i in range(n)
+    ])
+    db.commit()
+
+
+def stmt():
+    return meal_logs_range_stmt("2000-01-01", "2100-01-01")
+
+
+def validate_orjson_mode(db) -> bytes:
+    rows = db.scalars(stmt()).all()
+    return serialization.dumps(ADAPTER.dump_python(ADAPTER.validate_python(rows, from_attributes=True), mode="json"))
+
+
+def validate_dump_json_mode(db) -> bytes:
+    rows = db.scalars(stmt()).all()
+    return ADAPTER.dump_json(ADAPTER.validate_python(rows, from_attributes=True))
+
+
+def rows_orjson_mode(db) -> bytes:
+    rows = db.execute(serialization.row_stmt(stmt(), models.MealLog, schemas.MealLogResponse)).all()
+    return serialization.dumps(serialization.page_content(rows, None))
+
+
+MODES = {
+    "validate+orjson": validate_orjson_mode,
+    "validate+dump_json": validate_dump_json_mode,
+    "rows+orjson": rows_orjson_mode,
+}
+
+
+def run_mode(name: str, fn, Session, repeat: int) -> dict:
+    db = Session()
+    try:
+        fn(db)  # warm up statement caches
+        db.expunge_all()
+        started = time.process_time()
+        for _ in range(repeat):
+            fn(db)
+            # a request gets a fresh session, so no ORM identity map reuse
+            db.expunge_all()
+        cpu = time.process_time() - started
+    finally:
+        db.close()
+    return {"mode": name, "cpu_ms_per_response": round(cpu / repeat * 1000, 3)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as db:
+        seed(db, args.rows)
+        # every mode must produce the same document
+        outputs = {json.dumps(json.loads(fn(db)), sort_keys=True) for fn in MODES.values()}
+        assert len(outputs) == 1, "serialization modes disagree"
+
+    results = [run_mode(name, fn, Session, args.repeat) for name, fn in MODES.items()]
+    engine.dispose()
+
+    baseline = results[1]["cpu_ms_per_response"]
+    for r in results:
+        r["cpu_saved_ms_vs_default"] = round(baseline - r["cpu_ms_per_response"], 3)
+    if args.json:
+        print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+        return
+    print(f"{args.rows} rows per response")
+    print(f'{"mode":<20} {"cpu ms":>10} {"saved ms":>10}')
+    for r in results:
+        print(f'{r["mode"]:<20} {r["cpu_ms_per_response"]:>10} {r["cpu_saved_ms_vs_default"]:>10}')
+
+
+if __name__ == "__main__":
+    main()
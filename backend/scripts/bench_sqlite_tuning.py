@@ -0,0 +1,120 @@
+"""Compare read/write throughput of the default SQLite settings against the tuned pragmas.
+
+Writer threads insert meal logs one commit at a time (like POST /meal-logs/) while
+reader threads run the dashboard aggregation, against a fresh database file per mode.
+
+    python scripts/bench_sqlite_tuning.py --seconds 5 --writers 4 --readers 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import models  # noqa: E402
+from app.db import SQLITE_PRAGMAS, Base, create_app_engine  # noqa: E402
+from app.services import rollups  # noqa: E402
+from app.services.aggregates import compute_dashboard_aggregates  # noqa: E402
+
+MODES = {
+    # what app/db.py did before: rollback journal, synchronous=FULL, no busy timeout
+    'default': {},
+    'tuned': SQLITE_PRAGMAS,
+}
+
+
+def run_mode(name: str, pragmas: dict, seconds: float, writers: int, readers: int, workdir: Path) -> dict:
+    engine = create_app_engine(f'sqlite:///{workdir / (name + ".db")}', sqlite_pragmas=pragmas)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    today = date.today()
+    counts = {'writes': 0, 'reads': 0, 'locked_errors': 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def writer(worker: int) -> None:
+        i = 0
+        while not stop.is_set():
+            db = Session()
+            try:
+                d = today - timedelta(days=i % 365)
+                db.add(models.MealLog(user_id=1, date=d, meal_type='lunch', calories_kcal=500 + worker, protein_g=30))
+                rollups.refresh_days(db, 1, [d])
+                db.commit()
+                with lock:
+                    counts['writes'] += 1
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    counts['locked_errors'] += 1
+            finally:
+                db.close()
+            i += 1
+
+    def reader() -> None:
+        while not stop.is_set():
+            db = Session()
+            try:
+                compute_dashboard_aggregates(db, 1, today - timedelta(days=29), today)
+                with lock:
+                    counts['reads'] += 1
+            except OperationalError:
+                with lock:
+                    counts['locked_errors'] += 1
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    return {
+        'mode': name,
+        'writes_per_sec': round(counts['writes'] / elapsed, 1),
+        'reads_per_sec': round(counts['reads'] / elapsed, 1),
+        'locked_errors': counts['locked_errors'],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [run_mode(name, pragmas, args.seconds, args.writers, args.readers, Path(tmp)) for name, pragmas in MODES.items()]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f'{"mode":<8} {"writes/s":>10} {"reads/s":>10} {"locked":>8}')
+    for r in results:
+        print(f'{r["mode"]:<8} {r["writes_per_sec"]:>10} {r["reads_per_sec"]:>10} {r["locked_errors"]:>8}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Fill a database with synthetic users and years of history for performance testing.
+
+Writes to DATABASE_URL (like the app) unless --database-url is given. Users are
+added after the existing ones; pass --reset to start from empty tables.
+
+    python scripts/generate_data.py --users 10 --years 5 --meals-per-day 4 --sessions-per-week 4
+    python scripts/generate_data.py --database-url sqlite:///./perf.db --reset --users 100 --years 3
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1)
+    parser.add_argument('--years', type=float, default=1.0)
+    parser.add_argument('--meals-per-day', type=int, default=3)
+    parser.add_argument('--sessions-per-week', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--database-url', default=None, help='default: DATABASE_URL')
+    parser.add_argument('--reset', action='store_true', help='drop and recreate all tables first')
+    args = parser.parse_args()
+
+    from sqlalchemy.orm import sessionmaker
+
+    from app.db import Base, create_app_engine, engine as app_engine
+    from app.services.synthetic import SyntheticConfig, generate
+
+    engine = create_app_engine(args.database_url) if args.database_url else app_engine
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    config = SyntheticConfig(
+        users=args.users,
+        years=args.years,
+        meals_per_day=args.meals_per_day,
+        sessions_per_week=args.sessions_per_week,
+        seed=args.seed,
+    )
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    started = time.perf_counter()
+    try:
+        counts = generate(db, config)
+        db.commit()
+    finally:
+        db.close()
+    print(f'[OK] Generated in {time.perf_counter() - started:.1f}s')
+    for table, n in counts.items():
+        print(f'  {table:<15}: {n}')
+
+
+if __name__ == '__main__':
+    main()
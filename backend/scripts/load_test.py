@@ -0,0 +1,146 @@
+"""Load test the hot endpoints and compare the sync and async database modes.
+
+By default the script starts uvicorn twice on a throw-away database, once with
+DB_ASYNC=0 and once with DB_ASYNC=1, seeds it through the API and reports
+requests/sec and latency percentiles per mode. Pass --base-url to load an
+already running server instead.
+
+    python scripts/load_test.py --seconds 10 --concurrency 64
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# (method, path, json body) mix: mostly reads, like the frontend
+REQUEST_MIX = [
+    ('GET', '/dashboard/summary', None),
+    ('GET', '/dashboard/summary', None),
+    ('GET', '/body-logs/', None),
+    ('GET', '/meal-logs/', None),
+    ('POST', '/meal-logs/', {'date': date.today().isoformat(), 'meal_type': 'snack', 'calories_kcal': 150}),
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def seed(base_url: str, days: int) -> None:
+    today = date.today()
+    with httpx.Client(base_url=base_url) as client:
+        client.put('/profile/', json={'sex': 'male', 'age': 30, 'height_cm': 175, 'activity_level': 1.55, 'goal_rate_kg_per_week': -0.25})
+        for i in range(days):
+            d = (today - timedelta(days=i)).isoformat()
+            client.post('/body-logs/', json={'date': d, 'weight_kg': 75 - i * 0.03, 'bodyfat_pct': 20})
+            for meal_type, kcal in (('breakfast', 450), ('lunch', 700), ('dinner', 750)):
+                client.post('/meal-logs/', json={'date': d, 'meal_type': meal_type, 'calories_kcal': kcal, 'protein_g': 35})
+
+
+async def run_load(base_url: str, seconds: float, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker(offset: int) -> None:
+            nonlocal errors
+            i = offset
+            while time.perf_counter() < deadline:
+                method, path, body = REQUEST_MIX[i % len(REQUEST_MIX)]
+                i += 1
+                started = time.perf_counter()
+                try:
+                    res = await client.request(method, path, json=body)
+                    if res.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda v: round(v * 1000, 2) if v is not None else None  # noqa: E731
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': ms(percentile(latencies, 50)),
+        'p95_ms': ms(percentile(latencies, 95)),
+        'p99_ms': ms(percentile(latencies, 99)),
+    }
+
+
+def run_spawned(mode: str, port: int, args: argparse.Namespace, workdir: Path) -> dict:
+    env = dict(os.environ)
+    env['DATABASE_URL'] = f'sqlite:///{workdir / (mode + ".db")}'
+    env['DB_ASYNC'] = '1' if mode == 'async' else '0'
+    env['RESPONSE_CACHE_SIZE'] = '0' if args.no_cache else env.get('RESPONSE_CACHE_SIZE', '256')
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=ROOT_DIR,
+        env=env,
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(base_url + '/', timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        seed(base_url, args.days)
+        result = asyncio.run(run_load(base_url, args.seconds, args.concurrency))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return {'mode': mode, **result}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--days', type=int, default=90, help='days of history to seed per mode')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--no-cache', action='store_true', help='disable the response cache so every request hits the database')
+    parser.add_argument('--base-url', default=None, help='load an already running server instead of spawning both modes')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    if args.base_url:
+        results = [{'mode': args.base_url, **asyncio.run(run_load(args.base_url, args.seconds, args.concurrency))}]
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            results = [run_spawned(mode, args.port + n, args, Path(tmp)) for n, mode in enumerate(('sync', 'async'))]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f'{"mode":<8} {"req/s":>9} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"errors":>7}')
+    for r in results:
+        print(f'{r["mode"]:<8} {r["rps"]:>9} {r["p50_ms"]:>9} {r["p95_ms"]:>9} {r["p99_ms"]:>9} {r["errors"]:>7}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Rebuild daily_rollups from meal_logs and body_logs.')
+    parser.add_argument('--user-id', type=int, default=None, help='only rebuild this user (default: all users)')
+    args = parser.parse_args()
+
+    from sqlalchemy import select
+
+    from app import models
+    from app.db import Base, SessionLocal, engine
+    from app.services import versions
+    from app.services.rollups import rebuild_rollups
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        count = rebuild_rollups(db, args.user_id)
+        # a new data version per user: running servers see it on their next request,
+        # so the ETags they issued and the dashboards they cached before it are dropped
+        if args.user_id is not None:
+            user_ids = {args.user_id}
+        else:
+            user_ids = set(db.scalars(select(models.DailyRollup.user_id).distinct()))
+            user_ids |= set(db.scalars(select(models.SyncVersion.user_id)))
+        versions.touch_users(db, user_ids)
+        db.commit()
+        target = f'user {args.user_id}' if args.user_id is not None else 'all users'
+        print(f'[OK] Rebuilt {count} daily rollup rows for {target}')
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -24,6 +24,7 @@ def reset_db() -> None:
     else:
         print(f'[INFO] {DB_PATH} not found; creating new database')
 
+    from app import models  # noqa: F401  (register tables on Base.metadata)
     from app.db import Base, engine
 
     if not removed:
@@ -36,6 +37,8 @@ def reset_db() -> None:
 def seed_data() -> None:
     from app import models
     from app.db import SessionLocal
+    from app.services import exercises, versions, workout_analytics
+    from app.services.rollups import rebuild_rollups
 
     db = SessionLocal()
     try:
@@ -44,6 +47,9 @@ def seed_data() -> None:
         db.query(models.WorkoutSession).delete()
         db.query(models.WorkoutTemplateItem).delete()
         db.query(models.WorkoutTemplate).delete()
+        db.query(models.ExerciseBest).delete()
+        db.query(models.ExerciseAlias).delete()
+        db.query(models.Exercise).delete()
         db.query(models.MealLog).delete()
         db.query(models.BodyLog).delete()
         db.query(models.Profile).delete()
@@ -136,12 +142,12 @@ def seed_data() -> None:
             ('ルーマニアンデッドリフト', 3, '8-10', 75.0),
         ]
 
-        for idx, (name, sets, reps, w) in enumerate(push_items):
-            db.add(models.WorkoutTemplateItem(template_id=push_day.id, exercise_name=name, target_sets=sets, target_reps=reps, target_weight_kg=w, order_index=idx))
-        for idx, (name, sets, reps, w) in enumerate(pull_items):
-            db.add(models.WorkoutTemplateItem(template_id=pull_day.id, exercise_name=name, target_sets=sets, target_reps=reps, target_weight_kg=w, order_index=idx))
-        for idx, (name, sets, reps, w) in enumerate(leg_items):
-            db.add(models.WorkoutTemplateItem(template_id=legs_day.id, exercise_name=name, target_sets=sets, target_reps=reps, target_weight_kg=w, order_index=idx))
+        # catalog entries for every exercise, as the workout routers create them
+        exercise_ids = exercises.resolve_ids(db, 1, [name for name, *_ in push_items + pull_items + leg_items])
+
+        for template, items in ((push_day, push_items), (pull_day, pull_items), (legs_day, leg_items)):
+            for idx, (name, sets, reps, w) in enumerate(items):
+                db.add(models.WorkoutTemplateItem(template_id=template.id, exercise_name=name, exercise_id=exercise_ids[name], target_sets=sets, target_reps=reps, target_weight_kg=w, order_index=idx))
 
         db.flush()
 
@@ -174,6 +180,7 @@ def seed_data() -> None:
                         models.WorkoutSet(
                             session_id=session.id,
                             exercise_name=item.exercise_name,
+                            exercise_id=item.exercise_id,
                             set_no=s,
                             reps=max(5, 10 - s),
                             weight_kg=round(base_weight + i * 0.5, 1),
@@ -181,6 +188,11 @@ def seed_data() -> None:
                         )
                     )
 
+        workout_analytics.refresh_exercises(db, 1, set(exercise_ids.values()))
+        rebuild_rollups(db)
+        # the reset dropped the version counter, so ETags issued before it could match
+        # again: a running API server must be restarted (new tag token) after seeding
+        versions.next_version(db, 1)
         db.commit()
 
         body_count = db.query(models.BodyLog).count()
@@ -195,6 +207,7 @@ def seed_data() -> None:
         print(f'  Templates     : {template_count}')
         print(f'  Sessions      : {session_count}')
         print(f'  Workout sets  : {set_count}')
+        print('[INFO] Restart the API server if it is running')
     finally:
         db.close()
 
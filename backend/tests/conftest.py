@@ -0,0 +1,163 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base
+from app import models  # noqa: F401  (register tables on Base.metadata)
+from app.services.cache import response_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_response_cache():
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
+@pytest.fixture
+def engine():
+    eng = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=eng)
+    yield eng
+    eng.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def sql_statements(engine):
+    """Every statement run on ``engine`` while the test runs; ``clear()`` it to start counting."""
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+@pytest.fixture
+def client(engine):
+    from fastapi.testclient import TestClient
+
+    from app.db import get_db
+    from app.main import app
+
+    TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        session = TestingSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    # not used as a context manager: startup hooks would touch the real database
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def seeded(db):
+    """A user with a profile, 60 days of logs, two templates and a dozen sessions."""
+    from datetime import date, timedelta
+
+    from app.services.exercises import resolve_ids
+    from app.services.rollups import rebuild_rollups
+    from app.services.workout_analytics import rebuild_bests
+
+    today = date.today()
+    db.add(models.Profile(user_id=1, sex="male", age=30, height_cm=175, activity_level=1.55, goal_rate_kg_per_week=-0.25))
+    for i in range(60):
+        d = today - timedelta(days=i)
+        db.add(models.BodyLog(user_id=1, date=d, weight_kg=75 - i * 0.05, bodyfat_pct=20.0))
+        for meal_type, kcal in (("breakfast", 450), ("lunch", 700), ("dinner", 750)):
+            db.add(models.MealLog(user_id=1, date=d, meal_type=meal_type, calories_kcal=kcal, protein_g=35))
+    templates = []
+    for name in ("push", "pull"):
+        tpl = models.WorkoutTemplate(user_id=1, name=name)
+        tpl.items = [models.WorkoutTemplateItem(exercise_name=f"{name}-{k}", target_sets=3, order_index=k) for k in range(3)]
+        db.add(tpl)
+        templates.append(tpl)
+    db.flush()
+    bench_id = resolve_ids(db, 1, ["bench"])["bench"]
+    for i in range(12):
+        sess = models.WorkoutSession(user_id=1, date=today - timedelta(days=i * 3), template_id=templates[i % 2].id)
+        sess.sets = [models.WorkoutSet(exercise_name="bench", exercise_id=bench_id, set_no=n, reps=8, weight_kg=60 + i) for n in range(1, 4)]
+        db.add(sess)
+    rebuild_rollups(db)
+    rebuild_bests(db)
+    db.commit()
+    return {"template_ids": [t.id for t in templates], "today": today, "bench_id": bench_id}
+
+
+@pytest.fixture
+def route_calls(db, seeded):
+    """One (method, route template, url, body) call per API route, against ``seeded``."""
+    from datetime import timedelta
+
+    from app.services.pagination import encode_cursor
+
+    today = seeded["today"]
+    tpl_id = seeded["template_ids"][0]
+    meal_id = db.query(models.MealLog.id).first()[0]
+    body_id = db.query(models.BodyLog.id).first()[0]
+    session_id = db.query(models.WorkoutSession.id).first()[0]
+    bench_id = seeded["bench_id"]
+    variant = models.Exercise(user_id=1, name="flat bench")
+    db.add(variant)
+    db.commit()
+    d = today.isoformat()
+    week_ago = (today - timedelta(days=7)).isoformat()
+    cursor = encode_cursor(today - timedelta(days=7), 1)
+    return [
+        ("GET", "/profile/", "/profile/", None),
+        ("PUT", "/profile/", "/profile/", {"age": 31}),
+        ("GET", "/profile/compute", "/profile/compute", None),
+        ("GET", "/body-logs/", f"/body-logs/?from={week_ago}&to={d}", None),
+        ("GET", "/body-logs/", f"/body-logs/?limit=10&cursor={cursor}", None),
+        ("POST", "/body-logs/", "/body-logs/", {"date": d, "weight_kg": 70.0}),
+        ("POST", "/body-logs/bulk", "/body-logs/bulk", [{"date": d, "weight_kg": 70.2}, {"date": week_ago, "weight_kg": 71.0}]),
+        ("DELETE", "/body-logs/{item_id}", f"/body-logs/{body_id}", None),
+        ("GET", "/meal-logs/", f"/meal-logs/?date={d}", None),
+        ("GET", "/meal-logs/range", f"/meal-logs/range?from={week_ago}&to={d}", None),
+        ("GET", "/meal-logs/range", f"/meal-logs/range?from={week_ago}&to={d}&limit=10&cursor={cursor}", None),
+        ("POST", "/meal-logs/", "/meal-logs/", {"date": d, "meal_type": "snack", "calories_kcal": 200}),
+        ("POST", "/meal-logs/bulk", "/meal-logs/bulk", [{"date": d, "meal_type": "snack", "calories_kcal": 100}]),
+        ("PUT", "/meal-logs/{item_id}", f"/meal-logs/{meal_id}", {"date": week_ago, "meal_type": "snack", "calories_kcal": 250}),
+        ("DELETE", "/meal-logs/{item_id}", f"/meal-logs/{meal_id}", None),
+        ("GET", "/dashboard/summary", f"/dashboard/summary?from={week_ago}&to={d}", None),
+        ("GET", "/workouts/templates", "/workouts/templates", None),
+        ("POST", "/workouts/templates", "/workouts/templates", {"name": "legs", "items": [{"exercise_name": "squat"}]}),
+        ("PUT", "/workouts/templates/{tpl_id}", f"/workouts/templates/{tpl_id}", {"name": "push2"}),
+        ("GET", "/workouts/templates/{tpl_id}/items", f"/workouts/templates/{tpl_id}/items", None),
+        ("PUT", "/workouts/templates/{tpl_id}/items", f"/workouts/templates/{tpl_id}/items", [{"exercise_name": "dip", "order_index": 0}]),
+        ("GET", "/workouts/bootstrap", "/workouts/bootstrap", None),
+        ("GET", "/workouts/sessions", f"/workouts/sessions?from={week_ago}&to={d}", None),
+        ("GET", "/workouts/sessions", f"/workouts/sessions?limit=5&cursor={cursor}", None),
+        ("POST", "/workouts/sessions", "/workouts/sessions", {"date": d, "sets": [{"exercise_name": "row", "set_no": 1}]}),
+        ("POST", "/workouts/sessions/bulk", "/workouts/sessions/bulk", [{"date": d, "sets": [{"exercise_name": "row", "set_no": 1}]}]),
+        ("GET", "/workouts/sessions/{id}", f"/workouts/sessions/{session_id}", None),
+        ("DELETE", "/workouts/sessions/{id}", f"/workouts/sessions/{session_id}", None),
+        ("GET", "/workouts/analytics/records", "/workouts/analytics/records", None),
+        ("GET", "/workouts/analytics/weekly", f"/workouts/analytics/weekly?from={week_ago}&to={d}", None),
+        ("GET", "/workouts/analytics/weekly", "/workouts/analytics/weekly?exercise=bench&formula=brzycki", None),
+        ("GET", "/workouts/exercises", "/workouts/exercises", None),
+        ("POST", "/workouts/exercises", "/workouts/exercises", {"name": "ohp", "muscle_groups": ["shoulders"], "aliases": ["overhead press"]}),
+        ("PUT", "/workouts/exercises/{ex_id}", f"/workouts/exercises/{bench_id}", {"name": "bench press", "aliases": ["bp"]}),
+        ("POST", "/workouts/exercises/{ex_id}/merge/{source_id}", f"/workouts/exercises/{bench_id}/merge/{variant.id}", None),
+        ("GET", "/export/{dataset}.{fmt}", "/export/workouts.csv", None),
+        ("GET", "/sync", "/sync", None),
+        ("GET", "/sync", "/sync?since=1", None),
+        ("DELETE", "/workouts/templates/{tpl_id}", f"/workouts/templates/{tpl_id}", None),
+    ]
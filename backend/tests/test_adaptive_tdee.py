@@ -0,0 +1,115 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app import models
+from app.services import adaptive_tdee, rollups
+from app.services.calculations import KCAL_PER_KG
+
+STATE = ("date",) + adaptive_tdee.STATE_COLUMNS
+
+
+def _states(db):
+    db.expire_all()
+    return [tuple(getattr(r, c) for c in STATE) for r in db.query(models.DailyRollup).order_by(models.DailyRollup.date)]
+
+
+def test_estimate_converges_to_energy_balance():
+    # eats 2000 kcal and loses weight as if expenditure were 2500 kcal, with noisy weigh-ins
+    start = date(2024, 1, 1)
+    state = None
+    for i in range(90):
+        weight = 80 - i * 500 / KCAL_PER_KG + (0.4 if i % 3 == 0 else -0.2)
+        state = adaptive_tdee.step(state, start + timedelta(days=i), weight, 2000)
+    assert state.tdee_sample_days == 89
+    assert abs(state.tdee_estimate_kcal - 2500) < 100
+    assert abs(state.trend_weight_kg - (80 - 89 * 500 / KCAL_PER_KG)) < 0.6
+
+
+def test_days_without_weigh_in_or_meals():
+    d = date(2024, 1, 1)
+    s = adaptive_tdee.step(None, d, 80.0, 2000)
+    assert (s.trend_weight_kg, s.tdee_estimate_kcal, s.tdee_sample_days) == (80.0, None, 0)
+    # meals but no weigh-in: trend flat, the intake waits for the next weigh-in
+    s = adaptive_tdee.step(s, d + timedelta(days=1), None, 2100)
+    assert (s.trend_weight_kg, s.tdee_estimate_kcal, s.tdee_sample_days) == (80.0, None, 0)
+    # weigh-in without meals: the waiting day becomes a sample with the trend change of the gap
+    s = adaptive_tdee.step(s, d + timedelta(days=4), 79.0, None)
+    assert s.trend_weight_kg < 80.0 and s.tdee_sample_days == 1
+    assert s.tdee_estimate_kcal == pytest.approx(2100 - KCAL_PER_KG * (s.trend_weight_kg - 80.0) / 4)
+
+
+def test_sparse_weigh_ins_converge_to_energy_balance():
+    # expenditure 2550 kcal, eats 2000 every day, weighs in once a week
+    start = date(2024, 1, 1)
+    state, daily = None, None
+    for i in range(180):
+        weight = 80 - i * 550 / KCAL_PER_KG
+        state = adaptive_tdee.step(state, start + timedelta(days=i), weight if i % 7 == 0 else None, 2000)
+        daily = adaptive_tdee.step(daily, start + timedelta(days=i), weight, 2000)
+    assert abs(state.tdee_estimate_kcal - 2550) < 25
+    assert abs(daily.tdee_estimate_kcal - 2550) < 25
+    # every meal day after the first weigh-in is a sample once the next weigh-in lands
+    assert state.tdee_sample_days == 175
+
+
+def test_incremental_updates_match_rebuild(db):
+    start = date(2024, 1, 1)
+    for i in range(30):
+        d = start + timedelta(days=i)
+        if i % 4 != 3:
+            db.add(models.BodyLog(user_id=1, date=d, weight_kg=80 - i * 0.07 + (0.3 if i % 2 else 0)))
+        if i % 5 != 4:
+            db.add(models.MealLog(user_id=1, date=d, meal_type="lunch", calories_kcal=1800 + 10 * i))
+        rollups.refresh_days(db, 1, [d])
+    db.commit()
+
+    # a backdated edit replays the days after it
+    meal = db.query(models.MealLog).filter(models.MealLog.date == start + timedelta(days=10)).one()
+    meal.calories_kcal = 3000
+    rollups.refresh_days(db, 1, [meal.date])
+    db.commit()
+    incremental = _states(db)
+
+    rollups.rebuild_rollups(db)
+    db.commit()
+    assert incremental == _states(db)
+
+
+def test_writing_the_latest_day_updates_one_row(db):
+    start = date(2024, 1, 1)
+    for i in range(20):
+        db.add(models.BodyLog(user_id=1, date=start + timedelta(days=i), weight_kg=80 - i * 0.1))
+    rollups.rebuild_rollups(db)
+    db.commit()
+    db.add(models.MealLog(user_id=1, date=start + timedelta(days=19), meal_type="lunch", calories_kcal=2000))
+    db.flush()
+    rollups.refresh_days(db, 1, [start + timedelta(days=19)])
+    assert adaptive_tdee.replay(db, 1, start + timedelta(days=19)) == 0
+    assert adaptive_tdee.replay(db, 1, start) == 0
+
+
+def test_exposed_on_dashboard_and_profile(seeded, client):
+    # seeded: 1900 kcal/day while gaining 0.05 kg/day -> ~1900 - 385 kcal expenditure
+    expected = 1900 - 0.05 * KCAL_PER_KG
+    body = client.get("/dashboard/summary").json()
+    assert abs(body["adaptive_tdee"] - expected) < 50
+    assert body["adaptive_recommended_intake"] == body["adaptive_tdee"] + (-0.25 * KCAL_PER_KG) / 7.0
+    assert len(body["trend_weight_series"]) == 30
+    assert body["adaptive_tdee_series"][-1]["value"] == body["adaptive_tdee"]
+
+    metrics = client.get("/profile/compute").json()
+    assert metrics["adaptive_tdee"] == body["adaptive_tdee"]
+    assert metrics["adaptive_sample_days"] == 59
+
+
+def test_not_reported_before_enough_days(db, client):
+    db.add(models.Profile(user_id=1, sex="male", age=30, height_cm=175, activity_level=1.55))
+    d = date.today()
+    for i in range(5):
+        db.add(models.BodyLog(user_id=1, date=d - timedelta(days=i), weight_kg=80))
+        db.add(models.MealLog(user_id=1, date=d - timedelta(days=i), meal_type="lunch", calories_kcal=2000))
+    rollups.rebuild_rollups(db)
+    db.commit()
+    assert client.get("/dashboard/summary").json()["adaptive_tdee"] is None
+    assert client.get("/profile/compute").json()["adaptive_sample_days"] == 4
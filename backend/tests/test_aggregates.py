@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from app import models
+from app.services.aggregates import compute_dashboard_aggregates
+from app.services.calculations import compute_bmr, compute_tdee, recommended_intake
+from app.services.rollups import rebuild_rollups
+
+
+def _seed(db, to_d):
+    for i in range(10):
+        d = to_d - timedelta(days=i)
+        db.add(models.BodyLog(user_id=1, date=d, weight_kg=70 + i, bodyfat_pct=20.0))
+        db.add(models.MealLog(user_id=1, date=d, meal_type="lunch", calories_kcal=700, protein_g=40))
+        db.add(models.MealLog(user_id=1, date=d, meal_type="dinner", calories_kcal=800, protein_g=None))
+    # another user's data must never leak into the aggregates
+    db.add(models.BodyLog(user_id=2, date=to_d + timedelta(days=5), weight_kg=99))
+    db.add(models.MealLog(user_id=2, date=to_d, meal_type="lunch", calories_kcal=5000))
+    rebuild_rollups(db)
+    db.commit()
+
+
+def test_series_and_rolling_averages(db):
+    to_d = date(2024, 3, 31)
+    _seed(db, to_d)
+    agg = compute_dashboard_aggregates(db, 1, to_d - timedelta(days=2), to_d)
+
+    assert [d for d, _ in agg.weight_series] == [to_d - timedelta(days=i) for i in (2, 1, 0)]
+    assert [v for _, v in agg.weight_series] == [72, 71, 70]
+    assert [v for _, v in agg.intake_series] == [1500.0, 1500.0, 1500.0]
+    assert [v for _, v in agg.protein_series] == [40.0, 40.0, 40.0]
+    # the 7-day averages reach back beyond the 3-day window
+    assert agg.avg_intake_7d == 1500.0
+    assert agg.avg_protein_7d == 40.0
+    assert agg.latest_body.date == to_d
+
+
+def test_latest_body_outside_window(db):
+    to_d = date(2024, 3, 31)
+    _seed(db, to_d)
+    agg = compute_dashboard_aggregates(db, 1, date(2023, 1, 1), date(2023, 1, 31))
+
+    assert agg.weight_series == []
+    assert agg.intake_series == []
+    assert agg.avg_intake_7d is None
+    assert agg.avg_protein_7d is None
+    assert agg.latest_body.date == to_d
+
+
+def test_partial_week_averages_over_seven_days(db):
+    d = date(2024, 3, 31)
+    db.add(models.MealLog(user_id=1, date=d, meal_type="lunch", calories_kcal=700))
+    rebuild_rollups(db)
+    db.commit()
+    agg = compute_dashboard_aggregates(db, 1, d, d)
+
+    assert agg.avg_intake_7d == 100.0
+    assert agg.avg_protein_7d is None
+    assert agg.protein_series == [(d, 0.0)]
+
+
+def test_daily_body_values_carry_forward(db):
+    d0 = date(2024, 3, 1)
+    db.add(models.BodyLog(user_id=1, date=d0 - timedelta(days=5), weight_kg=80.0, bodyfat_pct=None))
+    db.add(models.BodyLog(user_id=1, date=d0 + timedelta(days=2), weight_kg=79.0, bodyfat_pct=22.0))
+    rebuild_rollups(db)
+    db.commit()
+    agg = compute_dashboard_aggregates(db, 1, d0, d0 + timedelta(days=3))
+
+    assert agg.days == [d0 + timedelta(days=i) for i in range(4)]
+    assert agg.daily_weight.tolist() == [80.0, 80.0, 79.0, 79.0]
+    assert np.isnan(agg.daily_bodyfat[:2]).all() and agg.daily_bodyfat[2:].tolist() == [22.0, 22.0]
+
+    # a weigh-in older than the lookback is still carried in, without joining the series
+    agg = compute_dashboard_aggregates(db, 1, d0 + timedelta(days=40), d0 + timedelta(days=41))
+    assert agg.daily_weight.tolist() == [79.0, 79.0] and agg.weight_series == [] and agg.weight_stats.ema == []
+    assert agg.latest_body.date == d0 + timedelta(days=2)
+
+    # nothing to carry in before the first log
+    agg = compute_dashboard_aggregates(db, 1, d0 - timedelta(days=7), d0 - timedelta(days=5))
+    assert np.isnan(agg.daily_weight[:2]).all() and agg.daily_weight[2] == 80.0
+
+
+def test_summary_tdee_series_matches_scalar_calculation(db, client):
+    d0 = date(2024, 3, 1)
+    db.add(models.Profile(user_id=1, sex="female", age=35, height_cm=165, activity_level=1.375, goal_rate_kg_per_week=-0.5))
+    db.add(models.BodyLog(user_id=1, date=d0, weight_kg=62.0, bodyfat_pct=28.0))
+    db.add(models.BodyLog(user_id=1, date=d0 + timedelta(days=2), weight_kg=61.5))
+    rebuild_rollups(db)
+    db.commit()
+    body = client.get(f"/dashboard/summary?from={d0 - timedelta(days=1)}&to={d0 + timedelta(days=3)}").json()
+
+    expected = [
+        compute_tdee(compute_bmr(w, 165, 35, "female", bf), 1.375)
+        for w, bf in ((70.0, None), (62.0, 28.0), (62.0, 28.0), (61.5, None), (61.5, None))
+    ]
+    assert [p["date"] for p in body["tdee_series"]] == [(d0 + timedelta(days=i)).isoformat() for i in range(-1, 4)]
+    assert [p["value"] for p in body["tdee_series"]] == expected
+    assert [p["value"] for p in body["recommended_intake_series"]] == [recommended_intake(t, None, -0.5) for t in expected]
+    assert body["tdee"] == expected[-1]
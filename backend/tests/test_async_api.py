@@ -0,0 +1,56 @@
+from datetime import date
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app import models
+from app.db import Base, create_app_engine, get_async_db
+from app.routers import async_api
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    path = tmp_path / "async.db"
+    sync_engine = create_app_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=sync_engine)
+    with sync_engine.begin() as conn:
+        conn.execute(models.Profile.__table__.insert().values(user_id=1, sex="female", age=35, height_cm=160, activity_level=1.4))
+    sync_engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    Session = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_api.dashboard_router, prefix="/dashboard")
+    app.include_router(async_api.body_logs_router, prefix="/body-logs")
+    app.include_router(async_api.meal_logs_router, prefix="/meal-logs")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+
+
+def test_async_endpoints_round_trip(async_client):
+    d = date.today().isoformat()
+    res = async_client.post("/body-logs/", json={"date": d, "weight_kg": 60.5, "bodyfat_pct": 25})
+    assert res.status_code == 200 and res.json()["weight_kg"] == 60.5
+    res = async_client.post("/body-logs/", json={"date": d, "weight_kg": 60.0})
+    assert res.json()["bodyfat_pct"] == 25
+    assert async_client.post("/meal-logs/", json={"date": d, "meal_type": "lunch", "calories_kcal": 650}).status_code == 200
+
+    assert [b["weight_kg"] for b in async_client.get("/body-logs/").json()] == [60.0]
+    assert len(async_client.get("/meal-logs/", params={"date": d}).json()) == 1
+    assert len(async_client.get("/meal-logs/range", params={"from": d, "to": d}).json()) == 1
+
+    summary = async_client.get("/dashboard/summary").json()
+    assert summary["weight_series"] == [{"date": d, "value": 60.0}]
+    assert summary["intake_series"] == [{"date": d, "value": 650.0}]
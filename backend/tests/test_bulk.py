@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+from app import models
+from app.services.rollups import rebuild_rollups
+
+
+def _rollups(db):
+    return [(r.date, r.calories_kcal, r.meal_count, r.weight_kg, r.bodyfat_pct) for r in db.query(models.DailyRollup).order_by(models.DailyRollup.date)]
+
+
+def test_meal_logs_bulk(db, client):
+    start = date(2024, 1, 1)
+    rows = [{"date": (start + timedelta(days=i // 3)).isoformat(), "meal_type": "meal", "calories_kcal": 500 + i} for i in range(30)]
+    res = client.post("/meal-logs/bulk", json=rows)
+    assert res.status_code == 200 and res.json() == {"count": 30}
+    assert db.query(models.MealLog).count() == 30
+
+    incremental = _rollups(db)
+    rebuild_rollups(db)
+    assert incremental == _rollups(db) and len(incremental) == 10
+
+
+def test_meal_logs_bulk_is_all_or_nothing(db, client):
+    rows = [{"date": "2024-01-01", "meal_type": "meal", "calories_kcal": 500}, {"date": "2024-01-02", "meal_type": "meal", "calories_kcal": -1}]
+    assert client.post("/meal-logs/bulk", json=rows).status_code == 422
+    assert db.query(models.MealLog).count() == 0
+
+
+def test_body_logs_bulk_upserts_on_user_date(db, client):
+    client.post("/body-logs/", json={"date": "2024-01-01", "weight_kg": 80.0, "bodyfat_pct": 22.0, "sleep_hours": 7})
+    rows = [
+        {"date": "2024-01-01", "weight_kg": 79.5},  # keeps bodyfat / sleep like the single upsert
+        {"date": "2024-01-02", "weight_kg": 79.0, "bodyfat_pct": 21.5},
+        {"date": "2024-01-03", "weight_kg": 78.8},
+    ]
+    assert client.post("/body-logs/bulk", json=rows).json() == {"count": 3}
+
+    logs = {b.date.isoformat(): b for b in db.query(models.BodyLog)}
+    assert len(logs) == 3
+    assert (logs["2024-01-01"].weight_kg, logs["2024-01-01"].bodyfat_pct, logs["2024-01-01"].sleep_hours) == (79.5, 22.0, 7)
+    assert logs["2024-01-02"].bodyfat_pct == 21.5
+    assert [r[3] for r in _rollups(db)] == [79.5, 79.0, 78.8]
+
+
+def test_body_logs_bulk_repeated_date_applies_rows_in_order(db, client):
+    rows = [
+        {"date": "2024-01-01", "weight_kg": 70.0},
+        {"date": "2024-01-01", "weight_kg": 71.0, "bodyfat_pct": 20.0},
+        {"date": "2024-01-01", "weight_kg": 72.0},
+    ]
+    assert client.post("/body-logs/bulk", json=rows).json() == {"count": 3}
+    [log] = db.query(models.BodyLog).all()
+    assert (log.weight_kg, log.bodyfat_pct) == (72.0, 20.0)
+
+
+def test_workout_sessions_bulk(db, client):
+    rows = [
+        {"date": f"2024-01-0{i}", "note": f"s{i}", "sets": [{"exercise_name": "squat", "set_no": n, "reps": 5, "weight_kg": 100 + i} for n in (1, 2)]}
+        for i in range(1, 6)
+    ]
+    rows.append({"date": "2024-01-09"})
+    assert client.post("/workouts/sessions/bulk", json=rows).json() == {"count": 6}
+
+    sessions = client.get("/workouts/sessions").json()
+    assert len(sessions) == 6
+    by_note = {s["note"]: s for s in sessions}
+    assert [st["weight_kg"] for st in by_note["s3"]["sets"]] == [103, 103]
+    assert by_note[None]["sets"] == []
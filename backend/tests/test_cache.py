@@ -0,0 +1,98 @@
+from datetime import date
+
+from app import models, schemas
+from app.routers import dashboard, meal_logs
+from app.services import rollups, versions
+from app.services.cache import ResponseCache, response_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_miss_and_version_bump():
+    cache = ResponseCache(maxsize=8, ttl=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute(1, "ep", ("a",), compute) == 1
+    assert cache.get_or_compute(1, "ep", ("a",), compute) == 1
+    # other users and other params never share entries
+    assert cache.get_or_compute(2, "ep", ("a",), compute) == 2
+    assert cache.get_or_compute(1, "ep", ("b",), compute) == 3
+
+    cache.bump(1)
+    assert cache.get_or_compute(1, "ep", ("a",), compute) == 4
+    assert cache.get_or_compute(2, "ep", ("a",), compute) == 2
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 4)
+
+
+def test_ttl_expiry_and_lru_eviction():
+    clock = FakeClock()
+    cache = ResponseCache(maxsize=2, ttl=10, clock=clock)
+    cache.get_or_compute(1, "ep", (1,), lambda: "one")
+    cache.get_or_compute(1, "ep", (2,), lambda: "two")
+    cache.get_or_compute(1, "ep", (1,), lambda: "x")  # refreshes (1,) as most recently used
+    cache.get_or_compute(1, "ep", (3,), lambda: "three")  # evicts (2,)
+    assert cache.get_or_compute(1, "ep", (1,), lambda: "x") == "one"
+    assert cache.get_or_compute(1, "ep", (2,), lambda: "new") == "new"
+    assert cache.stats()["evictions"] == 2
+
+    clock.now = 11
+    assert cache.get_or_compute(1, "ep", (2,), lambda: "expired") == "expired"
+
+
+def test_write_after_compute_is_never_served():
+    cache = ResponseCache(maxsize=8, ttl=60)
+
+    def compute_then_write():
+        cache.bump(1)  # a write commits while the result is being computed
+        return "stale"
+
+    assert cache.get_or_compute(1, "ep", (), compute_then_write) == "stale"
+    assert cache.get_or_compute(1, "ep", (), lambda: "fresh") == "fresh"
+
+
+def test_newer_persisted_version_invalidates():
+    cache = ResponseCache(maxsize=8, ttl=60)
+    cache.observe(1, 5)
+    assert cache.get_or_compute(1, "ep", (), lambda: "old") == "old"
+    # an older read reported late changes nothing
+    cache.observe(1, 4)
+    assert cache.get_or_compute(1, "ep", (), lambda: "x") == "old"
+    # another process wrote
+    cache.observe(1, 6)
+    assert cache.get_or_compute(1, "ep", (), lambda: "new") == "new"
+
+
+def test_dashboard_cache_follows_writes_from_other_processes(seeded, db, client):
+    first = client.get("/dashboard/summary").json()
+    # what another worker's write leaves behind: a new row and version, nothing bumped here
+    db.add(models.MealLog(user_id=1, date=seeded["today"], meal_type="snack", calories_kcal=900))
+    rollups.refresh_days(db, 1, [seeded["today"]])
+    versions.next_version(db, 1)
+    db.commit()
+
+    summary = client.get("/dashboard/summary").json()
+    assert summary != first
+    assert response_cache.stats()["hits"] == 0
+
+
+def test_dashboard_cache_invalidated_by_meal_write(db):
+    db.add(models.Profile(user_id=1, sex="male", age=30, height_cm=175, activity_level=1.5))
+    db.commit()
+    d = date(2024, 5, 1)
+    first = dashboard.summary("2024-04-25", "2024-05-01", db=db).body
+    assert dashboard.summary("2024-04-25", "2024-05-01", db=db).body == first
+    assert response_cache.stats()["hits"] == 1
+
+    meal_logs.create_meal_log(schemas.MealLogCreate(date=d, meal_type="lunch", calories_kcal=700), db=db)
+    assert dashboard.summary("2024-04-25", "2024-05-01", db=db).body != first
@@ -25,3 +25,35 @@ def test_tdee_and_recommended():
     # daily delta ~ (-0.5*7700)/7
     daily_delta = (-0.5*7700)/7.0
     assert round(rec) == round(tdee + daily_delta)
+
+
+def test_array_versions_match_scalars():
+    import numpy as np
+    from app.services.calculations import compute_metabolics_array
+
+    rows = [
+        # weight, height, age, sex, activity, bodyfat, goal_kcal, goal_rate
+        (70.0, 175.0, 30, 'male', 1.55, None, None, -0.5),
+        (58.5, 162.0, 41, 'female', 1.2, 27.5, None, None),
+        (91.2, 188.0, 25, 'M', None, 18.0, 2400, -0.25),
+        (64.0, 170.0, 52, None, 0, None, None, 0.25),
+    ]
+    cols = list(zip(*rows))
+    out = compute_metabolics_array(*cols[:5], bodyfat_pct=cols[5], goal_calories_kcal=cols[6], goal_rate_kg_per_week=cols[7])
+
+    for i, (w, h, a, sex, act, bf, kcal, rate) in enumerate(rows):
+        bmr = compute_bmr(w, h, a, sex, bodyfat_pct=bf)
+        tdee = compute_tdee(bmr, act)
+        assert out['bmr'][i] == bmr
+        assert out['tdee'][i] == tdee
+        assert out['recommended_intake'][i] == recommended_intake(tdee, kcal, rate)
+    assert isinstance(out['tdee'], np.ndarray) and out['tdee'].shape == (4,)
+
+
+def test_array_versions_broadcast_scalars():
+    from app.services.calculations import compute_bmr_array, compute_tdee_array
+
+    weights = [80.0, 79.5, 79.1]
+    bmr = compute_bmr_array(weights, 180, 40, 'male', bodyfat_pct=[20.0, None, 19.5])
+    assert list(bmr) == [compute_bmr(80.0, 180, 40, 'male', 20.0), compute_bmr(79.5, 180, 40, 'male'), compute_bmr(79.1, 180, 40, 'male', 19.5)]
+    assert list(compute_tdee_array(bmr, 1.375)) == [compute_tdee(b, 1.375) for b in bmr]
@@ -0,0 +1,33 @@
+from app.db import create_app_engine
+
+
+def _pragma(conn, name):
+    return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_file_database_gets_tuned_pragmas(tmp_path):
+    eng = create_app_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    with eng.connect() as conn:
+        assert _pragma(conn, "journal_mode") == "wal"
+        assert _pragma(conn, "synchronous") == 1  # NORMAL
+        assert _pragma(conn, "busy_timeout") == 5000
+        assert _pragma(conn, "temp_store") == 2  # MEMORY
+        assert _pragma(conn, "cache_size") == -65536
+    assert eng.pool.size() == 10
+    eng.dispose()
+
+
+def test_pragmas_can_be_overridden(tmp_path):
+    eng = create_app_engine(f"sqlite:///{tmp_path / 'plain.db'}", sqlite_pragmas={"journal_mode": "DELETE"})
+    with eng.connect() as conn:
+        assert _pragma(conn, "journal_mode") == "delete"
+        assert _pragma(conn, "synchronous") == 2  # sqlite default FULL
+    eng.dispose()
+
+
+def test_in_memory_database_skips_journal_settings():
+    eng = create_app_engine("sqlite://")
+    with eng.connect() as conn:
+        assert _pragma(conn, "journal_mode") == "memory"
+        assert _pragma(conn, "busy_timeout") == 5000
+    eng.dispose()
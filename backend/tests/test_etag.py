@@ -0,0 +1,60 @@
+from sqlalchemy import event
+
+from app.services import versions
+from app.services.etag import etag_matches
+
+
+def test_etag_matches():
+    assert etag_matches('W/"a-1"', 'W/"a-1"')
+    assert etag_matches('"a-1"', 'W/"a-1"')
+    assert etag_matches('W/"x", W/"a-1"', 'W/"a-1"')
+    assert etag_matches("*", 'W/"a-1"')
+    assert not etag_matches('W/"a-2"', 'W/"a-1"')
+
+
+def test_unchanged_data_returns_304_after_one_version_lookup(seeded, engine, client):
+    first = client.get("/dashboard/summary")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    for url in ("/dashboard/summary", "/body-logs/", "/workouts/templates"):
+        res = client.get(url, headers={"If-None-Match": etag})
+        assert res.status_code == 304 and res.content == b""
+        assert res.headers["etag"] == etag
+    # the persisted data version, by primary key; no handler runs
+    assert len(statements) == 3 and all(s.startswith("SELECT sync_versions.version") for s in statements)
+
+
+def test_writes_change_the_etag(seeded, client):
+    etag = client.get("/meal-logs/").headers["etag"]
+    client.post("/meal-logs/", json={"date": "2024-06-01", "meal_type": "lunch", "calories_kcal": 600})
+
+    res = client.get("/meal-logs/", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["etag"] != etag
+    assert any(m["date"] == "2024-06-01" for m in res.json())
+    # only reads under the API prefixes are tagged
+    assert "etag" not in client.post("/meal-logs/", json={"date": "2024-06-02", "meal_type": "lunch", "calories_kcal": 1}).headers
+    assert "etag" not in client.get("/export/meal-logs.csv").headers
+
+
+def test_changes_made_outside_this_process_change_the_etag(seeded, db, client):
+    etag = client.get("/dashboard/summary").headers["etag"]
+    # what another worker's write or scripts/rebuild_rollups.py leaves behind:
+    # a new persisted version, and nothing bumped in this process
+    versions.touch_users(db, [1])
+    db.commit()
+    assert client.get("/dashboard/summary", headers={"If-None-Match": etag}).status_code == 200
+
+    etag = client.get("/profile/").headers["etag"]
+    client.put("/profile/", json={"age": 41})
+    assert client.get("/profile/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_large_responses_are_gzipped(seeded, client):
+    res = client.get("/meal-logs/", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["content-encoding"] == "gzip"
+    assert len(res.json()) > 0
+    assert "content-encoding" not in client.get("/", headers={"Accept-Encoding": "gzip"}).headers
@@ -0,0 +1,85 @@
+from datetime import date
+
+from app import models
+from app.services import exercises
+from app.services.exercises import normalize_name
+
+D0 = date(2024, 1, 1)
+
+
+def _log(client, *names, weight=100):
+    res = client.post("/workouts/sessions", json={"date": D0.isoformat(), "sets": [
+        {"exercise_name": n, "set_no": i, "reps": 5, "weight_kg": weight} for i, n in enumerate(names, 1)
+    ]})
+    return [s["exercise_id"] for s in res.json()["sets"]]
+
+
+def test_normalize_name():
+    assert normalize_name("ﾍﾞﾝﾁﾌﾟﾚｽ") == normalize_name(" ベンチプレス ") == "ベンチプレス"
+    assert normalize_name("Bench  Press") == normalize_name("ＢＥＮＣＨ press") == "bench press"
+
+
+def test_name_added_concurrently_resolves_to_the_winner(db, monkeypatch):
+    winner = exercises.resolve_ids(db, 1, ["Bench Press"])["Bench Press"]
+    db.commit()
+    # the first SELECT ran before the other request committed the same name
+    reads = []
+    real = exercises._alias_ids
+
+    def stale_first(*args):
+        reads.append(args)
+        return {} if len(reads) == 1 else real(*args)
+
+    monkeypatch.setattr(exercises, "_alias_ids", stale_first)
+    assert exercises.resolve_ids(db, 1, ["bench press"]) == {"bench press": winner}
+    db.commit()
+    assert [e.id for e in db.query(models.Exercise)] == [winner]
+
+
+def test_spelling_variants_share_one_exercise(client):
+    ids = _log(client, "ベンチプレス", "ﾍﾞﾝﾁﾌﾟﾚｽ", "Squat", "squat ")
+    assert ids[0] == ids[1] and ids[2] == ids[3] and ids[0] != ids[2]
+
+    catalog = client.get("/workouts/exercises").json()
+    assert [e["name"] for e in catalog] == ["Squat", "ベンチプレス"]
+    records = client.get("/workouts/analytics/records").json()
+    assert {r["exercise_name"]: r["total_sets"] for r in records} == {"Squat": 2, "ベンチプレス": 2}
+
+    # template items resolve through the same catalog
+    tpl = client.post("/workouts/templates", json={"name": "legs", "items": [{"exercise_name": "SQUAT"}]}).json()
+    assert tpl["items"][0]["exercise_id"] == ids[2]
+
+
+def test_aliases_and_conflicts(client):
+    ex = client.post("/workouts/exercises", json={"name": "Overhead Press", "muscle_groups": ["Shoulders", "triceps"], "aliases": ["OHP"]}).json()
+    assert ex["muscle_groups"] == ["shoulders", "triceps"] and ex["aliases"] == ["OHP"]
+    assert _log(client, "ohp") == [ex["id"]]
+
+    other = client.post("/workouts/exercises", json={"name": "Push Press"}).json()
+    res = client.put(f"/workouts/exercises/{other['id']}", json={"name": "Push Press", "aliases": ["ohp"]})
+    assert res.status_code == 409
+
+    # a rename keeps the old name resolving
+    renamed = client.put(f"/workouts/exercises/{ex['id']}", json={"name": "Military Press", "aliases": ["OHP"]}).json()
+    assert set(renamed["aliases"]) == {"OHP", "Overhead Press"}
+    assert _log(client, "overhead press") == [ex["id"]]
+
+
+def test_merge_folds_history(db, client):
+    squat = _log(client, "Squat", weight=100)[0]
+    variant = _log(client, "スクワット", weight=140)[0]
+    tpl = client.post("/workouts/templates", json={"name": "legs", "items": [{"exercise_name": "スクワット"}]}).json()
+
+    merged = client.post(f"/workouts/exercises/{squat}/merge/{variant}").json()
+    assert merged["aliases"] == ["スクワット"]
+    assert db.get(models.Exercise, variant) is None
+    assert {s.exercise_id for s in db.query(models.WorkoutSet)} == {squat}
+    assert client.get(f"/workouts/templates/{tpl['id']}/items").json()[0]["exercise_id"] == squat
+
+    records = client.get("/workouts/analytics/records").json()
+    assert [(r["exercise_id"], r["max_weight_kg"], r["total_sets"]) for r in records] == [(squat, 140, 2)]
+    weekly = client.get(f"/workouts/analytics/weekly?from={D0}&to={D0}&exercise=すくわっと").json()
+    assert weekly == []  # hiragana is a different spelling
+    weekly = client.get(f"/workouts/analytics/weekly?from={D0}&to={D0}&exercise=ｽｸﾜｯﾄ").json()
+    assert [(e["exercise_id"], e["weeks"][0]["sets"]) for e in weekly] == [(squat, 2)]
+    assert client.post(f"/workouts/exercises/{squat}/merge/{squat}").status_code == 400
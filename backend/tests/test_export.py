@@ -0,0 +1,48 @@
+import csv
+import io
+import json
+
+from app.services import export
+
+
+def test_csv_exports(seeded, client):
+    res = client.get("/export/meal-logs.csv")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/csv")
+    assert 'filename="meal-logs.csv"' in res.headers["content-disposition"]
+    rows = list(csv.reader(io.StringIO(res.text)))
+    assert rows[0] == export.MEAL_LOG_COLUMNS
+    assert len(rows) == 1 + 180
+    dates = [r[1] for r in rows[1:]]
+    assert dates == sorted(dates)
+
+    body = list(csv.DictReader(io.StringIO(client.get("/export/body-logs.csv").text)))
+    assert len(body) == 60 and float(body[-1]["weight_kg"]) == 75.0
+
+    workouts = list(csv.DictReader(io.StringIO(client.get("/export/workouts.csv").text)))
+    assert len(workouts) == 12 * 3
+    assert set(workouts[0]) == set(export.WORKOUT_COLUMNS)
+
+
+def test_ndjson_exports(seeded, client):
+    lines = client.get("/export/body-logs.ndjson").text.splitlines()
+    assert len(lines) == 60
+    assert set(json.loads(lines[0])) == set(export.BODY_LOG_COLUMNS)
+
+    client.post("/workouts/sessions", json={"date": "2020-01-01"})
+    sessions = [json.loads(line) for line in client.get("/export/workouts.ndjson").text.splitlines()]
+    assert len(sessions) == 13
+    assert sessions[0]["date"] == "2020-01-01" and sessions[0]["sets"] == []
+    assert all(len(s["sets"]) == 3 for s in sessions[1:])
+    assert [st["set_no"] for st in sessions[1]["sets"]] == [1, 2, 3]
+
+
+def test_unknown_dataset_or_format(client):
+    assert client.get("/export/profile.csv").status_code == 422
+    assert client.get("/export/meal-logs.xlsx").status_code == 422
+
+
+def test_streams_in_batches(monkeypatch, seeded, db):
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 50)
+    chunks = list(export.iter_csv(export.MEAL_LOG_COLUMNS, export.meal_log_rows(db, 1)))
+    assert len(chunks) == 180 // 50 + 1
@@ -0,0 +1,70 @@
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.services import metrics
+
+
+def _sample(body, name, **labels):
+    wanted = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    match = re.search(rf"^{re.escape(name)}\{{{re.escape(wanted)}\}} (\S+)$", body, re.M)
+    return float(match.group(1)) if match else None
+
+
+def test_route_matcher_prefers_static_paths():
+    matcher = metrics.RouteMatcher(["/workouts/sessions/{id}", "/workouts/sessions/bulk", "/export/{dataset}.{fmt}"])
+    assert matcher.match("/workouts/sessions/bulk") == "/workouts/sessions/bulk"
+    assert matcher.match("/workouts/sessions/42") == "/workouts/sessions/{id}"
+    assert matcher.match("/export/meal-logs.csv") == "/export/{dataset}.{fmt}"
+    assert matcher.match("/nope") == metrics.UNMATCHED
+
+
+def test_metrics_endpoint_reports_routes_and_sql(seeded, client):
+    metrics.registry.clear()
+    session_id = client.get("/workouts/sessions?limit=1").json()["items"][0]["id"]
+    for _ in range(3):
+        client.get(f"/workouts/sessions/{session_id}")
+    client.get("/nope")
+
+    res = client.get("/metrics")
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = res.text
+    labels = {"method": "GET", "route": "/workouts/sessions/{id}"}
+    assert _sample(body, "http_requests_total", **labels, status="200") == 3
+    assert _sample(body, "http_request_duration_seconds_count", **labels) == 3
+    # the ETag version lookup, the session and its sets: three statements per request
+    assert _sample(body, "http_request_sql_statements_sum", **labels) == 9
+    assert _sample(body, "http_request_sql_statements_bucket", **labels, le="2") == 0
+    assert _sample(body, "http_request_sql_statements_bucket", **labels, le="3") == 3
+    assert _sample(body, "http_response_size_bytes_sum", **labels) > 0
+    assert _sample(body, "http_requests_total", method="GET", route=metrics.UNMATCHED, status="404") == 1
+    assert "response_cache_hits_total" in body
+
+
+def test_server_timing_header(engine):
+    inner = FastAPI()
+
+    @inner.get("/q")
+    def q():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1")).all()
+            conn.execute(text("SELECT 2")).all()
+        return {}
+
+    metrics.instrument_engine(engine)
+    client = TestClient(metrics.MetricsMiddleware(inner, registry=metrics.MetricsRegistry(), server_timing=True))
+    header = client.get("/q").headers["server-timing"]
+    assert re.fullmatch(r'db;dur=[\d.]+;desc="2 queries", app;dur=[\d.]+', header)
+
+
+def test_failed_statement_leaves_no_start_time(engine):
+    metrics.instrument_engine(engine)
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        conn.execute(text("SELECT 1")).all()
+        assert conn.info["query_start"] == []
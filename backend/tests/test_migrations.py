@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+
+from app.db import Base
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _config():
+    cfg = Config()
+    cfg.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return cfg
+
+
+def test_migrations_match_models(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    cfg = _config()
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, "head")
+        diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+    engine.dispose()
+    assert diff == []
+
+
+def test_exercise_catalog_backfill(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    cfg = _config()
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, "0004_exercise_bests")
+        conn.execute(text("INSERT INTO users (id) VALUES (1), (2)"))
+        conn.execute(text("INSERT INTO workout_sessions (id, user_id, date) VALUES (1, 1, '2024-01-01'), (2, 2, '2024-01-01')"))
+        conn.execute(text(
+            "INSERT INTO workout_sets (session_id, exercise_name, set_no, reps, weight_kg) VALUES "
+            "(1, 'ベンチプレス', 1, 5, 100), (1, 'ﾍﾞﾝﾁﾌﾟﾚｽ', 2, 5, 100), (1, 'Squat', 3, 5, 120), (1, 'Squat', 4, 5, 120), (2, 'squat', 1, 5, 80)"
+        ))
+        conn.execute(text("INSERT INTO workout_templates (id, user_id, name) VALUES (1, 1, 'legs')"))
+        conn.execute(text("INSERT INTO workout_template_items (template_id, exercise_name) VALUES (1, 'SQUAT ')"))
+        command.upgrade(cfg, "head")
+
+        exercises = conn.execute(text("SELECT user_id, name, id FROM exercises ORDER BY user_id, name")).all()
+        assert [(u, n) for u, n, _ in exercises] == [(1, "Squat"), (1, "ベンチプレス"), (2, "squat")]
+        ids = {(u, n): i for u, n, i in exercises}
+        sets = conn.execute(text("SELECT exercise_name, exercise_id FROM workout_sets ORDER BY id")).all()
+        assert [i for _, i in sets] == [ids[(1, "ベンチプレス")], ids[(1, "ベンチプレス")], ids[(1, "Squat")], ids[(1, "Squat")], ids[(2, "squat")]]
+        assert conn.execute(text("SELECT exercise_id FROM workout_template_items")).scalar() == ids[(1, "Squat")]
+        aliases = conn.execute(text("SELECT alias FROM exercise_aliases WHERE exercise_id = :i ORDER BY alias"), {"i": ids[(1, "ベンチプレス")]}).scalars().all()
+        assert aliases == ["ベンチプレス"]
+    engine.dispose()
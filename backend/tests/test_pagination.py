@@ -0,0 +1,47 @@
+from datetime import date
+
+from app import models
+
+
+def _walk(client, url):
+    items, cursor, pages = [], None, 0
+    while True:
+        res = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert res.status_code == 200
+        body = res.json()
+        items += body["items"]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+def test_pages_cover_the_full_list(seeded, client):
+    full = client.get("/meal-logs/range?from=2000-01-01&to=2100-01-01").json()
+    items, pages = _walk(client, "/meal-logs/range?from=2000-01-01&to=2100-01-01&limit=50")
+    assert pages == 4
+    assert [m["id"] for m in items] == [m["id"] for m in full]
+
+    body, _ = _walk(client, "/body-logs/?limit=7")
+    assert [b["date"] for b in body] == [b["date"] for b in client.get("/body-logs/").json()]
+
+
+def test_sessions_page_newest_first(seeded, client):
+    items, pages = _walk(client, "/workouts/sessions?limit=5")
+    assert pages == 3
+    assert [s["id"] for s in items] == [s["id"] for s in client.get("/workouts/sessions").json()]
+    assert all(len(s["sets"]) == 3 for s in items)
+
+
+def test_same_day_rows_are_not_skipped(db, client):
+    db.add_all(models.MealLog(user_id=1, date=date(2024, 1, 1), meal_type="snack", calories_kcal=i) for i in range(5))
+    db.commit()
+    items, pages = _walk(client, "/meal-logs/?date=2024-01-01&limit=2")
+    assert pages == 3
+    assert sorted(m["calories_kcal"] for m in items) == [0, 1, 2, 3, 4]
+
+
+def test_invalid_cursor_and_limit(client):
+    assert client.get("/body-logs/?cursor=not-a-cursor").status_code == 400
+    assert client.get("/body-logs/?limit=0").status_code == 422
+    assert client.get("/body-logs/?limit=100000").status_code == 422
@@ -0,0 +1,131 @@
+"""SQL statement budgets per route.
+
+Each route is driven through the API against the seeded database and may run at
+most ``BUDGETS[(method, route)]`` statements. Reads must also stay flat as the
+data grows, and bulk writes as the batch grows, so an N+1 in a router fails here
+before it ships. Reads under the ETag prefixes include the middleware's lookup of
+the data version. Raise a budget only together with the change that needs it.
+"""
+from datetime import timedelta
+
+import pytest
+
+from app import models
+from app.services.cache import response_cache
+
+BUDGETS = {
+    ("GET", "/profile/"): 2,
+    ("PUT", "/profile/"): 4,
+    ("GET", "/profile/compute"): 3,
+    ("GET", "/body-logs/"): 2,
+    ("POST", "/body-logs/"): 10,
+    ("POST", "/body-logs/bulk"): 8,
+    ("DELETE", "/body-logs/{item_id}"): 10,
+    ("GET", "/meal-logs/"): 2,
+    ("GET", "/meal-logs/range"): 2,
+    ("POST", "/meal-logs/"): 9,
+    ("POST", "/meal-logs/bulk"): 8,
+    ("PUT", "/meal-logs/{item_id}"): 10,
+    ("DELETE", "/meal-logs/{item_id}"): 10,
+    ("GET", "/dashboard/summary"): 3,
+    ("GET", "/workouts/templates"): 3,
+    ("POST", "/workouts/templates"): 6,
+    ("PUT", "/workouts/templates/{tpl_id}"): 5,
+    ("DELETE", "/workouts/templates/{tpl_id}"): 5,
+    ("GET", "/workouts/templates/{tpl_id}/items"): 2,
+    ("PUT", "/workouts/templates/{tpl_id}/items"): 10,
+    ("GET", "/workouts/bootstrap"): 5,
+    ("GET", "/workouts/sessions"): 3,
+    ("POST", "/workouts/sessions"): 9,
+    ("POST", "/workouts/sessions/bulk"): 7,
+    ("GET", "/workouts/sessions/{id}"): 3,
+    ("DELETE", "/workouts/sessions/{id}"): 9,
+    ("GET", "/workouts/analytics/records"): 2,
+    ("GET", "/workouts/analytics/weekly"): 3,
+    ("GET", "/workouts/exercises"): 3,
+    ("POST", "/workouts/exercises"): 8,
+    ("PUT", "/workouts/exercises/{ex_id}"): 9,
+    ("POST", "/workouts/exercises/{ex_id}/merge/{source_id}"): 14,
+    ("GET", "/export/{dataset}.{fmt}"): 1,
+    ("GET", "/sync"): 7,
+}
+
+
+def test_every_route_has_a_budget(route_calls):
+    assert {(method, route) for method, route, _, _ in route_calls} - set(BUDGETS) == set(), "add the new routes to BUDGETS"
+
+
+def test_routes_stay_within_budget(route_calls, client, sql_statements):
+    over = []
+    for method, route, url, body in route_calls:
+        sql_statements.clear()
+        res = client.request(method, url, json=body)
+        assert res.status_code < 400, (route, res.status_code, res.text)
+        if len(sql_statements) > BUDGETS[(method, route)]:
+            over.append((method, url, len(sql_statements), BUDGETS[(method, route)], list(sql_statements)))
+    assert over == []
+
+
+def _grow(db, today, days):
+    # `days` more days of history before the seeded window: logs, meals and a session with sets each day
+    start = today - timedelta(days=60)
+    for i in range(days):
+        d = start - timedelta(days=i)
+        db.add(models.BodyLog(user_id=1, date=d, weight_kg=80.0))
+        db.add_all(models.MealLog(user_id=1, date=d, meal_type=t, calories_kcal=600) for t in ("breakfast", "lunch", "dinner"))
+        sess = models.WorkoutSession(user_id=1, date=d)
+        sess.sets = [models.WorkoutSet(exercise_name="bench", set_no=n, reps=5, weight_kg=70) for n in (1, 2, 3)]
+        db.add(sess)
+    db.commit()
+
+
+@pytest.mark.parametrize("url", [
+    "/dashboard/summary?from={start}&to={end}",
+    # the last weigh-in lies before the lookback and is carried in
+    "/dashboard/summary?from={later}&to={later_end}",
+    "/workouts/sessions?from={start}&to={end}",
+    "/workouts/sessions?limit=50",
+    "/workouts/bootstrap",
+    "/body-logs/?from={start}&to={end}",
+    "/meal-logs/range?from={start}&to={end}",
+    "/workouts/analytics/records",
+    "/workouts/analytics/weekly?from={start}&to={end}",
+    "/workouts/exercises",
+    "/workouts/templates",
+    "/sync",
+    "/sync?since=1",
+])
+def test_read_query_count_does_not_grow_with_data(db, seeded, client, sql_statements, url):
+    today = seeded["today"]
+    # a window wide enough to include the added history
+    url = url.format(
+        start=(today - timedelta(days=200)).isoformat(), end=today.isoformat(),
+        later=(today + timedelta(days=60)).isoformat(), later_end=(today + timedelta(days=90)).isoformat(),
+    )
+
+    sql_statements.clear()
+    assert client.get(url).status_code == 200
+    small = len(sql_statements)
+    assert small <= BUDGETS[("GET", url.split("?")[0])]
+
+    _grow(db, today, 100)
+    response_cache.clear()
+    sql_statements.clear()
+    assert client.get(url).status_code == 200
+    assert len(sql_statements) == small
+
+
+@pytest.mark.parametrize("url, row", [
+    ("/body-logs/bulk", lambda d: {"date": d, "weight_kg": 70.0}),
+    ("/meal-logs/bulk", lambda d: {"date": d, "meal_type": "snack", "calories_kcal": 100}),
+    ("/workouts/sessions/bulk", lambda d: {"date": d, "sets": [{"exercise_name": "bench", "set_no": k} for k in (1, 2, 3)]}),
+])
+def test_bulk_query_count_does_not_grow_with_batch(seeded, client, sql_statements, url, row):
+    base = seeded["today"] - timedelta(days=400)
+    counts = []
+    for offset, n in ((0, 2), (100, 50)):
+        sql_statements.clear()
+        res = client.post(url, json=[row((base - timedelta(days=offset + i)).isoformat()) for i in range(n)])
+        assert res.status_code == 200, res.text
+        counts.append(len(sql_statements))
+    assert counts[0] == counts[1]
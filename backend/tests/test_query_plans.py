@@ -0,0 +1,54 @@
+"""Every query issued by the routers must use an index (no full table scans).
+
+The routes are driven through the API against a seeded database; each SELECT /
+UPDATE / DELETE they run is replayed with ``EXPLAIN QUERY PLAN``.
+"""
+import re
+
+from sqlalchemy import event
+
+from app.main import app
+
+# routes that never touch the database
+NO_DB_ROUTES = {("GET", "/"), ("GET", "/cache/stats"), ("GET", "/metrics")}
+
+FULL_SCAN = re.compile(r"^SCAN (TABLE )?(?!CONSTANT ROW)\w+")
+
+
+def _api_routes():
+    # from the OpenAPI schema: app.routes nests included routers on newer FastAPI
+    routes = {(m.upper(), path) for path, ops in app.openapi()["paths"].items() for m in ops}
+    return routes - NO_DB_ROUTES
+
+
+def test_every_route_is_covered(route_calls):
+    covered = {(method, route) for method, route, _, _ in route_calls}
+    assert _api_routes() - covered == set(), "add the new routes to the route_calls fixture"
+
+
+def test_router_queries_use_indexes(engine, route_calls, client):
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        for method, route, url, body in route_calls:
+            res = client.request(method, url, json=body)
+            assert res.status_code < 400, (route, res.status_code, res.text)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert captured
+    scans = []
+    with engine.connect() as conn:
+        for statement, parameters in captured:
+            plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+            details = [row[-1] for row in plan]
+            # scanning a subquery's own result (a co-routine) is not a table scan
+            coroutines = {d.split(" ", 1)[1] for d in details if d.startswith("CO-ROUTINE ")}
+            if any(FULL_SCAN.match(d) and d.split(" ", 1)[1] not in coroutines for d in details):
+                scans.append((statement, details))
+    assert scans == []
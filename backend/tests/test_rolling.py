@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app import models
+from app.services import rolling
+from app.services.aggregates import compute_dashboard_aggregates
+from app.services.rollups import rebuild_rollups
+
+D0 = date(2024, 1, 1)
+
+
+def _naive_ma(points, d, window_days):
+    vals = [v for pd, v in points if d - timedelta(days=window_days) < pd <= d]
+    return sum(vals) / len(vals)
+
+
+def test_moving_average_and_delta_match_naive_windows():
+    # sparse: every day except multiples of 3 and 5
+    points = [(D0 + timedelta(days=i), 80 - 0.1 * i + (i % 4) * 0.3) for i in range(60) if i % 3 and i % 5]
+    stats = rolling.rolling_stats(points, window_days=10, delta_days=7)
+
+    assert [d for d, _ in stats.moving_average] == [d for d, _ in points]
+    for d, ma in stats.moving_average:
+        assert ma == pytest.approx(_naive_ma(points, d, 10))
+
+    averages = dict(stats.moving_average)
+    for (d, delta), (_, rate) in zip(stats.delta, stats.rate_per_week):
+        anchor = max(pd for pd, _ in points if pd <= d - timedelta(days=7))
+        assert delta == pytest.approx(averages[d] - averages[anchor])
+        assert rate == pytest.approx(delta / (d - anchor).days * 7)
+    # no anchor exists during the first week
+    assert stats.delta[0][0] >= D0 + timedelta(days=7)
+
+
+def test_ema_is_gap_aware():
+    stats = rolling.rolling_stats([(D0, 80.0), (D0 + timedelta(days=3), 77.0), (D0 + timedelta(days=4), None)], ema_alpha=0.5)
+    assert stats.ema == [(D0, 80.0), (D0 + timedelta(days=3), 80.0 + (1 - 0.5 ** 3) * -3.0)]
+
+
+def test_since_only_trims_output():
+    points = [(D0 + timedelta(days=i), float(i)) for i in range(20)]
+    full = rolling.rolling_stats(points)
+    trimmed = rolling.rolling_stats(points, since=D0 + timedelta(days=10))
+    assert trimmed.moving_average == full.moving_average[10:]
+    assert trimmed.ema == full.ema[10:]
+    assert trimmed.delta == [p for p in full.delta if p[0] >= D0 + timedelta(days=10)]
+
+
+def test_dashboard_lookback_warms_the_first_day(db):
+    points = [(D0 + timedelta(days=i), 80 - 0.1 * i) for i in range(60)]
+    db.add_all(models.BodyLog(user_id=1, date=d, weight_kg=w) for d, w in points)
+    rebuild_rollups(db)
+    db.commit()
+    from_d = D0 + timedelta(days=40)
+    full = rolling.rolling_stats(points, window_days=10, delta_days=7, since=from_d)
+    trimmed = compute_dashboard_aggregates(db, 1, from_d, from_d + timedelta(days=5), window_days=10, delta_days=7).weight_stats
+
+    assert trimmed.moving_average[0] == full.moving_average[0]
+    assert trimmed.delta[0] == full.delta[0] and trimmed.delta[0][1] == pytest.approx(-0.7)
+    assert trimmed.rate_per_week[0] == full.rate_per_week[0]
+
+
+def test_calendar_mean_counts_missing_days():
+    series = [(D0, 700.0), (D0 + timedelta(days=5), 1400.0), (D0 + timedelta(days=6), None)]
+    assert rolling.calendar_mean(series, D0 + timedelta(days=6), 7) == 300.0
+    assert rolling.calendar_mean(series, D0 + timedelta(days=20), 7) is None
+
+
+def test_dashboard_window_params(seeded, client):
+    body = client.get("/dashboard/summary?window_days=14&delta_days=7&ema_alpha=0.2").json()
+    assert len(body["weight_ma_series"]) == len(body["weight_series"]) == 30
+    # seeded weight rises 0.05 kg/day: the moving average does too, once warmed up
+    assert body["weight_delta_series"][-1]["value"] == pytest.approx(0.35)
+    assert body["weight_rate_series"][-1]["value"] == pytest.approx(0.35)
+    assert body["weight_ma_series"][-1]["value"] == pytest.approx(75 - 6.5 * 0.05)
+
+    default = client.get("/dashboard/summary").json()
+    assert default["weight_ma_series"][-1]["value"] == pytest.approx(75 - 3 * 0.05)
+    assert client.get("/dashboard/summary?window_days=0").status_code == 422
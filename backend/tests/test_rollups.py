@@ -0,0 +1,44 @@
+from datetime import date
+
+from app import models, schemas
+from app.routers import body_logs, meal_logs
+from app.services.rollups import rebuild_rollups
+
+
+def _snapshot(db):
+    rows = db.query(models.DailyRollup).order_by(models.DailyRollup.user_id, models.DailyRollup.date).all()
+    return [
+        (r.user_id, r.date, r.calories_kcal, r.protein_g, r.fat_g, r.carbs_g, r.meal_count, r.weight_kg, r.bodyfat_pct, r.muscle_mass_kg)
+        for r in rows
+    ]
+
+
+def test_incremental_rollups_match_rebuild(db):
+    d1, d2 = date(2024, 5, 1), date(2024, 5, 2)
+    a = meal_logs.create_meal_log(schemas.MealLogCreate(date=d1, meal_type="lunch", calories_kcal=600, protein_g=30), db=db)
+    meal_logs.create_meal_log(schemas.MealLogCreate(date=d1, meal_type="dinner", calories_kcal=800, fat_g=20), db=db)
+    c = meal_logs.create_meal_log(schemas.MealLogCreate(date=d2, meal_type="snack", calories_kcal=200), db=db)
+    body_logs.upsert_body_log(schemas.BodyLogCreate(date=d1, weight_kg=70.5, bodyfat_pct=18), db=db)
+    body_logs.upsert_body_log(schemas.BodyLogCreate(date=d1, weight_kg=70.1), db=db)
+    b2 = body_logs.upsert_body_log(schemas.BodyLogCreate(date=d2, weight_kg=70.0), db=db)
+
+    # move a meal to another day, then delete the only meal and body log of d2
+    meal_logs.update_meal_log(a.id, schemas.MealLogCreate(date=d2, meal_type="lunch", calories_kcal=650, protein_g=35), db=db)
+    meal_logs.delete_meal_log(c.id, db=db)
+    body_logs.delete_body_log(b2.id, db=db)
+
+    incremental = _snapshot(db)
+    rebuild_rollups(db)
+    db.commit()
+    assert incremental == _snapshot(db)
+    assert incremental == [
+        (1, d1, 800, None, 20.0, None, 1, 70.1, 18.0, None),
+        (1, d2, 650, 35.0, None, None, 1, None, None, None),
+    ]
+
+
+def test_day_without_data_is_removed(db):
+    d = date(2024, 5, 1)
+    m = meal_logs.create_meal_log(schemas.MealLogCreate(date=d, meal_type="lunch", calories_kcal=600), db=db)
+    meal_logs.delete_meal_log(m.id, db=db)
+    assert _snapshot(db) == []
@@ -0,0 +1,35 @@
+from datetime import timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+
+from app import models, schemas
+
+
+def _validated(db, model, schema):
+    # what a response_model route would produce from the ORM objects
+    rows = db.scalars(select(model).order_by(model.date, model.id)).all()
+    return TypeAdapter(List[schema]).dump_python(rows, mode="json")
+
+
+def test_fast_path_matches_schema_output(seeded, db, client):
+    last = db.scalar(select(func.max(models.BodyLog.date)))
+    db.add(models.BodyLog(user_id=1, date=last + timedelta(days=1), weight_kg=70.25, condition_note="眠い"))
+    db.commit()
+
+    res = client.get("/body-logs/")
+    assert res.headers["content-type"] == "application/json; charset=utf-8"
+    assert res.json() == _validated(db, models.BodyLog, schemas.BodyLogResponse)
+    assert client.get("/meal-logs/range?from=2000-01-01&to=2100-01-01").json() == _validated(db, models.MealLog, schemas.MealLogResponse)
+
+    page = client.get("/meal-logs/?limit=10").json()
+    assert page["items"] == _validated(db, models.MealLog, schemas.MealLogResponse)[:10]
+    assert page["next_cursor"]
+
+
+def test_dict_responses_use_orjson(seeded, client):
+    res = client.get("/dashboard/summary")
+    assert res.headers["content-type"] == "application/json; charset=utf-8"
+    assert all(isinstance(p["date"], str) for p in res.json()["tdee_series"])
+    assert client.get("/profile/compute").headers["content-type"] == "application/json; charset=utf-8"
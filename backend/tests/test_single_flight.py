@@ -0,0 +1,91 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.cache import ResponseCache
+from app.services.single_flight import SingleFlight
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(maxsize=8, ttl=60)
+
+
+def test_concurrent_identical_calls_share_one_computation(cache):
+    flights = SingleFlight(cache.version)
+    release = threading.Event()
+
+    def compute():
+        release.wait(5)
+        return {"built": True}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flights.do, 1, "ep", ("a",), compute) for _ in range(8)]
+        _wait_for(lambda: flights.shared == 7)
+        release.set()
+        results = [f.result() for f in futures]
+    assert all(r is results[0] for r in results)
+    assert (flights.computed, flights.shared, flights.in_flight()) == (1, 7, 0)
+
+
+def test_results_are_never_shared_across_users(cache):
+    flights = SingleFlight(cache.version)
+    # both computations must be running at once: a caller joining the other's
+    # flight would leave the barrier one party short
+    both_running = threading.Barrier(2, timeout=5)
+
+    def compute(user_id):
+        both_running.wait()
+        return {"user_id": user_id}
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = {u: pool.submit(flights.do, u, "ep", ("a",), lambda u=u: compute(u)) for u in (1, 2)}
+        assert {u: f.result()["user_id"] for u, f in futures.items()} == {1: 1, 2: 2}
+    assert (flights.computed, flights.shared) == (2, 0)
+
+
+def test_error_reaches_every_waiter_and_releases_the_key(cache):
+    flights = SingleFlight(cache.version)
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flights.do, 1, "ep", (), fail) for _ in range(3)]
+        _wait_for(lambda: flights.shared == 2)
+        release.set()
+        for f in futures:
+            with pytest.raises(ValueError):
+                f.result()
+    assert flights.in_flight() == 0
+    assert flights.do(1, "ep", (), lambda: "retried") == "retried"
+
+
+def test_request_after_a_write_does_not_join_an_older_computation(cache):
+    flights = SingleFlight(cache.version)
+    started, release = threading.Event(), threading.Event()
+
+    def before_write():
+        started.set()
+        release.wait(5)
+        return "old"
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(flights.do, 1, "ep", (), before_write)
+        started.wait(5)
+        cache.bump(1)  # a write commits while the first computation runs
+        assert flights.do(1, "ep", (), lambda: "new") == "new"
+        release.set()
+        assert first.result() == "old"
+    assert flights.computed == 2
@@ -0,0 +1,89 @@
+from app import models
+
+
+def _sync(client, since=0):
+    res = client.get("/sync", params={"since": since})
+    assert res.status_code == 200
+    return res.json()
+
+
+def test_first_sync_returns_everything(seeded, client):
+    body = _sync(client)
+    assert body["version"] == 0
+    assert len(body["body_logs"]) == 60 and len(body["meal_logs"]) == 180
+    assert len(body["workout_sessions"]) == 12 and all(len(s["sets"]) == 3 for s in body["workout_sessions"])
+    assert body["deleted"] == {"body_logs": [], "meal_logs": [], "workout_sessions": []}
+
+
+def test_delta_has_only_changes_and_tombstones(db, seeded, client):
+    day = seeded["today"].isoformat()
+    meal_ids = [m.id for m in db.query(models.MealLog).order_by(models.MealLog.id).limit(2)]
+    body_id = db.query(models.BodyLog.id).order_by(models.BodyLog.id).first()[0]
+
+    client.post("/body-logs/", json={"date": "2020-01-01", "weight_kg": 70.0})
+    v1 = _sync(client)["version"]
+    new_meal = client.post("/meal-logs/", json={"date": day, "meal_type": "snack", "calories_kcal": 150}).json()
+    client.put(f"/meal-logs/{meal_ids[0]}", json={"date": day, "meal_type": "lunch", "calories_kcal": 800})
+    client.delete(f"/meal-logs/{meal_ids[1]}")
+    client.delete(f"/body-logs/{body_id}")
+    sess = client.post("/workouts/sessions", json={"date": day, "sets": [{"exercise_name": "bench", "set_no": 1, "reps": 5}]}).json()
+
+    delta = _sync(client, v1)
+    assert delta["version"] > v1
+    assert delta["body_logs"] == []
+    assert sorted(m["id"] for m in delta["meal_logs"]) == sorted([meal_ids[0], new_meal["id"]])
+    assert [s["id"] for s in delta["workout_sessions"]] == [sess["id"]]
+    assert [st["reps"] for st in delta["workout_sessions"][0]["sets"]] == [5]
+    assert delta["deleted"] == {"body_logs": [body_id], "meal_logs": [meal_ids[1]], "workout_sessions": []}
+    assert all(r["version"] > v1 for r in delta["meal_logs"] + delta["workout_sessions"])
+
+    assert _sync(client, delta["version"]) == {
+        "version": delta["version"],
+        "body_logs": [], "meal_logs": [], "workout_sessions": [],
+        "deleted": {"body_logs": [], "meal_logs": [], "workout_sessions": []},
+    }
+
+
+def test_bulk_writes_and_session_deletes(seeded, client):
+    client.post("/body-logs/bulk", json=[{"date": "2020-01-01", "weight_kg": 70.0}, {"date": "2020-01-02", "weight_kg": 70.5}])
+    since = _sync(client)["version"]
+    client.post("/body-logs/bulk", json=[{"date": "2020-01-02", "weight_kg": 71.0}])
+    client.post("/workouts/sessions/bulk", json=[{"date": "2020-01-02", "sets": [{"exercise_name": "row", "set_no": 1}]}])
+    delta = _sync(client, since)
+    assert [(b["date"], b["weight_kg"]) for b in delta["body_logs"]] == [("2020-01-02", 71.0)]
+    [sess] = delta["workout_sessions"]
+
+    client.delete(f"/workouts/sessions/{sess['id']}")
+    delta = _sync(client, delta["version"])
+    assert delta["workout_sessions"] == [] and delta["deleted"]["workout_sessions"] == [sess["id"]]
+
+
+def test_reused_id_is_not_reported_deleted(seeded, client):
+    day = seeded["today"].isoformat()
+    meal = client.post("/meal-logs/", json={"date": day, "meal_type": "snack", "calories_kcal": 100}).json()
+    since = _sync(client)["version"]
+    client.delete(f"/meal-logs/{meal['id']}")
+    # SQLite gives the highest id out again
+    again = client.post("/meal-logs/", json={"date": day, "meal_type": "snack", "calories_kcal": 120}).json()
+    assert again["id"] == meal["id"]
+
+    delta = _sync(client, since)
+    assert [m["calories_kcal"] for m in delta["meal_logs"]] == [120]
+    assert delta["deleted"]["meal_logs"] == []
+
+
+def test_exercise_merge_resends_sessions(db, seeded, client):
+    day = seeded["today"].isoformat()
+    sess = client.post("/workouts/sessions", json={"date": day, "sets": [{"exercise_name": "flat bench", "set_no": 1}]}).json()
+    variant_id = sess["sets"][0]["exercise_id"]
+    since = _sync(client)["version"]
+
+    client.post(f"/workouts/exercises/{seeded['bench_id']}/merge/{variant_id}")
+    delta = _sync(client, since)
+    assert [s["id"] for s in delta["workout_sessions"]] == [sess["id"]]
+    assert delta["workout_sessions"][0]["sets"][0]["exercise_id"] == seeded["bench_id"]
+
+
+def test_unchanged_sync_is_not_modified(seeded, client):
+    first = client.get("/sync", params={"since": 0})
+    assert client.get("/sync", params={"since": 0}, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
@@ -0,0 +1,26 @@
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from app import models
+from app.services.synthetic import SyntheticConfig, generate
+
+
+def test_generate_is_deterministic_and_consistent(db):
+    config = SyntheticConfig(users=2, years=0.25, meals_per_day=4, sessions_per_week=3, seed=7, end=date(2024, 3, 31))
+    counts = generate(db, config)
+    db.commit()
+
+    days = config.days
+    assert counts["users"] == 2
+    assert counts["meal_logs"] == 2 * days * 4
+    assert counts["daily_rollups"] == 2 * days
+    assert db.scalar(select(func.count()).select_from(models.WorkoutSet).where(models.WorkoutSet.exercise_id.is_(None))) == 0
+    assert db.scalar(select(func.min(models.MealLog.date))) == date(2024, 3, 31) - timedelta(days=days - 1)
+    # every user gets records for the weighted exercises
+    assert db.scalar(select(func.count()).select_from(models.ExerciseBest)) == counts["exercise_bests"] > 0
+
+    # a second batch of users continues the ids and repeats the same history for the same seed
+    again = generate(db, config)
+    assert again == counts
+    assert db.scalar(select(func.max(models.User.id))) == 4
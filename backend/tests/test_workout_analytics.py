@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app import models
+from app.services import workout_analytics
+from app.services.calculations import brzycki_1rm, epley_1rm
+
+D0 = date(2024, 1, 1)  # a Monday
+
+
+def _post(client, d, sets):
+    res = client.post("/workouts/sessions", json={"date": d.isoformat(), "sets": [
+        {"exercise_name": name, "set_no": n, "reps": reps, "weight_kg": w} for n, (name, reps, w) in enumerate(sets, 1)
+    ]})
+    assert res.status_code == 200
+    return res.json()
+
+
+def _records(client):
+    return {r["exercise_name"]: r for r in client.get("/workouts/analytics/records").json()}
+
+
+def test_1rm_formulas():
+    assert epley_1rm(100, 1) == brzycki_1rm(100, 1) == 100
+    assert epley_1rm(100, 5) == pytest.approx(116.67, abs=0.01)
+    assert brzycki_1rm(100, 5) == pytest.approx(112.5)
+    assert brzycki_1rm(50, 37) is None
+
+
+def test_records_follow_session_writes(client):
+    first = _post(client, D0, [("squat", 5, 100), ("squat", 3, 110), ("bench", 8, 60), ("plank", None, None)])
+    _post(client, D0 + timedelta(days=3), [("squat", 1, 120)])
+
+    records = _records(client)
+    assert set(records) == {"squat", "bench"}
+    squat = records["squat"]
+    assert squat["max_weight_kg"] == 120
+    # 110 x 3 (121) beats the heavier single (120) and 100 x 5 (116.7)
+    assert squat["best_e1rm_epley_kg"] == pytest.approx(epley_1rm(110, 3))
+    assert (squat["best_set_weight_kg"], squat["best_set_reps"], squat["best_set_date"]) == (110, 3, D0.isoformat())
+    assert squat["total_sets"] == 3
+    assert squat["total_tonnage_kg"] == 500 + 330 + 120
+    assert squat["last_date"] == (D0 + timedelta(days=3)).isoformat()
+    assert squat["best_e1rm_brzycki_kg"] == pytest.approx(max(brzycki_1rm(100, 5), brzycki_1rm(110, 3), 120))
+    assert records["bench"]["best_set_volume_kg"] == 480
+
+    # deleting a session rolls its records back; exercises without sets disappear
+    assert client.delete(f"/workouts/sessions/{first['id']}").status_code == 200
+    records = _records(client)
+    assert set(records) == {"squat"}
+    assert records["squat"]["best_e1rm_epley_kg"] == 120 and records["squat"]["total_sets"] == 1
+
+
+def test_incremental_records_match_rebuild(db, client):
+    client.post("/workouts/sessions/bulk", json=[
+        {"date": (D0 + timedelta(days=i)).isoformat(), "sets": [{"exercise_name": "row", "set_no": 1, "reps": 6 + i % 4, "weight_kg": 60 + i}]}
+        for i in range(10)
+    ])
+    incremental = _records(client)
+    best = max(range(10), key=lambda i: epley_1rm(60 + i, 6 + i % 4))
+    assert (incremental["row"]["best_set_weight_kg"], incremental["row"]["best_set_reps"]) == (60 + best, 6 + best % 4)
+    workout_analytics.rebuild_bests(db)
+    db.commit()
+    assert _records(client) == incremental
+
+
+def test_weekly_progression(client):
+    _post(client, D0, [("squat", 5, 100), ("squat", 5, 100)])
+    _post(client, D0 + timedelta(days=2), [("squat", 5, 105), ("bench", 5, 60)])
+    _post(client, D0 + timedelta(days=8), [("squat", 5, 110)])
+
+    body = client.get(f"/workouts/analytics/weekly?from={D0}&to={D0 + timedelta(days=13)}").json()
+    by_name = {e["exercise_name"]: e["weeks"] for e in body}
+    assert [w["week_start"] for w in by_name["squat"]] == [D0.isoformat(), (D0 + timedelta(days=7)).isoformat()]
+    assert [w["tonnage_kg"] for w in by_name["squat"]] == [1525, 550]
+    assert [w["sets"] for w in by_name["squat"]] == [3, 1]
+    assert by_name["squat"][0]["best_e1rm_kg"] == pytest.approx(epley_1rm(105, 5))
+
+    only = client.get(f"/workouts/analytics/weekly?from={D0}&to={D0 + timedelta(days=13)}&exercise=bench&formula=brzycki").json()
+    assert [e["exercise_name"] for e in only] == ["bench"]
+    assert only[0]["weeks"][0]["best_e1rm_kg"] == pytest.approx(brzycki_1rm(60, 5))
+    assert client.get("/workouts/analytics/weekly?formula=bogus").status_code == 422
+
+
+def test_deleted_session_sets_are_removed(db, client):
+    sess = _post(client, D0, [("squat", 5, 100)])
+    client.delete(f"/workouts/sessions/{sess['id']}")
+    assert db.query(models.WorkoutSet).count() == 0
@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app import models
+
+
+def _add_sessions(db, n, start):
+    for i in range(n):
+        sess = models.WorkoutSession(user_id=1, date=start - timedelta(days=i))
+        sess.sets = [models.WorkoutSet(exercise_name="squat", set_no=k, reps=5, weight_kg=100) for k in (1, 2)]
+        db.add(sess)
+    db.commit()
+
+
+def test_session_list_query_count_is_constant(db, client, sql_statements):
+    _add_sessions(db, 3, date(2024, 1, 31))
+    sql_statements.clear()
+    assert len(client.get("/workouts/sessions").json()) == 3
+    small = len(sql_statements)
+    _add_sessions(db, 30, date(2023, 12, 31))
+    sql_statements.clear()
+    body = client.get("/workouts/sessions").json()
+    assert len(body) == 33 and all(len(s["sets"]) == 2 for s in body)
+    # the ETag version lookup, the sessions and their sets
+    assert len(sql_statements) == small == 3
+
+
+def test_bootstrap_returns_everything_in_four_queries(db, seeded, client, sql_statements):
+    sql_statements.clear()
+    body = client.get("/workouts/bootstrap", params={"session_limit": 5}).json()
+    # plus the ETag version lookup
+    assert len(sql_statements) == 5
+    assert [len(t["items"]) for t in body["templates"]] == [3, 3]
+    assert [it["order_index"] for it in body["templates"][0]["items"]] == [0, 1, 2]
+    assert len(body["sessions"]) == 5
+    dates = [s["date"] for s in body["sessions"]]
+    assert dates == sorted(dates, reverse=True)
+    assert all(len(s["sets"]) == 3 for s in body["sessions"])
+
+
+def test_template_items_are_diffed_in_place(engine, client, sql_statements):
+    tpl = client.post("/workouts/templates", json={"name": "push", "items": [
+        {"exercise_name": "bench", "target_sets": 3, "order_index": 0},
+        {"exercise_name": "dip", "target_sets": 3, "order_index": 1},
+        {"exercise_name": "fly", "target_sets": 2, "order_index": 2},
+    ]}).json()
+    bench, dip, fly = tpl["items"]
+
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+    sql_statements.clear()
+    items = client.put(f"/workouts/templates/{tpl['id']}/items", json=[
+        # matched by id: moved to the end with new targets
+        {"id": bench["id"], "exercise_name": "bench", "target_sets": 5, "order_index": 3},
+        # matched by order_index, unchanged: no UPDATE
+        {"exercise_name": "dip", "target_sets": 3, "order_index": 1},
+        # matched by order_index: fly's row becomes pushdown
+        {"exercise_name": "pushdown", "order_index": 2},
+        {"exercise_name": "dip", "target_sets": 1, "order_index": 4},
+    ]).json()
+
+    assert [(it["id"], it["exercise_name"], it["target_sets"]) for it in items] == [
+        (dip["id"], "dip", 3), (fly["id"], "pushdown", None), (bench["id"], "bench", 5), (fly["id"] + 1, "dip", 1),
+    ]
+    # new exercise + alias, both updates in one executemany, the new item, the new data version
+    writes = [s.split()[0] for s in sql_statements if s.split()[0] in ("INSERT", "UPDATE", "DELETE")]
+    assert writes == ["INSERT", "INSERT", "UPDATE", "INSERT", "INSERT"]
+    assert len(commits) == 1
+
+    items = client.put(f"/workouts/templates/{tpl['id']}/items", json=[{"id": bench["id"], "exercise_name": "bench", "target_sets": 5, "order_index": 3}]).json()
+    assert [it["id"] for it in items] == [bench["id"]]
+    assert client.put("/workouts/templates/999/items", json=[]).status_code == 404
+
+
+def test_creates_commit_once(engine, client):
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+    sess = client.post("/workouts/sessions", json={"date": "2024-01-01", "sets": [
+        {"exercise_name": "squat", "set_no": 1, "reps": 5, "weight_kg": 100},
+        {"exercise_name": "squat", "set_no": 2, "reps": 5, "weight_kg": 100},
+    ]}).json()
+    tpl = client.post("/workouts/templates", json={"name": "legs", "items": [{"exercise_name": "squat", "order_index": 0}]}).json()
+    assert len(commits) == 2
+    assert [s["set_no"] for s in sess["sets"]] == [1, 2] and all(s["id"] and s["session_id"] == sess["id"] for s in sess["sets"])
+    assert tpl["items"][0]["template_id"] == tpl["id"]
+    assert client.get(f"/workouts/sessions/{sess['id']}").json() == sess
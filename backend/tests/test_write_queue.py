@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from app import models, schemas
+from app.routers.body_logs import apply_body_log
+from app.services import write_queue
+
+
+def _add_meal(kcal):
+    def write(session):
+        session.add(models.MealLog(user_id=1, date=date(2024, 1, 1), meal_type="snack", calories_kcal=kcal))
+        return kcal
+    return write
+
+
+def _fail(session):
+    raise HTTPException(status_code=404, detail="not found")
+
+
+@pytest.fixture
+def queue_of(engine):
+    queues = []
+
+    def make(**kwargs):
+        queues.append(write_queue.WriteQueue(engine, **kwargs))
+        return queues[-1]
+
+    yield make
+    for q in queues:
+        q.close()
+
+
+def test_concurrent_writes_share_commits(db, queue_of):
+    q = queue_of(max_batch=16, max_delay=0.01)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda k: q.run(_add_meal(k), 1), range(64)))
+    assert results == list(range(64))
+    assert sorted(kcal for (kcal,) in db.query(models.MealLog.calories_kcal)) == list(range(64))
+    assert q.writes == 64 and q.batches < 64
+
+
+def test_failed_write_leaves_the_rest_of_its_batch(db, queue_of):
+    q = queue_of(max_batch=3, max_delay=1.0)
+    futures = [q.submit(_add_meal(100), 1), q.submit(_fail, 1), q.submit(_add_meal(300), 1)]
+    assert futures[0].result() == 100 and futures[2].result() == 300
+    with pytest.raises(HTTPException):
+        futures[1].result()
+    assert sorted(kcal for (kcal,) in db.query(models.MealLog.calories_kcal)) == [100, 300]
+    assert q.batches == 1
+
+
+def test_writes_in_a_batch_see_each_other(db, queue_of):
+    q = queue_of(max_batch=2, max_delay=1.0)
+
+    def upsert(weight):
+        return lambda session: apply_body_log(session, schemas.BodyLogCreate(date=date(2024, 1, 1), weight_kg=weight)).weight_kg
+
+    futures = [q.submit(upsert(70.0), 1), q.submit(upsert(71.0), 1)]
+    assert [f.result() for f in futures] == [70.0, 71.0]
+    assert [w for (w,) in db.query(models.BodyLog.weight_kg)] == [71.0]
+
+
+def test_api_writes_through_the_queue(monkeypatch, engine, seeded, client):
+    monkeypatch.setattr(write_queue, "WRITE_QUEUE_ENABLED", True)
+    try:
+        day = seeded["today"].isoformat()
+        meal = client.post("/meal-logs/", json={"date": day, "meal_type": "snack", "calories_kcal": 150})
+        assert meal.status_code == 200 and meal.json()["calories_kcal"] == 150
+        assert meal.json()["id"] in [m["id"] for m in client.get("/meal-logs/", params={"date": day}).json()]
+        assert client.delete("/meal-logs/999999").status_code == 404
+        assert client.delete(f"/meal-logs/{meal.json()['id']}").json() == {"status": "deleted"}
+        assert meal.json()["id"] not in [m["id"] for m in client.get("/meal-logs/", params={"date": day}).json()]
+        # the 404 is not counted
+        assert write_queue.queue_for(engine).writes == 2
+    finally:
+        write_queue.close_all()
@@ -0,0 +1,30 @@
+import api from './client'
+
+// Local copy of the logs kept current with GET /sync?since=<version>: the first call
+// downloads everything, later ones only the rows changed or deleted since the last.
+type Table = 'body_logs' | 'meal_logs' | 'workout_sessions'
+
+const TABLES: Table[] = ['body_logs', 'meal_logs', 'workout_sessions']
+
+let version = 0
+const rows: Record<Table, Map<number, any>> = { body_logs: new Map(), meal_logs: new Map(), workout_sessions: new Map() }
+let queue: Promise<void> = Promise.resolve()
+
+const pull = async () => {
+  const r = await api.get('/sync', { params: { since: version } })
+  for (const t of TABLES) {
+    for (const row of r.data[t]) rows[t].set(row.id, row)
+    for (const id of r.data.deleted[t]) rows[t].delete(id)
+  }
+  version = r.data.version
+}
+
+// one request at a time, so a sync started after a write always sees it
+export const sync = (): Promise<void> => {
+  queue = queue.catch(() => undefined).then(pull)
+  return queue
+}
+
+// rows of a table in date, id order (like the list endpoints)
+export const syncedRows = <T>(table: Table): T[] =>
+  Array.from(rows[table].values()).sort((a, b) => (a.date === b.date ? a.id - b.id : a.date < b.date ? -1 : 1))
@@ -1,15 +1,21 @@
 import React from 'react'
 import { ComposedChart, Bar, Line, XAxis, YAxis, Tooltip, ResponsiveContainer } from 'recharts'
 
-export default function IntakeChart({ data, tdee }: { data: any[]; tdee?: number }) {
+type SeriesPoint = { date: string; value: number }
+
+export default function IntakeChart({ data, tdee, target }: { data: any[]; tdee?: number; target?: SeriesPoint[] }) {
+  // per-day target (recommended_intake_series) joined onto the intake bars by date
+  const targetByDate = new Map((target || []).map((t) => [t.date, t.value]))
+  const rows = data.map((d) => ({ ...d, tdee, target: targetByDate.get(d.date) }))
   return (
     <ResponsiveContainer width="100%" height={300}>
-      <ComposedChart data={data}>
+      <ComposedChart data={rows}>
         <XAxis dataKey="date" />
         <YAxis />
         <Tooltip />
         <Bar dataKey="value" fill="#82ca9d" />
-        {tdee && <Line type="monotone" data={data.map(d => ({ ...d, tdee }))} dataKey="tdee" stroke="#ff7300" dot={false} />}
+        {tdee && <Line type="monotone" dataKey="tdee" stroke="#ff7300" dot={false} />}
+        {target && <Line type="stepAfter" dataKey="target" stroke="#b91c1c" strokeDasharray="4 4" dot={false} />}
       </ComposedChart>
     </ResponsiveContainer>
   )
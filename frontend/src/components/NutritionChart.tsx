@@ -1,9 +1,9 @@
 import React from 'react'
 import { ComposedChart, Bar, Line, XAxis, YAxis, Tooltip, ResponsiveContainer, Legend, CartesianGrid } from 'recharts'
 
-type Point = { date: string; calories?: number; protein?: number }
+type Point = { date: string; calories?: number; protein?: number; target?: number }
 
-export default function NutritionChart({ calorieData, proteinData, tdee }: { calorieData: Point[]; proteinData: Point[]; tdee?: number }) {
+export default function NutritionChart({ calorieData, proteinData, tdee, targetData }: { calorieData: Point[]; proteinData: Point[]; tdee?: number; targetData?: Point[] }) {
   // Merge calorie and protein data by date
   const mergedData: { [key: string]: any } = {}
   calorieData.forEach((item) => {
@@ -17,6 +17,13 @@ export default function NutritionChart({ calorieData, proteinData, tdee }: { cal
     }
   })
 
+  // per-day recommended intake only where intake was logged, so the bars stay aligned
+  targetData?.forEach((item) => {
+    if (mergedData[item.date]) {
+      mergedData[item.date].target = item.target
+    }
+  })
+
   const data = Object.values(mergedData).sort((a, b) => a.date.localeCompare(b.date))
 
   // Add TDEE reference line if provided
@@ -39,6 +46,7 @@ export default function NutritionChart({ calorieData, proteinData, tdee }: { cal
             formatter={(val: any, name: string | undefined) => {
               if (name === 'calories') return [`${Math.round(val)} kcal`, '摂取カロリー']
               if (name === 'tdee') return [`${Math.round(val)} kcal`, 'TDEE']
+              if (name === 'target') return [`${Math.round(val)} kcal`, '推奨摂取']
               if (name === 'protein') return [`${Math.round(val)} g`, 'タンパク質']
               return [val, name]
             }}
@@ -47,6 +55,7 @@ export default function NutritionChart({ calorieData, proteinData, tdee }: { cal
           <Legend wrapperStyle={{ paddingTop: '20px', fontSize: '13px' }} />
           <Bar yAxisId="left" dataKey="calories" fill="#66bb6a" name="📊 摂取カロリー" radius={[8, 8, 0, 0]} />
           {tdee && <Line yAxisId="left" type="monotone" dataKey="tdee" stroke="#ff9800" strokeDasharray="5 5" strokeWidth={2} dot={false} name="🎯 TDEE参考" />}
+          {targetData && targetData.length > 0 && <Line yAxisId="left" type="stepAfter" dataKey="target" stroke="#b91c1c" strokeWidth={2} dot={false} name="🔥 推奨摂取" />}
           <Line yAxisId="right" type="monotone" dataKey="protein" stroke="#1e88e5" strokeWidth={2.5} dot={{ fill: '#1e88e5', r: 4 }} activeDot={{ r: 6 }} name="🥩 タンパク質" />
         </ComposedChart>
       </ResponsiveContainer>
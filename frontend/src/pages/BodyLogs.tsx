@@ -1,5 +1,6 @@
 ﻿import React, { useEffect, useState } from 'react'
 import api from '../api/client'
+import { sync, syncedRows } from '../api/sync'
 import {
   Paper,
   Typography,
@@ -44,8 +45,8 @@ export default function BodyLogs() {
   const fetch = async () => {
     setLoading(true)
     try {
-      const r = await api.get('/body-logs')
-      setItems(r.data)
+      await sync()
+      setItems(syncedRows<BodyLog>('body_logs'))
     } catch {
       setItems([])
     } finally {
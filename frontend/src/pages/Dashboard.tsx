@@ -24,6 +24,8 @@ type Summary = {
   bodyfat_series?: Array<{ date: string; value: number }>
   intake_series?: Array<{ date: string; value: number }>
   protein_series?: Array<{ date: string; value: number }>
+  tdee_series?: Array<{ date: string; value: number }>
+  recommended_intake_series?: Array<{ date: string; value: number }>
   recommendation_text?: string
 }
 
@@ -161,6 +163,7 @@ export default function Dashboard() {
                     calorieData={(data?.intake_series || []).map((d) => ({ date: d.date, calories: d.value }))}
                     proteinData={(data?.protein_series || []).map((d) => ({ date: d.date, protein: d.value }))}
                     tdee={data?.tdee}
+                    targetData={(data?.recommended_intake_series || []).map((d) => ({ date: d.date, target: d.value }))}
                   />
                 </Paper>
               </Grid>
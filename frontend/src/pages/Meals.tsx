@@ -1,5 +1,6 @@
 ﻿import React, { useEffect, useState } from 'react'
 import api from '../api/client'
+import { sync, syncedRows } from '../api/sync'
 import {
   Paper,
   Typography,
@@ -40,8 +41,8 @@ export default function Meals() {
   const fetch = async () => {
     setLoading(true)
     try {
-      const r = await api.get('/meal-logs')
-      setItems(r.data)
+      await sync()
+      setItems(syncedRows<MealLog>('meal_logs'))
     } catch {
       setItems([])
     } finally {
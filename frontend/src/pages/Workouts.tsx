@@ -1,5 +1,6 @@
 ﻿import React, { useEffect, useMemo, useState } from 'react'
 import api from '../api/client'
+import { sync, syncedRows } from '../api/sync'
 import {
   Alert,
   Box,
@@ -114,31 +115,30 @@ export default function Workouts() {
     return new Map(templates.map((t) => [t.id, t.name]))
   }, [templates])
 
-  const fetchAll = async () => {
-    setLoading(true)
+  const fetchTemplates = async () => {
     try {
-      const [tplRes, sessRes] = await Promise.all([
-        api.get('/workouts/templates'),
-        api.get('/workouts/sessions'),
-      ])
-
-      const baseTemplates = tplRes.data as WorkoutTemplate[]
-      const enrichedTemplates = await Promise.all(
-        baseTemplates.map(async (tpl) => {
-          try {
-            const itemsRes = await api.get(`/workouts/templates/${tpl.id}/items`)
-            return { ...tpl, items: itemsRes.data || [] }
-          } catch {
-            return { ...tpl, items: tpl.items || [] }
-          }
-        }),
-      )
-
-      setTemplates(enrichedTemplates)
-      setSessions(sessRes.data)
+      // templates with their items in one request
+      const res = await api.get('/workouts/templates')
+      setTemplates(res.data as WorkoutTemplate[])
     } catch {
       setTemplates([])
+    }
+  }
+
+  const fetchSessions = async () => {
+    try {
+      // every session with its sets, kept current by /sync: after a write only the change is fetched
+      await sync()
+      setSessions(syncedRows<WorkoutSession>('workout_sessions').reverse())
+    } catch {
       setSessions([])
+    }
+  }
+
+  const fetchAll = async () => {
+    setLoading(true)
+    try {
+      await Promise.all([fetchTemplates(), fetchSessions()])
     } finally {
       setLoading(false)
     }
@@ -198,7 +198,7 @@ export default function Workouts() {
       })
       setConfirmTemplateOpen(false)
       setTemplateDraft({ name: '', description: '', items: [{ ...emptyTemplateItem }] })
-      await fetchAll()
+      await fetchTemplates()
     } catch (e) {
       console.error(e)
       alert('メニュー作成に失敗しました。')
@@ -209,7 +209,7 @@ export default function Workouts() {
     if (!confirm('このメニューを削除しますか？')) return
     try {
       await api.delete(`/workouts/templates/${id}`)
-      await fetchAll()
+      await fetchTemplates()
     } catch (e) {
       console.error(e)
       alert('メニュー削除に失敗しました。')
@@ -297,7 +297,7 @@ export default function Workouts() {
         note: '',
         sets: [{ ...emptySessionSet }],
       })
-      await fetchAll()
+      await fetchSessions()
       alert('本日のトレーニングを保存しました。')
     } catch (e) {
       console.error(e)
@@ -309,7 +309,7 @@ export default function Workouts() {
     if (!confirm('この記録を削除しますか？')) return
     try {
       await api.delete(`/workouts/sessions/${id}`)
-      await fetchAll()
+      await fetchSessions()
     } catch (e) {
       console.error(e)
       alert('削除に失敗しました。')